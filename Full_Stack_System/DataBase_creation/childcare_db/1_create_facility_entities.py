@@ -1,18 +1,13 @@
 import sqlite3
 import hashlib
+from triple_store import TripleStore
 
 # Connect to SQLite database
 conn = sqlite3.connect("childcare_graph.db")
 cursor = conn.cursor()
 
-# Ensure the triples table exists
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS triples (
-    subject TEXT,
-    predicate TEXT,
-    object TEXT
-);
-""")
+# Ensure the dictionary-encoded triple store exists (migrates an old TEXT triples table)
+store = TripleStore(conn)
 
 # Define Facility Schema (Only relevant attributes)
 FACILITY_SCHEMA = {
@@ -59,23 +54,23 @@ columns = [col[1] for col in cursor.fetchall()]
 def generate_entity_id(value):
     return hashlib.md5(value.encode()).hexdigest()
 
-# Insert Facility entities into the triples table
-for row in rows:
-    facility_id = generate_entity_id(row[5])  # Facility Name as Unique ID
-    
-    # Insert Facility entity declaration
-    cursor.execute("INSERT INTO triples (subject, predicate, object) VALUES (?, ?, ?)", 
-                   (facility_id, "ENTITY_TYPE", "Facility"))
+# Generate (subject, predicate, object) triples for every Facility entity
+def facility_triples(rows):
+    for row in rows:
+        facility_id = generate_entity_id(row[5])  # Facility Name as Unique ID
 
-    # Insert attributes as triples, only including defined schema attributes
-    for idx, col_value in enumerate(row):
-        column_name = columns[idx]
-        if col_value and column_name in FACILITY_SCHEMA:  # Only process allowed attributes
-            predicate = column_name  # Column name as attribute
-            object_value = str(col_value)  # Convert all values to string
+        # Facility entity declaration
+        yield facility_id, "ENTITY_TYPE", "Facility"
 
-            cursor.execute("INSERT INTO triples (subject, predicate, object) VALUES (?, ?, ?)", 
-                           (facility_id, predicate, object_value))
+        # Attributes as triples, only including defined schema attributes
+        for idx, col_value in enumerate(row):
+            column_name = columns[idx]
+            if col_value and column_name in FACILITY_SCHEMA:  # Only process allowed attributes
+                yield facility_id, column_name, str(col_value)  # Column name as attribute
+
+# Insert Facility entities into the triple store (duplicate triples are ignored)
+inserted = store.add_many(facility_triples(rows))
+print(f"Inserted {inserted} new triples")
 
 # Commit and close connection
 conn.commit()
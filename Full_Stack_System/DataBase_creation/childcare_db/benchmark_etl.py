@@ -0,0 +1,171 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from synthetic_extract import SIZES, parse_size, write_extract
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def seed_graph_db(workdir):
+    """1_create_facility_entities.py reads the staging table from childcare_graph.db: copy it there."""
+    graph_path = os.path.join(workdir, "childcare_graph.db")
+    if os.path.exists(graph_path):
+        os.remove(graph_path)
+    conn = sqlite3.connect(graph_path)
+    conn.execute("ATTACH DATABASE ? AS source;", (os.path.join(workdir, "childcare.db"),))
+    conn.execute("CREATE TABLE childcare_facilities AS SELECT * FROM source.childcare_facilities;")
+    conn.commit()
+    conn.close()
+
+
+# Stages run in this order, each as its own process with the work directory
+# as cwd. `output` is the file or directory whose size is recorded; `setup`
+# runs untimed before the stage.
+STAGES = {
+    "import": {
+        "command": lambda csv_file: ["import_data.py", csv_file, "--stream"],
+        "output": "childcare.db",
+    },
+    "triples": {
+        "command": lambda csv_file: ["1_create_facility_entities.py"],
+        "setup": seed_graph_db,
+        "output": "childcare_graph.db",
+    },
+    "export": {
+        # export.py is a fixed-path wrapper around this exporter
+        "command": lambda csv_file: ["neo4j_export.py", "--db", "childcare.db", "--out", "exports"],
+        "setup": lambda workdir: os.makedirs(os.path.join(workdir, "exports"), exist_ok=True),
+        "output": "exports",
+    },
+    "convert": {
+        # Rebuilds the entity tables with its own locations schema, so it runs last
+        "command": lambda csv_file: ["convert_into_entities.py"],
+        "output": "childcare.db",
+    },
+}
+
+
+def path_size(path):
+    """Bytes used by a file (plus any -wal/-journal) or everything under a directory."""
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(root, name))
+                   for root, _, names in os.walk(path) for name in names)
+    return sum(os.path.getsize(path + suffix) for suffix in ("", "-wal", "-journal")
+               if os.path.exists(path + suffix))
+
+
+def run_stage(name, csv_file, rows, workdir):
+    """Run one stage in a child process; returns its wall time, throughput, peak RSS and output size."""
+    stage = STAGES[name]
+    if "setup" in stage:
+        stage["setup"](workdir)
+
+    script, *args = stage["command"](csv_file)
+    log_path = os.path.join(workdir, f"{name}.log")
+    with open(log_path, "w") as log:
+        started = time.perf_counter()
+        process = subprocess.Popen([sys.executable, os.path.join(SCRIPT_DIR, script), *args],
+                                   cwd=workdir, stdout=log, stderr=subprocess.STDOUT)
+        _, status, usage = os.wait4(process.pid, 0)  # Per-child rusage, unlike RUSAGE_CHILDREN
+        wall = time.perf_counter() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    return {
+        "stage": name,
+        "rows": rows,
+        "wall_seconds": round(wall, 3),
+        "rows_per_sec": round(rows / wall, 1) if wall > 0 else None,
+        "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),  # ru_maxrss is KiB on Linux
+        "output_bytes": path_size(os.path.join(workdir, stage["output"])),
+        "returncode": process.returncode,
+    }
+
+
+def git_revision():
+    """Current commit of the repo, so results can be compared between versions."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def append_results(path, run):
+    """Append one benchmark run to the JSON results file (a list of runs)."""
+    runs = []
+    if os.path.exists(path):
+        with open(path) as file:
+            runs = json.load(file)
+    runs.append(run)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(runs, file, indent=2)
+    os.replace(tmp_path, path)
+
+
+def run_benchmark(sizes, stages, seed, data_dir, results_path, keep=False):
+    """Generate (or reuse) an extract per size and time every stage on it."""
+    run = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "seed": seed,
+        "results": [],
+    }
+
+    for size in sizes:
+        rows = parse_size(size)
+        csv_file = os.path.join(data_dir, f"synthetic_{size.lower()}_seed{seed}.csv")
+        if not os.path.exists(csv_file):
+            print(f"🧪 Generating {rows:,} rows -> {csv_file}")
+            write_extract(csv_file, rows, seed)
+
+        workdir = tempfile.mkdtemp(prefix=f"etl_bench_{size.lower()}_")
+        try:
+            for name in stages:
+                result = run_stage(name, csv_file, rows, workdir)
+                result["size"] = size
+                run["results"].append(result)
+                status = "✅" if result["returncode"] == 0 else f"❌ exit {result['returncode']}"
+                print(f"⏱ {size:>5} {name:<8} {result['wall_seconds']:>9.2f}s "
+                      f"{result['rows_per_sec'] or 0:>12,.0f} rows/sec {result['peak_rss_mb']:>8.1f} MB RSS "
+                      f"{result['output_bytes'] / 2 ** 20:>9.1f} MB out  {status}")
+                if result["returncode"] != 0:
+                    with open(os.path.join(workdir, f"{name}.log")) as log:
+                        print("".join(log.readlines()[-20:]))
+                    break  # Later stages depend on this one's output
+        finally:
+            if not keep:
+                shutil.rmtree(workdir, ignore_errors=True)
+            else:
+                print(f"📂 Kept work directory {workdir}")
+
+    append_results(results_path, run)
+    print(f"📝 Results appended to {results_path}")
+    return run
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the childcare ETL stages on synthetic extracts.")
+    parser.add_argument("--sizes", nargs="+", default=["10k", "100k"], help=f"Row counts, e.g. {' '.join(SIZES)}")
+    parser.add_argument("--stages", nargs="+", default=list(STAGES), choices=list(STAGES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--data-dir", default="benchmark_data", help="Where generated extracts are cached")
+    parser.add_argument("--results", default="benchmark_results.json")
+    parser.add_argument("--keep", action="store_true", help="Keep each size's work directory")
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    run_benchmark(args.sizes, [name for name in STAGES if name in args.stages], args.seed,
+                  os.path.abspath(args.data_dir), os.path.abspath(args.results), args.keep)
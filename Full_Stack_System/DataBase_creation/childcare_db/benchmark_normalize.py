@@ -0,0 +1,113 @@
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from column_plan import generate_entity_id
+from normalize import normalize_staging_table
+from schema import ENTITY_TABLES_SQL, FACILITY_SCHEMA
+from stream_ingest import create_staging_table
+from synthetic_extract import parse_size, synthetic_rows
+
+
+def legacy_normalize(conn):
+    """The previous per-row loader: five single-row INSERTs plus a read-back SELECT per facility."""
+    cursor = conn.cursor()
+    reader = conn.cursor()
+    reader.execute("PRAGMA table_info(childcare_facilities);")
+    columns = [col[1] for col in reader.fetchall()]
+    idx = {name: position for position, name in enumerate(columns)}
+
+    location_map, owner_map, license_map, school_district_map = {}, {}, {}, {}
+    reader.execute("SELECT * FROM childcare_facilities;")
+    for row in reader:
+        facility_id = generate_entity_id(
+            f"{row[idx['Facility Name']]}|{row[idx['License Number']]}|{row[idx['Facility Address']]}", "Facility")
+        location_key = f"{row[idx['City']]}|{row[idx['State']]}|{row[idx['Facility Address']]}|{row[idx['Facility Name']]}"
+        location_id = location_map.get(location_key) or generate_entity_id(location_key, "Location")
+        owner_key = row[idx["License Number"]]
+        owner_id = owner_map.get(owner_key) or generate_entity_id(owner_key, "Owner")
+        license_id = license_map.get(owner_key) or generate_entity_id(owner_key, "License")
+        district_key = row[idx["School District Affiliation"]]
+        district_id = school_district_map.get(district_key) or generate_entity_id(district_key, "School District")
+
+        if location_key not in location_map:
+            cursor.execute("""
+                INSERT OR IGNORE INTO locations (location_id, city, state, zip_code, location_address, location_name)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (location_id, row[idx["City"]], row[idx["State"]], str(row[idx["Zip Code"]]),
+                  row[idx["Facility Address"]], row[idx["Facility Name"]]))
+        cursor.execute("SELECT * FROM locations WHERE location_id = ?", (location_id,))
+        cursor.fetchone()
+        location_map[location_key] = location_id
+
+        if owner_key not in owner_map:
+            cursor.execute("INSERT OR IGNORE INTO owners (owner_id, license_number, alternative_contact_number) VALUES (?, ?, ?)",
+                           (owner_id, owner_key, row[idx["Alternative Contact Number"]]))
+            owner_map[owner_key] = owner_id
+        if owner_key not in license_map:
+            cursor.execute("""
+                INSERT OR IGNORE INTO licenses (license_id, license_number, license_type, license_issue_date, license_expiry_date)
+                VALUES (?, ?, ?, ?, ?)
+            """, (license_id, owner_key, row[idx["License Type"]], row[idx["License Issue Date"]],
+                  row[idx["License Expiry Date"]]))
+            license_map[owner_key] = license_id
+        if district_key not in school_district_map:
+            cursor.execute("INSERT OR IGNORE INTO school_districts (district_id, district_name) VALUES (?, ?)",
+                           (district_id, district_key))
+            school_district_map[district_key] = district_id
+
+        cursor.execute("""
+            INSERT OR IGNORE INTO facilities (
+                facility_id, facility_name, license_number, facility_address, phone_number, facility_type,
+                operational_schedule, accepts_subsidies, location_id, owner_id, license_id, school_district_id
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (facility_id, row[idx["Facility Name"]], row[idx["License Number"]], row[idx["Facility Address"]],
+              row[idx["Phone Number"]], row[idx["Facility Type"]], row[idx["Operational Schedule"]],
+              row[idx["Accepts Subsidies"]], location_id, owner_id, license_id, district_id))
+    conn.commit()
+
+
+def build_staging_db(path, rows):
+    """Create a database holding only the synthetic staging table."""
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    header = list(FACILITY_SCHEMA)
+    create_staging_table(cursor, header)
+    cursor.executemany(f"INSERT INTO childcare_facilities VALUES ({', '.join('?' * len(header))})",
+                       synthetic_rows(rows))
+    conn.commit()
+    conn.close()
+
+
+def time_loader(staging_path, work_path, loader):
+    """Run one loader against a fresh copy of the staging database; returns elapsed seconds."""
+    shutil.copyfile(staging_path, work_path)
+    conn = sqlite3.connect(work_path)
+    conn.executescript(ENTITY_TABLES_SQL)
+    started = time.perf_counter()
+    loader(conn)
+    elapsed = time.perf_counter() - started
+    conn.close()
+    os.remove(work_path)
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark entity normalization before/after the bulk engine.")
+    parser.add_argument("--rows", type=parse_size, default=1_000_000, help="Synthetic extract size, e.g. 100k or 1m")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        staging_path = os.path.join(workdir, "staging.db")
+        print(f"🧪 Generating {args.rows:,} synthetic facility rows...")
+        build_staging_db(staging_path, args.rows)
+
+        work_path = os.path.join(workdir, "work.db")
+        before = time_loader(staging_path, work_path, legacy_normalize)
+        print(f"⏱ Before (per-row execute + read-back): {before:.2f}s ({args.rows / before:,.0f} rows/sec)")
+        after = time_loader(staging_path, work_path, normalize_staging_table)
+        print(f"⏱ After (in-memory dedup + executemany): {after:.2f}s ({args.rows / after:,.0f} rows/sec)")
+        print(f"🚀 Speedup: {before / after:.1f}x")
@@ -0,0 +1,190 @@
+import argparse
+import sqlite3
+import time
+
+from column_plan import detect_id_mode
+from schema import ID_MODES
+
+# Rollup levels -> the contribution column grouped on. 'all' is the statewide total.
+ROLLUP_LEVELS = {
+    "all": "''",
+    "state": "state",
+    "city": "city",
+    "zip": "zip_code",
+    "district": "district_name",
+}
+ALL_TYPES = "*"  # facility_type of the rows summing every facility type
+MEASURES = ["facilities", "capacity", "enrollment", "staff", "open_slots"]
+
+# capacity_contributions holds what each facility last added to the rollup,
+# so a refresh only has to apply the difference for facilities that changed.
+# capacity_rollup has one row per (level, key, facility type), plus an
+# ALL_TYPES row per (level, key); dimension values are '' when unknown.
+ROLLUP_SQL = """
+CREATE TABLE IF NOT EXISTS capacity_contributions (
+    facility_id {id_type} PRIMARY KEY,
+    state TEXT NOT NULL,
+    city TEXT NOT NULL,          -- 'City, ST', so same-named cities stay apart
+    zip_code TEXT NOT NULL,
+    district_name TEXT NOT NULL,
+    facility_type TEXT NOT NULL,
+    capacity INTEGER,
+    enrollment INTEGER,
+    staff INTEGER,
+    open_slots INTEGER           -- Capacity not taken by enrollment
+);
+
+CREATE TABLE IF NOT EXISTS capacity_rollup (
+    level TEXT NOT NULL,
+    key TEXT NOT NULL,
+    facility_type TEXT NOT NULL,
+    facilities INTEGER NOT NULL,
+    capacity INTEGER NOT NULL,
+    enrollment INTEGER NOT NULL,
+    staff INTEGER NOT NULL,
+    open_slots INTEGER NOT NULL,
+    PRIMARY KEY (level, key, facility_type)
+) WITHOUT ROWID;
+"""
+
+# Every facility's contribution as of the current entity tables
+CURRENT_CONTRIBUTIONS_SQL = """
+SELECT f.facility_id,
+       COALESCE(l.state, ''),
+       COALESCE(l.city || ', ' || l.state, ''),
+       COALESCE(l.zip_code, ''),
+       COALESCE(d.district_name, ''),
+       COALESCE(f.facility_type, ''),
+       f.capacity,
+       f.enrollment,
+       f.staff,
+       MAX(f.capacity - COALESCE(f.enrollment, 0), 0)
+FROM facilities f
+LEFT JOIN locations l ON l.location_id = f.location_id
+LEFT JOIN school_districts d ON d.district_id = f.school_district_id
+"""
+
+
+def create_rollup_tables(conn, id_mode="hex"):
+    conn.executescript(ROLLUP_SQL.format(id_type=ID_MODES[id_mode]))
+
+
+def _apply_delta_sql():
+    """Upsert the signed sums of rollup_delta into every (level, key, type) and (level, key, ALL_TYPES) cell."""
+    sums = "SUM(sign), " + ", ".join(f"COALESCE(SUM(sign * {measure}), 0)" for measure in MEASURES[1:])
+    selects = []
+    for level, column in ROLLUP_LEVELS.items():
+        selects.append(f"SELECT '{level}', {column}, facility_type, {sums} FROM rollup_delta "
+                       f"GROUP BY {column}, facility_type")
+        selects.append(f"SELECT '{level}', {column}, '{ALL_TYPES}', {sums} FROM rollup_delta GROUP BY {column}")
+    updates = ", ".join(f"{measure} = {measure} + excluded.{measure}" for measure in MEASURES)
+    # "WHERE true" keeps ON CONFLICT from being parsed as part of the SELECT's join
+    return f"""
+        INSERT INTO capacity_rollup (level, key, facility_type, {', '.join(MEASURES)})
+        SELECT * FROM ({' UNION ALL '.join(selects)}) WHERE true
+        ON CONFLICT (level, key, facility_type) DO UPDATE SET {updates};
+    """
+
+
+def refresh_rollup(conn):
+    """
+    Bring capacity_rollup up to date with the entity tables; returns the number of facilities whose contribution changed.
+
+    Only contributions that differ from the stored ones (new, changed and
+    removed facilities) are subtracted and re-added, in one transaction.
+    """
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    id_mode = detect_id_mode(conn) or "hex"
+    stored_mode = detect_id_mode(conn, "capacity_contributions")
+    if stored_mode is not None and stored_mode != id_mode:
+        # Rebuilt with the other ID mode: no stored contribution matches any more, start over
+        cursor.executescript("DROP TABLE capacity_contributions; DROP TABLE IF EXISTS capacity_rollup;")
+    create_rollup_tables(conn, id_mode)
+
+    previous_isolation = conn.isolation_level
+    conn.isolation_level = None
+    try:
+        cursor.execute("BEGIN")
+        cursor.execute("DROP TABLE IF EXISTS temp.rollup_current;")
+        cursor.execute("CREATE TEMP TABLE rollup_current AS SELECT * FROM capacity_contributions WHERE 0;")
+        cursor.execute(f"INSERT INTO rollup_current {CURRENT_CONTRIBUTIONS_SQL};")
+        # -1 rows withdraw stale contributions, +1 rows add the current ones
+        cursor.execute("DROP TABLE IF EXISTS temp.rollup_delta;")
+        cursor.execute("""
+            CREATE TEMP TABLE rollup_delta AS
+            SELECT *, -1 AS sign FROM (SELECT * FROM capacity_contributions EXCEPT SELECT * FROM rollup_current)
+            UNION ALL
+            SELECT *, 1 AS sign FROM (SELECT * FROM rollup_current EXCEPT SELECT * FROM capacity_contributions);
+        """)
+        cursor.execute("SELECT COUNT(DISTINCT facility_id) FROM rollup_delta;")
+        changed = cursor.fetchone()[0]
+
+        if changed:
+            cursor.execute(_apply_delta_sql())
+            cursor.execute("DELETE FROM capacity_rollup WHERE facilities = 0;")
+            cursor.execute("DELETE FROM capacity_contributions "
+                           "WHERE facility_id IN (SELECT facility_id FROM rollup_delta WHERE sign = -1);")
+            cursor.execute("INSERT INTO capacity_contributions "
+                           "SELECT * FROM rollup_current WHERE facility_id IN "
+                           "(SELECT facility_id FROM rollup_delta WHERE sign = 1);")
+        cursor.execute("DROP TABLE temp.rollup_current;")
+        cursor.execute("DROP TABLE temp.rollup_delta;")
+        cursor.execute("COMMIT")
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+    finally:
+        conn.isolation_level = previous_isolation
+
+    print(f"📊 Capacity rollup refreshed: {changed:,} facilities changed in {time.perf_counter() - started:.2f}s")
+    return changed
+
+
+def capacity_summary(conn, level="city", facility_type=None, key=None, order_by="capacity", limit=None):
+    """
+    Rollup rows of one level as dicts, largest `order_by` first.
+
+    `facility_type` None returns the all-types totals; `key` selects one
+    city ('Detroit, MI'), zip, district or state.
+    """
+    if level not in ROLLUP_LEVELS:
+        raise ValueError(f"Unknown rollup level {level!r}; expected one of {list(ROLLUP_LEVELS)}")
+    if order_by not in MEASURES:
+        raise ValueError(f"Unknown measure {order_by!r}; expected one of {MEASURES}")
+    clauses, params = ["level = ?", "facility_type = ?"], [level, facility_type or ALL_TYPES]
+    if key is not None:
+        clauses.append("key = ?")
+        params.append(str(key))
+    sql = f"""
+        SELECT key, facility_type, {', '.join(MEASURES)} FROM capacity_rollup
+        WHERE {' AND '.join(clauses)}
+        ORDER BY {order_by} DESC
+        {'LIMIT ?' if limit is not None else ''};
+    """
+    cursor = conn.cursor()
+    cursor.execute(sql, params + ([limit] if limit is not None else []))
+    return [dict(zip(["key", "facility_type", *MEASURES], row)) for row in cursor.fetchall()]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Capacity, enrollment and staff totals for the dashboard.")
+    parser.add_argument("level", nargs="?", default="city", choices=list(ROLLUP_LEVELS))
+    parser.add_argument("--db", default="childcare.db")
+    parser.add_argument("--type", dest="facility_type", help="One facility type (default: all types)")
+    parser.add_argument("--key", help="One city ('Detroit, MI'), zip, district or state")
+    parser.add_argument("--order-by", default="capacity", choices=MEASURES)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--refresh", action="store_true", help="Refresh the rollup from the entity tables first")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    if args.refresh:
+        refresh_rollup(conn)
+    started = time.perf_counter()
+    results = capacity_summary(conn, args.level, args.facility_type, args.key, args.order_by, args.limit)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    for result in results:
+        print(result)
+    print(f"📊 {len(results)} rows in {elapsed_ms:.1f} ms")
+    conn.close()
@@ -0,0 +1,171 @@
+import hashlib
+from operator import itemgetter
+
+from schema import ENTITY_MAPPINGS, ENTITY_SCHEMAS, ID_MODES
+
+
+# Function to generate a unique entity ID
+def generate_entity_id(value, entity_type):
+    """Generate a unique ID for an entity based on its type and name."""
+    unique_str = f"{entity_type}:{value}"
+    return hashlib.md5(unique_str.encode()).hexdigest()
+
+
+def hex_to_int64(hex_id):
+    """First 64 bits of a hex entity ID as a signed integer, the "int64" ID mode's key."""
+    return int.from_bytes(bytes.fromhex(hex_id[:16]), "big", signed=True)
+
+
+def int64_to_hex(entity_id):
+    """16-char hex form of an "int64" entity ID, for exports."""
+    return (entity_id & 0xFFFFFFFFFFFFFFFF).to_bytes(8, "big").hex()
+
+
+def detect_id_mode(conn, table="facilities", id_column="facility_id"):
+    """ID mode of an existing database, from the declared type of its ID column; None if the table is missing."""
+    for _, name, declared_type, *_ in conn.execute(f'PRAGMA table_info("{table}");'):
+        if name == id_column:
+            return "int64" if "INT" in declared_type.upper() else "hex"  # SQLite's INTEGER affinity rule
+    return None
+
+
+def source_columns(source):
+    """Source column names of an attribute: one name, or a list/tuple of names."""
+    return [source] if isinstance(source, str) else list(source)
+
+
+def _missing(_):
+    """Converter for an optional source column the header lacks."""
+    return None
+
+
+def _tuple_getter(positions):
+    """itemgetter that always returns a tuple, even for a single position."""
+    if len(positions) == 1:
+        getter = itemgetter(positions[0])
+        return lambda row: (getter(row),)
+    return itemgetter(*positions)
+
+
+class CompiledEntity:
+    """Precomputed accessors for one entity against one source header."""
+
+    def __init__(self, name, mapping, positions, aliases=None, id_mode="hex"):
+        self.name = name
+        self.table = mapping["table"]
+        self.id_column = mapping["id_column"]
+        self.id_space = mapping.get("id_space", name)
+        self.id_prefix = f"{self.id_space}:"
+        self.aliases = aliases or {}  # entity_id -> canonical_id from entity resolution
+        self.int_ids = id_mode == "int64"
+
+        # itemgetter returns a scalar for one key column and a tuple otherwise;
+        # both are hashable and can be used directly as the natural key
+        key_positions = [positions[column] for column in mapping["key"]]
+        self.key_getter = itemgetter(*key_positions)
+        self.single_key = len(key_positions) == 1
+
+        # converters: (offset, width, fn); a multi-column source spans `width`
+        # cells that fn folds into one. Listed last-first so folding a span
+        # never shifts the offset of a converter still to be applied.
+        sources, self.converters = [], []
+        for source in mapping["attributes"].values():
+            converter = None
+            if isinstance(source, tuple):
+                source, converter = source
+            columns = source_columns(source)
+            if any(column not in positions for column in columns):
+                # An optional column this extract lacks: read any cell and convert it to None
+                columns, converter = mapping["key"][:1], _missing
+            if converter is not None:
+                self.converters.insert(0, (len(sources), len(columns), converter))
+            sources.extend(positions[column] for column in columns)
+        self.attribute_getter = _tuple_getter(sources)
+
+        references = mapping.get("references", {})
+        self.references = list(references.values())
+        self.columns = [self.id_column, *mapping["attributes"], *references]
+        placeholders = ", ".join("?" * len(self.columns))
+        self.insert_sql = f"INSERT OR IGNORE INTO {self.table} ({', '.join(self.columns)}) VALUES ({placeholders})"
+        updates = ", ".join(f"{column} = excluded.{column}" for column in self.columns[1:])
+        self.upsert_sql = (f"INSERT INTO {self.table} ({', '.join(self.columns)}) VALUES ({placeholders}) "
+                           f"ON CONFLICT({self.id_column}) DO UPDATE SET {updates}")
+
+    def make_id(self, key):
+        """Hash a natural key (as returned by key_getter) into the entity ID, then map it to its canonical ID."""
+        key_string = str(key) if self.single_key else "|".join(map(str, key))
+        digest = hashlib.md5((self.id_prefix + key_string).encode())
+        if self.int_ids:
+            entity_id = int.from_bytes(digest.digest()[:8], "big", signed=True)
+        else:
+            entity_id = digest.hexdigest()
+        return self.aliases.get(entity_id, entity_id)
+
+    def record(self, entity_id, row, reference_ids=()):
+        """Build the table row for this entity; `reference_ids` are the IDs of its references, in order."""
+        attributes = self.attribute_getter(row)
+        if self.converters:
+            attributes = list(attributes)
+            for offset, width, converter in self.converters:
+                if width == 1:
+                    attributes[offset] = converter(attributes[offset])
+                else:
+                    attributes[offset:offset + width] = [converter(tuple(attributes[offset:offset + width]))]
+        return (entity_id, *attributes, *reference_ids)
+
+
+class ColumnPlan:
+    """
+    Entity mappings compiled once per source header into positional accessors,
+    so per-row extraction never searches the column list.
+    """
+
+    def __init__(self, columns, mappings=ENTITY_MAPPINGS, aliases=None, id_mode="hex"):
+        """
+        `aliases` is {id space: {entity_id: canonical_id}} in hex, as loaded by
+        entity_resolution.load_aliases(); `id_mode` is a key of schema.ID_MODES.
+        """
+        if id_mode not in ID_MODES:
+            raise ValueError(f"Unknown ID mode {id_mode!r}; expected one of {list(ID_MODES)}")
+        aliases = aliases or {}
+        if id_mode == "int64":
+            aliases = {space: {hex_to_int64(entity_id): hex_to_int64(canonical_id)
+                               for entity_id, canonical_id in space_aliases.items()}
+                       for space, space_aliases in aliases.items()}
+        self.id_mode = id_mode
+        positions = {name: position for position, name in enumerate(columns)}
+
+        unknown = [name for name in mappings if name not in ENTITY_SCHEMAS]
+        if unknown:
+            raise ValueError(f"Mappings for entities not in ENTITY_SCHEMAS: {unknown}")
+
+        missing = sorted({
+            column
+            for mapping in mappings.values()
+            for column in [*mapping["key"],
+                           *(column
+                             for source in mapping["attributes"].values()
+                             for column in source_columns(source[0] if isinstance(source, tuple) else source))]
+            if column not in positions and column not in mapping.get("optional", ())
+        })
+        if missing:
+            raise ValueError(f"Source columns missing from header: {missing}")
+
+        order = list(mappings)
+        for name, mapping in mappings.items():
+            for referenced in mapping.get("references", {}).values():
+                if referenced not in order[:order.index(name)]:
+                    raise ValueError(f"{name} references {referenced}, which must be mapped before it")
+
+        self.entities = [CompiledEntity(name, mapping, positions, aliases.get(mapping.get("id_space", name)), id_mode)
+                         for name, mapping in mappings.items()]
+        self.by_name = {entity.name: entity for entity in self.entities}
+
+    def records(self, row):
+        """Return {entity name: table row} for every entity derived from one source row."""
+        ids, records = {}, {}
+        for entity in self.entities:
+            entity_id = entity.make_id(entity.key_getter(row))
+            ids[entity.name] = entity_id
+            records[entity.name] = entity.record(entity_id, row, [ids[name] for name in entity.references])
+        return records
@@ -0,0 +1,43 @@
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+# Date formats seen in the state extracts, tried in order
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%Y-%m-%d %H:%M:%S")
+EPOCH = date(1970, 1, 1)
+
+
+@lru_cache(maxsize=65536)
+def _parse_text(value):
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_date(value):
+    """
+    Parse the date formats seen in the state extract; None when empty or unparseable.
+
+    Integers are epoch days, as the entity tables store dates.
+    """
+    if isinstance(value, datetime):  # A datetime is a date too, but subtracts only from datetimes
+        return value.date()
+    if value is None or isinstance(value, date):
+        return value
+    if isinstance(value, int):
+        return from_epoch_day(value)
+    value = str(value).strip()
+    return _parse_text(value) if value else None
+
+
+def epoch_day(value):
+    """Days since 1970-01-01 of a date or date string, the sortable integer form dates are stored in."""
+    parsed = parse_date(value)
+    return (parsed - EPOCH).days if parsed else None
+
+
+def from_epoch_day(day):
+    """Inverse of epoch_day()."""
+    return None if day is None else EPOCH + timedelta(days=day)
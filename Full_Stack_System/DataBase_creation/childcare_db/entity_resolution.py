@@ -0,0 +1,263 @@
+import argparse
+import re
+import sqlite3
+import time
+from difflib import SequenceMatcher
+
+from column_plan import ColumnPlan
+from schema import ENTITY_MAPPINGS
+
+# entity_id -> canonical_id for IDs that resolution merged into another
+# entity. Normalizers map every generated ID through this table.
+ENTITY_ALIASES_SQL = """
+CREATE TABLE IF NOT EXISTS entity_aliases (
+    entity_type TEXT NOT NULL,  -- Entity name (ID space), e.g. 'Facility'
+    entity_id TEXT NOT NULL,
+    canonical_id TEXT NOT NULL,
+    score REAL,                 -- Best pairwise similarity that placed it in its cluster
+    PRIMARY KEY (entity_type, entity_id)
+) WITHOUT ROWID;
+"""
+
+# Source columns compared for each resolvable entity. Only entities whose
+# natural key includes the address are resolved; "license" is optional.
+RESOLUTION_FIELDS = {
+    "Facility": {"name": "Facility Name", "address": "Facility Address", "zip": "Zip Code",
+                 "license": "License Number"},
+    "Location": {"name": "Facility Name", "address": "Facility Address", "zip": "Zip Code"},
+}
+
+WINDOW_SIZE = 10       # Sorted-neighbourhood window: each record is compared with the next WINDOW_SIZE - 1
+ADDRESS_THRESHOLD = 0.90
+NAME_THRESHOLD = 0.80
+
+ABBREVIATIONS = {
+    "ctr": "center", "cntr": "center", "centre": "center", "chld": "child", "dev": "development",
+    "st": "street", "str": "street", "ave": "avenue", "av": "avenue", "rd": "road", "dr": "drive",
+    "blvd": "boulevard", "ln": "lane", "ct": "court", "hwy": "highway", "pkwy": "parkway", "pl": "place",
+    "n": "north", "s": "south", "e": "east", "w": "west", "ste": "suite", "apt": "apartment",
+    "&": "and", "mt": "mount",
+}
+NOISE_WORDS = {"inc", "llc", "the", "of"}
+UNIT_WORDS = {"suite", "apartment", "unit", "room", "floor", "building"}
+
+_DOTTED_ACRONYM_RE = re.compile(r"\b(?:[a-z]\.){2,}")
+_TOKEN_RE = re.compile(r"[a-z0-9&]+")
+
+
+def normalize_text(value):
+    """Lowercase, collapse dotted acronyms (A.B.C. -> abc), expand abbreviations and drop noise words."""
+    if value is None:
+        return ""
+    text = _DOTTED_ACRONYM_RE.sub(lambda m: m.group(0).replace(".", ""), str(value).lower().replace("'", ""))
+    tokens = (ABBREVIATIONS.get(token, token) for token in _TOKEN_RE.findall(text))
+    return " ".join(token for token in tokens if token not in NOISE_WORDS)
+
+
+def normalize_zip(value):
+    """First five digits of a zip code ('48203-1234', 48203.0 -> '48203')."""
+    digits = re.sub(r"\D", "", str(value).split(".")[0]) if value is not None else ""
+    return digits[:5]
+
+
+def house_number(address):
+    """Leading street number of a normalized address, or '' when there is none."""
+    first = address.split(" ", 1)[0]
+    return first if first.isdigit() else ""
+
+
+def unit_number(address):
+    """Suite, apartment or unit designators of a normalized address ('suite 2' -> '2'), or ''."""
+    tokens = address.split(" ")
+    return " ".join(tokens[i + 1] for i in range(len(tokens) - 1) if tokens[i] in UNIT_WORDS)
+
+
+def normalize_license(value):
+    """License number for comparison: stripped and uppercased, '' when missing."""
+    return str(value).strip().upper() if value is not None else ""
+
+
+def similarity(a, b, threshold=0.0):
+    """
+    String similarity in [0, 1]: the better of token-set overlap and character sequence ratio.
+
+    Returns 0.0 as soon as the score provably cannot reach `threshold`.
+    """
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    jaccard = len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+    if jaccard >= threshold and threshold:
+        return jaccard
+    matcher = SequenceMatcher(None, a, b)
+    if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+        return jaccard
+    return max(jaccard, matcher.ratio())
+
+
+class DisjointSet:
+    """Union-find with path halving; every cluster is rooted at its smallest ID."""
+
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item):
+        parent = self.parent
+        parent.setdefault(item, item)
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            if root_b < root_a:
+                root_a, root_b = root_b, root_a
+            self.parent[root_b] = root_a
+
+
+def resolve_records(records, window=WINDOW_SIZE):
+    """
+    Cluster near-duplicate records {entity_id: (name, address, zip[, license])}.
+
+    Records are blocked by zip and compared only within a sliding window
+    over two sort orders (zip + house number + address, and zip + name), so
+    the cost is O(n log n + n * window) rather than O(n^2). Records with
+    different house numbers or suite/unit numbers never match, nor do two
+    records that both carry a license number and disagree on it. Returns
+    {entity_id: (canonical_id, score)} for every ID merged into another.
+    """
+    prepared = []
+    for entity_id, (name, address, zip_code, *license_number) in records.items():
+        address = normalize_text(address)
+        prepared.append((entity_id, normalize_zip(zip_code), house_number(address), normalize_text(name), address,
+                         unit_number(address), normalize_license(license_number[0] if license_number else None)))
+
+    clusters, scores = DisjointSet(), {}
+    for sort_key in (lambda r: (r[1], r[2], r[4], r[3]), lambda r: (r[1], r[3], r[2], r[4])):
+        ordered = sorted(prepared, key=sort_key)
+        for i, (entity_id, zip_code, number, name, address, unit, license_number) in enumerate(ordered):
+            for other in ordered[i + 1:i + window]:
+                other_id, other_zip, other_number, other_name, other_address, other_unit, other_license = other
+                if other_zip != zip_code:
+                    break  # Sorted by zip first: the rest of the window is another block
+                if number != other_number or unit != other_unit:
+                    continue
+                if license_number and other_license and license_number != other_license:
+                    continue  # Two licensed facilities sharing a building
+                address_score = similarity(address, other_address, ADDRESS_THRESHOLD)
+                if address_score < ADDRESS_THRESHOLD:
+                    continue
+                name_score = similarity(name, other_name, NAME_THRESHOLD)
+                if name_score < NAME_THRESHOLD:
+                    continue
+                clusters.union(entity_id, other_id)
+                pair_score = (address_score + name_score) / 2
+                for member in (entity_id, other_id):
+                    scores[member] = max(scores.get(member, 0.0), pair_score)
+
+    aliases = {}
+    for entity_id in clusters.parent:
+        canonical_id = clusters.find(entity_id)
+        if canonical_id != entity_id:
+            aliases[entity_id] = (canonical_id, scores.get(entity_id))
+    return aliases
+
+
+def collect_records(columns, row_batches, mappings=ENTITY_MAPPINGS):
+    """Gather {entity name: {entity_id: (name, address, zip[, license])}} for the resolvable entities."""
+    plan = ColumnPlan(columns, mappings)
+    positions = {name: position for position, name in enumerate(columns)}
+    targets = []
+    for entity in plan.entities:
+        fields = RESOLUTION_FIELDS.get(entity.name)
+        if fields is None or fields["address"] not in mappings[entity.name]["key"]:
+            continue
+        getters = [positions[fields[field]] for field in ("name", "address", "zip")]
+        if fields.get("license") in positions:
+            getters.append(positions[fields["license"]])
+        targets.append((entity, getters))
+
+    records = {entity.name: {} for entity, _ in targets}
+    for rows in row_batches:
+        for entity, getters in targets:
+            entity_records = records[entity.name]
+            for row in rows:
+                entity_id = entity.make_id(entity.key_getter(row))
+                if entity_id not in entity_records:
+                    entity_records[entity_id] = tuple(row[position] for position in getters)
+    return records
+
+
+def write_aliases(conn, resolved):
+    """Replace the alias rows of every resolved entity type in one transaction."""
+    cursor = conn.cursor()
+    cursor.executescript(ENTITY_ALIASES_SQL)
+    previous_isolation = conn.isolation_level
+    conn.isolation_level = None
+    try:
+        cursor.execute("BEGIN")
+        for entity_type, aliases in resolved.items():
+            cursor.execute("DELETE FROM entity_aliases WHERE entity_type = ?", (entity_type,))
+            cursor.executemany(
+                "INSERT INTO entity_aliases (entity_type, entity_id, canonical_id, score) VALUES (?, ?, ?, ?)",
+                ((entity_type, entity_id, canonical_id, score)
+                 for entity_id, (canonical_id, score) in sorted(aliases.items()))
+            )
+        cursor.execute("COMMIT")
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+    finally:
+        conn.isolation_level = previous_isolation
+
+
+def load_aliases(conn):
+    """Return {entity type: {entity_id: canonical_id}}; empty when resolution has never run."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'entity_aliases';")
+    if cursor.fetchone() is None:
+        return {}
+    aliases = {}
+    cursor.execute("SELECT entity_type, entity_id, canonical_id FROM entity_aliases;")
+    for entity_type, entity_id, canonical_id in cursor:
+        aliases.setdefault(entity_type, {})[entity_id] = canonical_id
+    return aliases
+
+
+def resolve_rows(conn, columns, row_batches, mappings=ENTITY_MAPPINGS, window=WINDOW_SIZE):
+    """Resolve entities from batches of source rows and store the canonical-ID mapping."""
+    started = time.perf_counter()
+    records = collect_records(columns, row_batches, mappings)
+    resolved = {name: resolve_records(entity_records, window) for name, entity_records in records.items()}
+    write_aliases(conn, resolved)
+    for name, aliases in resolved.items():
+        print(f"🧩 {name}: {len(records[name]):,} records, {len(aliases):,} merged into "
+              f"{len(set(canonical for canonical, _ in aliases.values())):,} canonical entities")
+    print(f"🧩 Entity resolution took {time.perf_counter() - started:.2f}s")
+    return resolved
+
+
+def resolve_staging_table(conn, table_name="childcare_facilities", mappings=ENTITY_MAPPINGS,
+                          window=WINDOW_SIZE, batch_size=50000):
+    """Resolve entities over the staging table before it is normalized."""
+    cursor = conn.cursor()
+    cursor.execute(f'PRAGMA table_info("{table_name}");')
+    columns = [col[1] for col in cursor.fetchall()]
+    cursor.execute(f'SELECT * FROM "{table_name}";')
+    return resolve_rows(conn, columns, iter(lambda: cursor.fetchmany(batch_size), []), mappings, window)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge near-duplicate facilities and locations in the staging table.")
+    parser.add_argument("--db", default="childcare.db")
+    parser.add_argument("--table", default="childcare_facilities", help="Staging table holding the raw extract")
+    parser.add_argument("--window", type=int, default=WINDOW_SIZE, help="Sorted-neighbourhood window size")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    resolve_staging_table(conn, args.table, window=args.window)
+    conn.close()
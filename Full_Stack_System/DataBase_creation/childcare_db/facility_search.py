@@ -0,0 +1,165 @@
+import argparse
+import re
+import sqlite3
+import time
+
+# Full-text index over facility name, address and school district. Its rowid is
+# the facilities rowid, so a match joins straight back to the facility row.
+# (VACUUM may renumber facilities rowids; run build_search_index() afterwards.)
+SEARCH_INDEX_SQL = """
+CREATE VIRTUAL TABLE facility_search USING fts5(
+    facility_name,
+    facility_address,
+    district_name,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+-- Keep the index in step with upserts/deletes from incremental_import.py
+CREATE TRIGGER facility_search_insert AFTER INSERT ON facilities BEGIN
+    INSERT INTO facility_search (rowid, facility_name, facility_address, district_name)
+    VALUES (new.rowid, new.facility_name, new.facility_address,
+            (SELECT district_name FROM school_districts WHERE district_id = new.school_district_id));
+END;
+
+CREATE TRIGGER facility_search_delete AFTER DELETE ON facilities BEGIN
+    DELETE FROM facility_search WHERE rowid = old.rowid;
+END;
+
+CREATE TRIGGER facility_search_update
+AFTER UPDATE OF facility_name, facility_address, school_district_id ON facilities BEGIN
+    DELETE FROM facility_search WHERE rowid = old.rowid;
+    INSERT INTO facility_search (rowid, facility_name, facility_address, district_name)
+    VALUES (new.rowid, new.facility_name, new.facility_address,
+            (SELECT district_name FROM school_districts WHERE district_id = new.school_district_id));
+END;
+"""
+
+# B-tree indexes for the structured filters
+FILTER_INDEXES_SQL = """
+CREATE INDEX IF NOT EXISTS locations_zip_code_idx ON locations (zip_code);
+CREATE INDEX IF NOT EXISTS facilities_location_idx ON facilities (location_id);
+CREATE INDEX IF NOT EXISTS facilities_type_idx ON facilities (facility_type COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS facilities_subsidies_idx ON facilities (accepts_subsidies);
+"""
+
+# bm25() column weights: a hit in the name counts most, then address, then district
+BM25_WEIGHTS = (10.0, 2.0, 1.0)
+
+SUBSIDY_VALUES = {
+    True: ("Yes", "yes", "YES", "Y", "True", "TRUE", "1"),
+    False: ("No", "no", "NO", "N", "False", "FALSE", "0"),
+}
+
+RESULT_COLUMNS = ["facility_id", "facility_name", "facility_address", "city", "zip_code",
+                  "facility_type", "accepts_subsidies", "district_name", "rank"]
+
+
+def build_search_index(conn):
+    """(Re)build the FTS5 index, its sync triggers and the filter indexes from the entity tables."""
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    cursor.execute("DROP TABLE IF EXISTS facility_search;")
+    for trigger in ("facility_search_insert", "facility_search_delete", "facility_search_update"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger};")
+    cursor.executescript(SEARCH_INDEX_SQL + FILTER_INDEXES_SQL)
+
+    cursor.execute("""
+        INSERT INTO facility_search (rowid, facility_name, facility_address, district_name)
+        SELECT f.rowid, f.facility_name, f.facility_address, d.district_name
+        FROM facilities f
+        LEFT JOIN school_districts d ON d.district_id = f.school_district_id;
+    """)
+    indexed = cursor.rowcount
+    cursor.execute("INSERT INTO facility_search (facility_search) VALUES ('optimize');")
+    cursor.execute("ANALYZE;")  # Statistics let the planner pick the zip index over the low-selectivity flags
+    conn.commit()
+    print(f"🔎 Indexed {indexed:,} facilities for search in {time.perf_counter() - started:.2f}s")
+    return indexed
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query: every word must match, as a prefix."""
+    words = re.findall(r"\w+", text)
+    return " ".join('"{}"*'.format(word.replace('"', '""')) for word in words)
+
+
+def search_facilities(conn, text=None, zip_code=None, facility_type=None, accepts_subsidies=None,
+                      city=None, limit=10):
+    """
+    Return up to `limit` facilities as dicts, combining free text with structured filters.
+
+    With `text`, results are ranked by bm25 (best first); without it, by name.
+    """
+    clauses, params = [], []
+    if zip_code is not None:
+        clauses.append("l.zip_code = ?")
+        params.append(str(zip_code))
+    if city is not None:
+        clauses.append("l.city = ? COLLATE NOCASE")
+        params.append(city)
+    if facility_type is not None:
+        clauses.append("f.facility_type = ? COLLATE NOCASE")
+        params.append(facility_type)
+    if accepts_subsidies is not None:
+        values = SUBSIDY_VALUES[bool(accepts_subsidies)]
+        clauses.append(f"f.accepts_subsidies IN ({', '.join('?' * len(values))})")
+        params.extend(values)
+
+    match = fts_query(text) if text else ""
+    if match:
+        weights = ", ".join(map(str, BM25_WEIGHTS))
+        sql = f"""
+            SELECT f.facility_id, f.facility_name, f.facility_address, l.city, l.zip_code,
+                   f.facility_type, f.accepts_subsidies, s.district_name, bm25(facility_search, {weights}) AS rank
+            FROM facility_search s
+            JOIN facilities f ON f.rowid = s.rowid
+            LEFT JOIN locations l ON l.location_id = f.location_id
+            WHERE facility_search MATCH ?{''.join(' AND ' + clause for clause in clauses)}
+            ORDER BY rank
+            LIMIT ?;
+        """
+        params = [match, *params, limit]
+    else:
+        sql = f"""
+            SELECT f.facility_id, f.facility_name, f.facility_address, l.city, l.zip_code,
+                   f.facility_type, f.accepts_subsidies, d.district_name, NULL AS rank
+            FROM facilities f
+            LEFT JOIN locations l ON l.location_id = f.location_id
+            LEFT JOIN school_districts d ON d.district_id = f.school_district_id
+            {'WHERE ' + ' AND '.join(clauses) if clauses else ''}
+            ORDER BY f.facility_name
+            LIMIT ?;
+        """
+        params = [*params, limit]
+
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    return [dict(zip(RESULT_COLUMNS, row)) for row in cursor.fetchall()]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search childcare facilities by text, zip, type and subsidies.")
+    parser.add_argument("text", nargs="?", help="Free text matched against name, address and district")
+    parser.add_argument("--db", default="childcare.db")
+    parser.add_argument("--zip", dest="zip_code")
+    parser.add_argument("--city")
+    parser.add_argument("--type", dest="facility_type")
+    parser.add_argument("--subsidies", action="store_true", default=None, help="Only facilities accepting subsidies")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the search index before querying")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    if args.rebuild or not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'facility_search'").fetchone():
+        build_search_index(conn)
+
+    started = time.perf_counter()
+    results = search_facilities(conn, args.text, args.zip_code, args.facility_type, args.subsidies,
+                                args.city, args.limit)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    for result in results:
+        print(result)
+    print(f"🔢 {len(results)} results in {elapsed_ms:.1f} ms")
+    conn.close()
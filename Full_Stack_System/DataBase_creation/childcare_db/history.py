@@ -0,0 +1,366 @@
+import argparse
+import hashlib
+import sqlite3
+from datetime import date
+from functools import lru_cache
+
+from column_plan import ColumnPlan, detect_id_mode, hex_to_int64
+from dates import epoch_day, parse_date
+from entity_resolution import load_aliases
+from schema import ENTITY_MAPPINGS, ID_MODES
+
+# SCD type-2 history: one row per version of an entity, valid on
+# [valid_from, valid_to). valid_to is NULL for the current version and set to
+# the extract date that replaced the version (or dropped the entity).
+# Versions of an entity are only written when its content changes, so daily
+# loads of an unchanged extract add nothing. previous_status copies the status
+# of the version before, so status changes can be found from the index alone.
+HISTORY_SQL = """
+CREATE TABLE IF NOT EXISTS facility_history (
+    facility_id {id_type} NOT NULL,
+    valid_from TEXT NOT NULL,  -- ISO date of the first extract carrying this version
+    valid_to TEXT,             -- ISO date it stopped being current; NULL while current
+    version_hash TEXT NOT NULL,
+    status TEXT,
+    previous_status TEXT,
+    facility_name TEXT,
+    license_number TEXT,
+    facility_address TEXT,
+    phone_number TEXT,
+    facility_type TEXT,
+    operational_schedule TEXT,
+    accepts_subsidies TEXT,
+    capacity INTEGER,
+    enrollment INTEGER,
+    staff INTEGER,
+    location_id {id_type},
+    owner_id {id_type},
+    license_id {id_type},
+    school_district_id {id_type},
+    PRIMARY KEY (facility_id, valid_from)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS facility_history_status_changes_idx
+    ON facility_history(valid_from) WHERE status IS NOT previous_status;
+
+CREATE TABLE IF NOT EXISTS license_history (
+    license_id {id_type} NOT NULL,
+    valid_from TEXT NOT NULL,
+    valid_to TEXT,
+    version_hash TEXT NOT NULL,
+    status TEXT,
+    previous_status TEXT,
+    license_number TEXT,
+    license_type TEXT,
+    license_issue_date INTEGER,  -- Epoch days, as in licenses
+    license_expiry_date INTEGER,
+    date_originally_licensed INTEGER,
+    PRIMARY KEY (license_id, valid_from)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS license_history_status_changes_idx
+    ON license_history(valid_from) WHERE status IS NOT previous_status;
+"""
+
+# Entities that keep history -> history table and the source column holding their status.
+# The extract only has a facility-level status; a license takes the status of its facility.
+HISTORY_MAPPINGS = {
+    "Facility": {"table": "facility_history", "status": "Facility Status"},
+    "License": {"table": "license_history", "status": "Facility Status"},
+}
+
+
+@lru_cache(maxsize=4096)
+def snapshot_date(value):
+    """ISO date of an extract date ('02/10/2025' -> '2025-02-10'); None when unparseable."""
+    parsed = parse_date(value)
+    return parsed.isoformat() if parsed else None
+
+
+# Columns added to history tables after they shipped: table -> {column: definition}
+ADDED_HISTORY_COLUMNS = {
+    "facility_history": {"capacity": "INTEGER", "enrollment": "INTEGER", "staff": "INTEGER"},
+}
+
+# license_history date columns, stored as extract text before they became epoch days
+LICENSE_DATE_COLUMNS = ("license_issue_date", "license_expiry_date", "date_originally_licensed")
+
+
+def _columns(conn, table):
+    return {col[1]: col[2] for col in conn.execute(f"PRAGMA table_info({table});")}
+
+
+def _convert_license_dates(conn, history_sql):
+    """
+    Rebuild a license_history that predates epoch-day dates, converting its text dates. A column's
+    affinity cannot be changed in place, and a TEXT column would store the days as text again.
+    """
+    conn.create_function("epoch_day", 1, epoch_day, deterministic=True)
+    copied = [column for column in _columns(conn, "license_history") if column != "date_originally_licensed"]
+    dates = [column for column in copied if column in LICENSE_DATE_COLUMNS]
+    # Dates no format in dates.py parses become NULL, as they do when loading; count them first
+    unparseable = conn.execute(f"""
+        SELECT COUNT(*) FROM license_history
+        WHERE {" OR ".join(f"(trim({column}) <> '' AND epoch_day({column}) IS NULL)" for column in dates)}
+    """).fetchone()[0]
+    selected = [f"epoch_day({column})" if column in LICENSE_DATE_COLUMNS else column for column in copied]
+    try:
+        conn.executescript(f"""
+        BEGIN;
+        ALTER TABLE license_history RENAME TO license_history_text_dates;
+        DROP INDEX IF EXISTS license_history_status_changes_idx;
+        {history_sql}
+        INSERT INTO license_history ({', '.join(copied)})
+            SELECT {', '.join(selected)} FROM license_history_text_dates;
+        DROP TABLE license_history_text_dates;
+        COMMIT;
+        """)
+    except sqlite3.Error:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK;")
+        raise
+    print("🕰 license_history: dates converted to epoch days")
+    if unparseable:
+        print(f"⚠️ license_history: {unparseable:,} versions had unparseable dates, now NULL")
+
+
+def create_history_tables(conn, id_mode="hex"):
+    """
+    Create the history tables (if missing) with IDs stored as in the entity tables. History is
+    kept across rebuilds, so tables from older versions are upgraded in place.
+    """
+    history_sql = HISTORY_SQL.format(id_type=ID_MODES[id_mode])
+    if _columns(conn, "license_history").get("license_issue_date") == "TEXT":
+        _convert_license_dates(conn, history_sql)
+    conn.executescript(history_sql)
+    for table, columns in ADDED_HISTORY_COLUMNS.items():
+        existing = _columns(conn, table)
+        for column, definition in columns.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition};")
+    conn.commit()
+
+
+class HistoryRecorder:
+    """
+    Collects one version per entity from source rows, then applies them to the
+    history tables: unchanged versions are skipped, changed ones close the
+    current version and open a new one.
+    """
+
+    def __init__(self, plan, columns, mappings=HISTORY_MAPPINGS):
+        positions = {name: position for position, name in enumerate(columns)}
+        self.date_position = positions.get("Date Extracted")
+        self.default_date = date.today().isoformat()
+        self.latest_date = None
+        # entity name -> (compiled entity, history table, status position)
+        self.targets = [(plan.by_name[name], mapping["table"], positions[mapping["status"]])
+                        for name, mapping in mappings.items()]
+        # Entities whose IDs a version needs: the targets and what they reference, in plan order
+        needed = {name for entity, _, _ in self.targets for name in (entity.name, *entity.references)}
+        self.id_entities = [entity for entity in plan.entities if entity.name in needed]
+        # entity name -> {entity_id: (valid_from, version_hash, status, record)}
+        self.versions = {entity.name: {} for entity, _, _ in self.targets}
+
+    def add(self, row, records=None):
+        """
+        Collect the versions in one source row; first row per ID wins.
+        `records` is ColumnPlan.records(row) when the caller already has it.
+        """
+        valid_from = None
+        if self.date_position is not None:
+            valid_from = snapshot_date(row[self.date_position])
+        valid_from = valid_from or self.default_date
+        if self.latest_date is None or valid_from > self.latest_date:
+            self.latest_date = valid_from
+
+        ids = None
+        if records is None:
+            ids = {entity.name: entity.make_id(entity.key_getter(row)) for entity in self.id_entities}
+        for entity, _, status_position in self.targets:
+            versions = self.versions[entity.name]
+            if records is not None:
+                record = records[entity.name]
+            elif ids[entity.name] in versions:
+                continue
+            else:
+                record = entity.record(ids[entity.name], row, [ids[name] for name in entity.references])
+            if record[0] in versions:
+                continue
+            status = row[status_position]
+            content = "\x1f".join("" if value is None else str(value) for value in (*record[1:], status))
+            versions[record[0]] = (valid_from, hashlib.md5(content.encode()).hexdigest(), status, record)
+
+    def apply(self, cursor, close_missing=()):
+        """
+        Write the collected versions inside the caller's transaction; returns
+        {table: {"opened": n, "unchanged": n, "closed": n}}.
+
+        Entities named in `close_missing` are treated as complete snapshots:
+        their current versions not collected here are closed at the latest extract date.
+        """
+        stats = {}
+        for entity, table, _ in self.targets:
+            id_column = entity.id_column
+            columns = ["valid_from", "version_hash", "status", "previous_status", *entity.columns]
+            insert_sql = (f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+                          f"VALUES ({', '.join('?' * len(columns))})")
+            counts = stats[table] = {"opened": 0, "unchanged": 0, "closed": 0}
+            latest_sql = f"SELECT {id_column}, valid_from, valid_to, version_hash, status, previous_status FROM {table}"
+            preloaded = None
+            if entity.name in close_missing:
+                # A complete snapshot touches every entity: one ordered scan beats a lookup per ID
+                cursor.execute(latest_sql + f" ORDER BY {id_column}, valid_from;")
+                preloaded = {row[0]: row[1:] for row in cursor}  # Later versions overwrite earlier ones
+
+            for entity_id, (valid_from, version_hash, status, record) in self.versions[entity.name].items():
+                if preloaded is not None:
+                    latest = preloaded.get(entity_id)
+                else:
+                    cursor.execute(latest_sql + f" WHERE {id_column} = ? ORDER BY valid_from DESC LIMIT 1;",
+                                   (entity_id,))
+                    row = cursor.fetchone()
+                    latest = row[1:] if row else None
+                previous_status = None
+                if latest is not None:
+                    latest_from, latest_to, latest_hash, latest_status, latest_previous = latest
+                    if latest_to is None and latest_hash == version_hash:
+                        counts["unchanged"] += 1
+                        continue
+                    if valid_from < latest_from:
+                        continue  # Older than the history already recorded: extracts apply in date order
+                    if valid_from == latest_from:
+                        previous_status = latest_previous  # Same extract date: replace that version
+                    else:
+                        previous_status = latest_status
+                        if latest_to is None:
+                            cursor.execute(f"UPDATE {table} SET valid_to = ? WHERE {id_column} = ? AND valid_from = ?",
+                                           (valid_from, entity_id, latest_from))
+                cursor.execute(insert_sql, (valid_from, version_hash, status, previous_status, *record))
+                counts["opened"] += 1
+
+            if entity.name in close_missing and self.latest_date is not None:
+                cursor.execute("CREATE TEMP TABLE IF NOT EXISTS history_seen (entity_id PRIMARY KEY) WITHOUT ROWID;")
+                cursor.execute("DELETE FROM history_seen;")
+                cursor.executemany("INSERT INTO history_seen (entity_id) VALUES (?)",
+                                   ((entity_id,) for entity_id in self.versions[entity.name]))
+                cursor.execute(f"""
+                    UPDATE {table} SET valid_to = ?
+                    WHERE valid_to IS NULL AND {id_column} NOT IN (SELECT entity_id FROM history_seen)
+                """, (self.latest_date,))
+                counts["closed"] += cursor.rowcount
+        return stats
+
+
+def close_versions(cursor, entity_name, id_query, valid_to, mappings=HISTORY_MAPPINGS):
+    """Close the current versions of the entities whose IDs `id_query` selects; returns how many."""
+    table, id_column = mappings[entity_name]["table"], ENTITY_MAPPINGS[entity_name]["id_column"]
+    cursor.execute(f"UPDATE {table} SET valid_to = ? WHERE valid_to IS NULL AND {id_column} IN ({id_query})",
+                   (valid_to,))
+    return cursor.rowcount
+
+
+def record_staging_snapshot(conn, table_name="childcare_facilities", batch_size=50000, id_mode=None):
+    """Record the staging table as a complete snapshot: entities missing from it are closed."""
+    id_mode = id_mode or detect_id_mode(conn) or "hex"
+    create_history_tables(conn, id_mode)
+    cursor = conn.cursor()
+    cursor.execute(f'PRAGMA table_info("{table_name}");')
+    columns = [col[1] for col in cursor.fetchall()]
+    recorder = HistoryRecorder(ColumnPlan(columns, aliases=load_aliases(conn), id_mode=id_mode), columns)
+
+    cursor.execute(f'SELECT * FROM "{table_name}";')
+    for rows in iter(lambda: cursor.fetchmany(batch_size), []):
+        for row in rows:
+            recorder.add(row)
+
+    previous_isolation = conn.isolation_level
+    conn.isolation_level = None
+    try:
+        cursor.execute("BEGIN")
+        stats = recorder.apply(cursor, close_missing=list(HISTORY_MAPPINGS))
+        cursor.execute("COMMIT")
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+    finally:
+        conn.isolation_level = previous_isolation
+
+    for table, counts in stats.items():
+        print(f"🕰 {table}: {counts['opened']:,} new versions, {counts['unchanged']:,} unchanged, "
+              f"{counts['closed']:,} closed")
+    return stats
+
+
+def _history_rows(cursor):
+    columns = [desc[0] for desc in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def _iso(value):
+    iso = snapshot_date(value)
+    if iso is None:
+        raise ValueError(f"Unrecognised date {value!r}")
+    return iso
+
+
+def as_of(conn, entity_name, entity_id, as_of_date, mappings=HISTORY_MAPPINGS):
+    """The version of one entity valid on `as_of_date`, as a dict; None if it did not exist then."""
+    table, id_column = mappings[entity_name]["table"], ENTITY_MAPPINGS[entity_name]["id_column"]
+    day = _iso(as_of_date)
+    # Primary-key seek: the last version starting on or before the date
+    cursor = conn.execute(f"""
+        SELECT * FROM {table}
+        WHERE {id_column} = ? AND valid_from <= ?
+        ORDER BY valid_from DESC LIMIT 1
+    """, (entity_id, day))
+    rows = _history_rows(cursor)
+    if not rows or (rows[0]["valid_to"] is not None and rows[0]["valid_to"] <= day):
+        return None
+    return rows[0]
+
+
+def status_changes(conn, start, end, entity_name="License", include_new=False, mappings=HISTORY_MAPPINGS):
+    """
+    Versions whose status differs from the version before, effective after
+    `start` and up to `end` (inclusive), oldest first. First versions of new
+    entities count as changes only with `include_new`.
+    """
+    table = mappings[entity_name]["table"]
+    # The status test repeats the partial index's condition so the planner can use it
+    cursor = conn.execute(f"""
+        SELECT * FROM {table}
+        WHERE status IS NOT previous_status AND valid_from > ? AND valid_from <= ?
+          {"" if include_new else "AND previous_status IS NOT NULL"}
+        ORDER BY valid_from
+    """, (_iso(start), _iso(end)))
+    return _history_rows(cursor)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the facility and license history.")
+    parser.add_argument("--db", default="childcare.db")
+    commands = parser.add_subparsers(dest="command", required=True)
+    as_of_parser = commands.add_parser("as-of", help="State of one facility or license on a date")
+    as_of_parser.add_argument("entity_id")
+    as_of_parser.add_argument("date")
+    as_of_parser.add_argument("--entity", choices=list(HISTORY_MAPPINGS), default="Facility")
+    changes_parser = commands.add_parser("changes", help="Status changes between two dates")
+    changes_parser.add_argument("start")
+    changes_parser.add_argument("end")
+    changes_parser.add_argument("--entity", choices=list(HISTORY_MAPPINGS), default="License")
+    changes_parser.add_argument("--include-new", action="store_true", help="Also list entities first seen then")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    if args.command == "as-of":
+        entity_id = args.entity_id
+        if detect_id_mode(conn) == "int64":
+            entity_id = hex_to_int64(entity_id)  # Exports carry int64 IDs as hex
+        version = as_of(conn, args.entity, entity_id, args.date)
+        print(version if version else f"⚠️ No {args.entity.lower()} {args.entity_id} on {args.date}")
+    else:
+        for change in status_changes(conn, args.start, args.end, args.entity, args.include_new):
+            print(f"{change['valid_from']}  {change['previous_status']} -> {change['status']}  "
+                  f"{change.get('license_number')}")
+    conn.close()
@@ -0,0 +1,221 @@
+import argparse
+import hashlib
+import sqlite3
+import time
+from datetime import date
+
+from capacity_rollup import refresh_rollup
+from column_plan import ColumnPlan, detect_id_mode
+from entity_resolution import load_aliases, resolve_rows
+from history import HistoryRecorder, close_versions, create_history_tables, snapshot_date
+from schema import ENTITY_MAPPINGS, ID_MODES, entity_tables_sql
+from stream_ingest import DEFAULT_CHUNK_SIZE, iter_typed_chunks, read_header
+
+# Per-facility fingerprint of the last source row that produced it
+FACILITY_HASHES_SQL = """
+CREATE TABLE IF NOT EXISTS facility_hashes (
+    facility_id {id_type} PRIMARY KEY,
+    row_hash TEXT NOT NULL,
+    date_extracted TEXT,
+    tombstoned_at TEXT  -- Set when the facility disappears from the extract
+);
+"""
+
+# Columns that change on every extract without the facility itself changing
+VOLATILE_COLUMNS = {"Date Extracted"}
+
+
+def row_fingerprint(row, hashed_positions):
+    """Hash the content of a source row, ignoring volatile columns."""
+    content = "\x1f".join("" if row[i] is None else str(row[i]) for i in hashed_positions)
+    return hashlib.md5(content.encode()).hexdigest()
+
+
+def retire_merged_rows(cursor, plan):
+    """
+    Delete the entity rows whose IDs entity resolution now maps onto another ID,
+    so upserting the canonical ID cannot collide with them on the natural key.
+    Facilities that were, or reference, such a row lose their facility_hashes
+    row and are applied again from the extract.
+    """
+    cursor.execute("DELETE FROM retired_ids;")
+    spaces = set()
+    for entity in plan.entities:
+        if entity.aliases and entity.id_space not in spaces:
+            spaces.add(entity.id_space)
+            cursor.executemany("INSERT OR IGNORE INTO retired_ids (id_space, entity_id) VALUES (?, ?)",
+                               ((entity.id_space, entity_id) for entity_id in entity.aliases))
+    if not spaces:
+        return
+
+    retired = "SELECT entity_id FROM retired_ids WHERE id_space = '{}'"
+    conditions = [f"facility_id IN ({retired.format('Facility')})"] + [
+        f"{column} IN ({retired.format(space)})"
+        for column, space in ENTITY_MAPPINGS["Facility"]["references"].items() if space in spaces
+    ]
+    cursor.execute(f"""
+        DELETE FROM facility_hashes
+        WHERE facility_id IN ({retired.format('Facility')})
+           OR facility_id IN (SELECT facility_id FROM facilities WHERE {' OR '.join(conditions)})
+    """)
+    for entity in plan.entities:
+        if entity.aliases:
+            cursor.execute(f"DELETE FROM {entity.table} WHERE {entity.id_column} IN ({retired.format(entity.id_space)})")
+
+
+def run_incremental_import(csv_file, conn, chunk_size=DEFAULT_CHUNK_SIZE, resolve=False, id_mode=None):
+    """
+    Apply one extract to the entity tables as a delta.
+
+    Only facilities whose source row hash is new or changed are upserted (with
+    their location, owner, license and school district); facilities missing from
+    the extract are tombstoned in facility_hashes and removed from facilities.
+    New or changed facilities and licenses get a new version in the history
+    tables; tombstoned facilities, and licenses no live facility references, have
+    their current version closed. The
+    capacity rollup is refreshed once the delta is committed.
+    IDs are mapped through entity_aliases; with `resolve`, entity resolution is
+    re-run over the extract first. Rows whose IDs now map onto another are
+    deleted first and the facilities involved applied again. Returns counts of new, changed, unchanged,
+    merged (rows resolving to a facility already applied) and tombstoned facilities.
+    IDs follow the existing tables' ID mode; `id_mode` only applies to a new database.
+    """
+    id_mode = detect_id_mode(conn) or id_mode or "hex"
+    id_type = ID_MODES[id_mode]
+    header = read_header(csv_file)
+    idx = {name: position for position, name in enumerate(header)}
+    if resolve:
+        resolve_rows(conn, header, iter_typed_chunks(csv_file, chunk_size))
+    plan = ColumnPlan(header, aliases=load_aliases(conn), id_mode=id_mode)
+    hashed_positions = [position for position, name in enumerate(header) if name not in VOLATILE_COLUMNS]
+    date_idx = idx.get("Date Extracted")
+
+    cursor = conn.cursor()
+    cursor.executescript(entity_tables_sql(id_mode) + FACILITY_HASHES_SQL.format(id_type=id_type))
+    cursor.execute(f"CREATE TEMP TABLE IF NOT EXISTS seen_facilities (facility_id {id_type} PRIMARY KEY);")
+    cursor.execute("DELETE FROM seen_facilities;")
+    cursor.execute(f"CREATE TEMP TABLE IF NOT EXISTS retired_ids (id_space TEXT, entity_id {id_type}, "
+                   "PRIMARY KEY (id_space, entity_id));")
+    create_history_tables(conn, id_mode)
+    history = HistoryRecorder(plan, header)
+
+    stats = {"new": 0, "changed": 0, "unchanged": 0, "merged": 0, "tombstoned": 0}
+    applied = set()  # Facility IDs already handled in this run
+    latest_extract = None
+    started = time.perf_counter()
+
+    previous_isolation = conn.isolation_level
+    conn.isolation_level = None  # One explicit transaction for the whole delta
+    try:
+        cursor.execute("BEGIN")
+        retire_merged_rows(cursor, plan)
+
+        for rows in iter_typed_chunks(csv_file, chunk_size):
+            seen = []
+            for row in rows:
+                records = plan.records(row)
+                facility_id = records["Facility"][0]
+                if facility_id in applied:
+                    # A duplicate merged by entity resolution: the first row wins, as in the bulk normalizer
+                    stats["merged"] += 1
+                    continue
+                applied.add(facility_id)
+                row_hash = row_fingerprint(row, hashed_positions)
+                date_extracted = row[date_idx] if date_idx is not None else None
+                extract_day = snapshot_date(date_extracted)  # ISO, so dates compare in order
+                if extract_day and (latest_extract is None or extract_day > latest_extract):
+                    latest_extract = extract_day
+                seen.append((facility_id,))
+
+                cursor.execute("SELECT row_hash, tombstoned_at FROM facility_hashes WHERE facility_id = ?",
+                               (facility_id,))
+                previous = cursor.fetchone()
+                if previous is not None and previous[0] == row_hash and previous[1] is None:
+                    stats["unchanged"] += 1
+                    continue
+
+                # New or changed facility: upsert it and everything it references
+                for entity in plan.entities:
+                    cursor.execute(entity.upsert_sql, records[entity.name])
+                history.add(row, records)
+
+                cursor.execute("""
+                    INSERT INTO facility_hashes (facility_id, row_hash, date_extracted, tombstoned_at)
+                    VALUES (?, ?, ?, NULL)
+                    ON CONFLICT(facility_id) DO UPDATE SET
+                        row_hash = excluded.row_hash,
+                        date_extracted = excluded.date_extracted,
+                        tombstoned_at = NULL
+                """, (facility_id, row_hash, date_extracted))
+                stats["new" if previous is None else "changed"] += 1
+
+            cursor.executemany("INSERT OR IGNORE INTO seen_facilities (facility_id) VALUES (?)", seen)
+
+            processed = stats["new"] + stats["changed"] + stats["unchanged"] + stats["merged"]
+            elapsed = time.perf_counter() - started
+            print(f"🔄 {processed:,} rows compared ({processed / elapsed if elapsed > 0 else 0:,.0f} rows/sec)")
+
+        stats["history"] = history.apply(cursor)
+
+        # Tombstone facilities that are no longer in the extract
+        tombstone_date = latest_extract or date.today().isoformat()
+        cursor.execute("""
+            UPDATE facility_hashes SET tombstoned_at = ?
+            WHERE tombstoned_at IS NULL
+              AND facility_id NOT IN (SELECT facility_id FROM seen_facilities)
+        """, (tombstone_date,))
+        stats["tombstoned"] = cursor.rowcount
+        # A full build fills facilities but not facility_hashes: tombstone its missing facilities too
+        cursor.execute("""
+            INSERT OR IGNORE INTO facility_hashes (facility_id, row_hash, date_extracted, tombstoned_at)
+            SELECT facility_id, '', NULL, ? FROM facilities
+            WHERE facility_id NOT IN (SELECT facility_id FROM seen_facilities)
+        """, (tombstone_date,))
+        stats["tombstoned"] += cursor.rowcount
+        for table in ("facilities", "facility_hours"):
+            cursor.execute(f"""
+                DELETE FROM {table}
+                WHERE facility_id IN (SELECT facility_id FROM facility_hashes WHERE tombstoned_at IS NOT NULL)
+            """)
+        close_versions(cursor, "Facility", "SELECT facility_id FROM facility_hashes WHERE tombstoned_at IS NOT NULL",
+                       tombstone_date)
+        # Facilities merged into another by entity resolution
+        close_versions(cursor, "Facility", "SELECT entity_id FROM retired_ids WHERE id_space = 'Facility'",
+                       tombstone_date)
+        # A license no live facility references any more is gone too, as a full rebuild would close it
+        close_versions(cursor, "License", """
+            SELECT license_id FROM license_history WHERE valid_to IS NULL
+            EXCEPT SELECT license_id FROM facilities WHERE license_id IS NOT NULL
+        """, tombstone_date)
+
+        cursor.execute("COMMIT")
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+    finally:
+        conn.isolation_level = previous_isolation
+
+    stats["rollup_changed"] = refresh_rollup(conn)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply a childcare extract to childcare.db as an incremental delta.")
+    parser.add_argument("csv_file", nargs="?", default="childcare_data.csv", help="Path to the state extract")
+    parser.add_argument("--db", default="childcare.db", help="SQLite database holding the entity tables")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows read per chunk")
+    parser.add_argument("--resolve", action="store_true", help="Re-run entity resolution over the extract first")
+    parser.add_argument("--id-mode", choices=list(ID_MODES), default="hex",
+                        help="ID storage when creating a new database (existing ones keep theirs)")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    stats = run_incremental_import(args.csv_file, conn, chunk_size=args.chunk_size, resolve=args.resolve,
+                                   id_mode=args.id_mode)
+    conn.close()
+
+    print(f"✅ Delta applied: {stats['new']} new, {stats['changed']} changed, "
+          f"{stats['unchanged']} unchanged, {stats['merged']} merged, {stats['tombstoned']} tombstoned")
+    for table, counts in stats["history"].items():
+        print(f"🕰 {table}: {counts['opened']:,} new versions, {counts['unchanged']:,} unchanged")
+    print(f"📊 Capacity rollup: {stats['rollup_changed']:,} facility contributions updated")
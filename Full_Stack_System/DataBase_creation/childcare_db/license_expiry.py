@@ -0,0 +1,106 @@
+import argparse
+import sqlite3
+import time
+from datetime import date
+
+from dates import epoch_day, from_epoch_day
+
+RESULT_COLUMNS = ["license_id", "license_number", "license_type", "license_expiry_date", "facility_id",
+                  "facility_name", "facility_type", "district_name"]
+
+# Summary groupings -> the column counted by
+GROUP_COLUMNS = {"district": "d.district_name", "license_type": "l.license_type", "facility_type": "f.facility_type"}
+
+
+def _expiry_filters(days, today, district, license_type, facility_type):
+    """WHERE clauses and params for licenses expiring within `days` of `today` (inclusive)."""
+    start = epoch_day(today or date.today())
+    if start is None:
+        raise ValueError(f"Unrecognised date {today!r}")
+    # A range on the leading column of licenses_expiry_idx; license_type is checked in the index too
+    clauses, params = ["l.license_expiry_date BETWEEN ? AND ?"], [start, start + days]
+    if license_type is not None:
+        clauses.append("l.license_type = ?")
+        params.append(license_type)
+    if district is not None:
+        clauses.append("d.district_name = ?")
+        params.append(district)
+    if facility_type is not None:
+        clauses.append("f.facility_type = ? COLLATE NOCASE")
+        params.append(facility_type)
+    return clauses, params
+
+
+def expiring_licenses(conn, days=90, today=None, district=None, license_type=None, facility_type=None,
+                      limit=None):
+    """
+    Facilities whose license expires within `days` of `today`, soonest first, as dicts.
+
+    One row per facility under the license; expiry dates are returned as dates.
+    """
+    clauses, params = _expiry_filters(days, today, district, license_type, facility_type)
+    sql = f"""
+        SELECT l.license_id, l.license_number, l.license_type, l.license_expiry_date, f.facility_id,
+               f.facility_name, f.facility_type, d.district_name
+        FROM licenses l
+        JOIN facilities f ON f.license_id = l.license_id
+        LEFT JOIN school_districts d ON d.district_id = f.school_district_id
+        WHERE {' AND '.join(clauses)}
+        ORDER BY l.license_expiry_date
+        {'LIMIT ?' if limit is not None else ''};
+    """
+    cursor = conn.cursor()
+    cursor.execute(sql, params + ([limit] if limit is not None else []))
+    results = []
+    for row in cursor.fetchall():
+        result = dict(zip(RESULT_COLUMNS, row))
+        result["license_expiry_date"] = from_epoch_day(result["license_expiry_date"])
+        results.append(result)
+    return results
+
+
+def expiring_counts(conn, days=90, today=None, group_by=("district", "license_type"), district=None,
+                    license_type=None, facility_type=None):
+    """Count licenses expiring within `days` of `today`, grouped by keys of GROUP_COLUMNS; largest first."""
+    clauses, params = _expiry_filters(days, today, district, license_type, facility_type)
+    groups = [GROUP_COLUMNS[name] for name in group_by]
+    sql = f"""
+        SELECT {', '.join(groups)}, COUNT(DISTINCT l.license_id) AS licenses
+        FROM licenses l
+        JOIN facilities f ON f.license_id = l.license_id
+        LEFT JOIN school_districts d ON d.district_id = f.school_district_id
+        WHERE {' AND '.join(clauses)}
+        GROUP BY {', '.join(groups)}
+        ORDER BY licenses DESC;
+    """
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    return [dict(zip([*group_by, "licenses"], row)) for row in cursor.fetchall()]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="List licenses expiring soon, for renewal outreach.")
+    parser.add_argument("--db", default="childcare.db")
+    parser.add_argument("--days", type=int, default=90, help="Window from today, inclusive")
+    parser.add_argument("--today", help="Start of the window (default: today)")
+    parser.add_argument("--district", help="School district name")
+    parser.add_argument("--license-type")
+    parser.add_argument("--type", dest="facility_type")
+    parser.add_argument("--summary", nargs="+", choices=list(GROUP_COLUMNS),
+                        help="Print counts grouped by these instead of the facilities")
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    started = time.perf_counter()
+    if args.summary:
+        results = expiring_counts(conn, args.days, args.today, args.summary, args.district, args.license_type,
+                                  args.facility_type)
+    else:
+        results = expiring_licenses(conn, args.days, args.today, args.district, args.license_type,
+                                    args.facility_type, args.limit)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    for result in results:
+        print(result)
+    print(f"📅 {len(results)} results in {elapsed_ms:.1f} ms")
+    conn.close()
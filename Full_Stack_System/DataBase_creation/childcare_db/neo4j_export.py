@@ -0,0 +1,235 @@
+import argparse
+import csv
+import gzip
+import os
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from column_plan import detect_id_mode
+from schema import DATE_COLUMNS
+
+# Entity tables -> (Neo4j label, ID column)
+NODE_EXPORTS = {
+    "facilities": ("Facility", "facility_id"),
+    "locations": ("Location", "location_id"),
+    "owners": ("Owner", "owner_id"),
+    "licenses": ("License", "license_id"),
+    "school_districts": ("SchoolDistrict", "district_id"),
+}
+
+# Relationship files -> facility foreign key, target table, relationship type,
+# and the SQL used for the plain CSV export (kept as export.py wrote it for LOAD CSV)
+RELATIONSHIP_EXPORTS = {
+    "facility_location_relationships": {
+        "foreign_key": "location_id",
+        "target": "locations",
+        "type": "LOCATED_AT",
+        "query": """
+            SELECT facilities.facility_id, facilities.facility_name, locations.location_id, locations.location_name
+            FROM facilities
+            LEFT JOIN locations ON facilities.location_id = locations.location_id;
+        """,
+    },
+    "facility_owner_relationships": {
+        "foreign_key": "owner_id",
+        "target": "owners",
+        "type": "OWNED_BY",
+        "query": """
+            SELECT facilities.facility_id, owners.owner_id
+            FROM facilities
+            LEFT JOIN owners ON facilities.owner_id = owners.owner_id;
+        """,
+    },
+    "facility_license_relationships": {
+        "foreign_key": "license_id",
+        "target": "licenses",
+        "type": "LICENSED_UNDER",
+        "query": """
+            SELECT facilities.facility_id, licenses.license_id
+            FROM facilities
+            LEFT JOIN licenses ON facilities.license_id = licenses.license_id;
+        """,
+    },
+    "facility_school_district_relationships": {
+        "foreign_key": "school_district_id",
+        "target": "school_districts",
+        "type": "AFFILIATED_WITH",
+        "query": """
+            SELECT facilities.facility_id, school_districts.district_id
+            FROM facilities
+            LEFT JOIN school_districts ON facilities.school_district_id = school_districts.district_id;
+        """,
+    },
+}
+
+FORMATS = ("csv", "admin")
+
+# Columns holding entity IDs; int64-mode databases export them as 16-char hex
+ID_COLUMNS = {id_column for _, id_column in NODE_EXPORTS.values()} | \
+    {spec["foreign_key"] for spec in RELATIONSHIP_EXPORTS.values()}
+
+
+def node_export(table, fmt):
+    """Return (header, query, params) for an entity table."""
+    label, id_column = NODE_EXPORTS[table]
+    if fmt == "csv":
+        return None, f"SELECT * FROM {table};", ()
+    # neo4j-admin header: ID column tagged with its ID space, plus a :LABEL column
+    query = f'SELECT *, ? AS ":LABEL" FROM {table};'
+    return ("ADMIN_NODE", label, id_column), query, (label,)
+
+
+def relationship_export(name, fmt):
+    """Return (header, query, params) for a facility relationship."""
+    spec = RELATIONSHIP_EXPORTS[name]
+    if fmt == "csv":
+        return None, spec["query"], ()
+    target_label, target_id = NODE_EXPORTS[spec["target"]]
+    # Inner join: neo4j-admin rejects relationships whose end node does not exist
+    query = f"""
+        SELECT facilities.facility_id, {spec['target']}.{target_id}, ? AS ":TYPE"
+        FROM facilities
+        JOIN {spec['target']} ON facilities.{spec['foreign_key']} = {spec['target']}.{target_id};
+    """
+    header = [":START_ID(Facility)", f":END_ID({target_label})", ":TYPE"]
+    return header, query, (spec["type"],)
+
+
+def export_column(column, hex_ids):
+    """SQL expression exporting one column: epoch-day dates as ISO text, int64 IDs (if `hex_ids`) as 16-char hex."""
+    quoted = f'"{column}"'
+    if column in DATE_COLUMNS:
+        return f"CASE WHEN typeof({quoted}) = 'integer' THEN date({quoted} * 86400, 'unixepoch') " \
+               f"ELSE {quoted} END AS {quoted}"
+    if hex_ids and column in ID_COLUMNS:
+        return f"CASE WHEN {quoted} IS NULL THEN NULL ELSE printf('%016x', {quoted}) END AS {quoted}"
+    return quoted
+
+
+def export_query_sql(cursor, query, params, hex_ids):
+    """Wrap `query` so its stored column encodings are converted to their export form."""
+    inner = query.strip().rstrip(";")
+    cursor.execute(f"SELECT * FROM ({inner}) LIMIT 0;", params)
+    columns = [desc[0] for desc in cursor.description]
+    if not any(column in DATE_COLUMNS or (hex_ids and column in ID_COLUMNS) for column in columns):
+        return query
+    return f"SELECT {', '.join(export_column(column, hex_ids) for column in columns)} FROM ({inner});"
+
+
+def open_output(path, compress):
+    """Open a text file for CSV writing, gzip-compressed if requested."""
+    if compress:
+        return gzip.open(path, mode="wt", newline="", encoding="utf-8", compresslevel=6)
+    return open(path, mode="w", newline="", encoding="utf-8")
+
+
+def export_query(db_path, name, header, query, params, out_dir, compress=False, batch_size=10000):
+    """
+    Stream one query into `<out_dir>/<name>.csv[.gz]`.
+
+    Rows are read with fetchmany and written to a temp file in the output
+    directory, which is renamed into place only once it is complete.
+    Returns (final path, row count).
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)  # One read-only connection per worker
+    cursor = conn.cursor()
+    # Joins and filters run on the stored integer keys and epoch days; hex IDs
+    # and ISO dates are produced only here, at the export boundary
+    query = export_query_sql(cursor, query, params, hex_ids=detect_id_mode(conn) == "int64")
+    cursor.execute(query, params)
+    columns = [desc[0] for desc in cursor.description]
+
+    if header is None:
+        header = columns
+    elif header and header[0] == "ADMIN_NODE":
+        _, label, id_column = header
+        header = [f"{col}:ID({label})" if col == id_column else col for col in columns[:-1]] + [":LABEL"]
+
+    final_path = os.path.join(out_dir, f"{name}.csv" + (".gz" if compress else ""))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=out_dir)
+    os.close(fd)
+
+    rows_written = 0
+    try:
+        with open_output(tmp_path, compress) as file:
+            writer = csv.writer(file)
+            writer.writerow(header)  # Write header row
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                writer.writerows(rows)
+                rows_written += len(rows)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, final_path)  # Atomic within the same directory
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        conn.close()
+
+    return final_path, rows_written
+
+
+def run_export(db_path, out_dir, fmt="csv", compress=False, workers=4, batch_size=10000):
+    """Export every entity table and relationship concurrently; returns {name: (path, rows)}."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {FORMATS}")
+
+    jobs = {table: node_export(table, fmt) for table in NODE_EXPORTS}
+    jobs.update({name: relationship_export(name, fmt) for name in RELATIONSHIP_EXPORTS})
+
+    results = {}
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(export_query, db_path, name, header, query, params, out_dir, compress, batch_size): name
+            for name, (header, query, params) in jobs.items()
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            path, rows = future.result()
+            results[name] = (path, rows)
+            print(f"✅ Exported {name}: {rows:,} rows -> {path}")
+
+    print(f"🚀 Exported {len(results)} files in {time.perf_counter() - started:.2f}s")
+    return results
+
+
+def admin_import_command(results, database="neo4j"):
+    """Build the `neo4j-admin database import` command for files exported in admin format."""
+    parts = [f"neo4j-admin database import full {database}"]
+    for name in NODE_EXPORTS:
+        parts.append(f"--nodes={os.path.basename(results[name][0])}")
+    for name in RELATIONSHIP_EXPORTS:
+        parts.append(f"--relationships={os.path.basename(results[name][0])}")
+    return " \\\n    ".join(parts)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export childcare entities and relationships for Neo4j.")
+    parser.add_argument("--db", default="childcare.db", help="SQLite database holding the entity tables")
+    parser.add_argument("--out", default="/var/lib/neo4j/import/", help="Directory the files are written into")
+    parser.add_argument("--format", choices=FORMATS, default="csv",
+                        help="csv: plain headers for LOAD CSV; admin: neo4j-admin import headers")
+    parser.add_argument("--gzip", action="store_true", help="Write .csv.gz files")
+    parser.add_argument("--workers", type=int, default=4, help="Tables exported concurrently")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Rows fetched per fetchmany call")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.out):
+        print(f"⚠️ Output directory {args.out} does not exist or is not accessible!")
+        exit(1)
+
+    try:
+        results = run_export(args.db, args.out, args.format, args.gzip, args.workers, args.batch_size)
+    except PermissionError as e:
+        print(f"❌ Permission denied writing to {args.out}: {e}")
+        print("🔹 Try running the script with `sudo` or check directory permissions.")
+        exit(1)
+
+    if args.format == "admin":
+        print("\n📦 Load offline with:\n" + admin_import_command(results))
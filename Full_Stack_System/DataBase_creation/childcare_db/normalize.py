@@ -0,0 +1,178 @@
+import time
+from hashlib import md5
+from itertools import repeat
+
+from column_plan import ColumnPlan, detect_id_mode
+from entity_resolution import load_aliases, resolve_staging_table
+from capacity_rollup import refresh_rollup
+from facility_search import build_search_index
+from history import record_staging_snapshot
+from schema import ENTITY_MAPPINGS, ENTITY_TABLES, entity_tables_sql
+
+# PRAGMAs for the entity-table flush only: those tables are rebuilt from the
+# staging table on failure, so durability is traded for throughput while they
+# load. The history tables survive rebuilds and are written with these restored.
+LOAD_PRAGMAS = {
+    "journal_mode": "MEMORY",
+    "synchronous": "OFF",
+    "cache_size": -262144,  # Negative = KiB, i.e. a 256 MiB page cache
+    "temp_store": "MEMORY",
+}
+
+
+def apply_load_pragmas(conn, pragmas=LOAD_PRAGMAS):
+    """Tune the connection for a bulk load; returns the previous values for restore_pragmas()."""
+    previous = {}
+    for name, value in pragmas.items():
+        previous[name] = conn.execute(f"PRAGMA {name};").fetchone()[0]
+        conn.execute(f"PRAGMA {name} = {value};")
+    return previous
+
+
+def restore_pragmas(conn, previous):
+    for name, value in previous.items():
+        conn.execute(f"PRAGMA {name} = {value};")
+
+
+class FacilityNormalizer:
+    """
+    Deduplicates facilities and their entities in memory, then writes each
+    entity table with a single executemany inside one transaction.
+    """
+
+    def __init__(self, columns, mappings=ENTITY_MAPPINGS, aliases=None, id_mode="hex"):
+        self.plan = ColumnPlan(columns, mappings, aliases, id_mode)
+        # entity name -> {entity_id: row}; the first row seen for an ID wins,
+        # matching the INSERT OR IGNORE semantics of the per-row loader
+        self.tables = {entity.name: {} for entity in self.plan.entities}
+        # entity name -> {natural key: entity_id}, so repeated keys skip the md5
+        self.id_maps = {entity.name: {} for entity in self.plan.entities}
+        self.rows_seen = 0
+
+    def add_rows(self, rows):
+        """Normalize a batch of source rows, one entity at a time across the whole batch."""
+        referenced = {name for entity in self.plan.entities for name in entity.references}
+        batch_ids = {}  # entity name -> that entity's ID for every row in the batch
+        int_ids = self.plan.id_mode == "int64"
+        from_bytes = int.from_bytes
+
+        for entity in self.plan.entities:
+            id_map, table = self.id_maps[entity.name], self.tables[entity.name]
+            prefix, single_key = entity.id_prefix, entity.single_key
+            attribute_getter, converters, aliases = entity.attribute_getter, entity.converters, entity.aliases
+            keys = list(map(entity.key_getter, rows))
+            # Referenced entities were processed earlier in this batch
+            reference_ids = zip(*[batch_ids[name] for name in entity.references]) if entity.references else repeat(())
+            memoize = entity.name in referenced
+            ids = batch_ids[entity.name] = [] if memoize else None
+
+            # make_id() and record() are inlined here: this loop runs once per row per entity
+            for key, row, ref_ids in zip(keys, rows, reference_ids):
+                entity_id = id_map.get(key) if memoize else None
+                if entity_id is None:
+                    key_string = str(key) if single_key else "|".join(map(str, key))
+                    digest = md5((prefix + key_string).encode())
+                    entity_id = from_bytes(digest.digest()[:8], "big", signed=True) if int_ids else digest.hexdigest()
+                    if aliases:
+                        entity_id = aliases.get(entity_id, entity_id)
+                    if memoize:
+                        id_map[key] = entity_id
+                    if entity_id not in table:
+                        attributes = attribute_getter(row)
+                        if converters:
+                            attributes = list(attributes)
+                            for offset, width, converter in converters:
+                                if width == 1:
+                                    attributes[offset] = converter(attributes[offset])
+                                else:
+                                    attributes[offset:offset + width] = [
+                                        converter(tuple(attributes[offset:offset + width]))]
+                        table[entity_id] = (entity_id, *attributes, *ref_ids)
+                if memoize:
+                    ids.append(entity_id)
+        self.rows_seen += len(rows)
+
+    def flush(self, conn):
+        """Write every entity table in one transaction; returns rows written per table."""
+        cursor = conn.cursor()
+        previous_isolation = conn.isolation_level
+        conn.isolation_level = None
+        previous_pragmas = apply_load_pragmas(conn)
+        written = {}
+        try:
+            cursor.execute("BEGIN")
+            for entity in self.plan.entities:
+                table = self.tables[entity.name]
+                # Insert in primary-key order so the B-tree is appended to, not split at random
+                cursor.executemany(entity.insert_sql, (table[key] for key in sorted(table)))
+                written[entity.table] = len(table)
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        finally:
+            restore_pragmas(conn, previous_pragmas)
+            conn.isolation_level = previous_isolation
+
+        return written
+
+
+def normalize_staging_table(conn, table_name="childcare_facilities", batch_size=50000, mappings=ENTITY_MAPPINGS,
+                            id_mode=None):
+    """
+    Normalize every row of the staging table into the entity tables, merging resolved duplicates.
+
+    IDs are generated in `id_mode`, by default the one the entity tables were created with.
+    """
+    id_mode = id_mode or detect_id_mode(conn) or "hex"
+    cursor = conn.cursor()
+    cursor.execute(f'PRAGMA table_info("{table_name}");')
+    columns = [col[1] for col in cursor.fetchall()]
+
+    started = time.perf_counter()
+    normalizer = FacilityNormalizer(columns, mappings, load_aliases(conn), id_mode)
+    cursor.execute(f'SELECT * FROM "{table_name}";')
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        normalizer.add_rows(rows)
+
+    written = normalizer.flush(conn)
+    elapsed = time.perf_counter() - started
+    rate = normalizer.rows_seen / elapsed if elapsed > 0 else 0.0
+    print(f"⚙️ Normalized {normalizer.rows_seen:,} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+    return written
+
+
+def rebuild_entity_tables(conn, table_name="childcare_facilities", id_mode="hex"):
+    """
+    Drop and rebuild every entity table from the staging table: resolve, normalize, then index for search.
+    The staging table is also recorded as a snapshot in the history tables, which are kept across rebuilds,
+    and the capacity rollup is refreshed.
+
+    `id_mode` picks TEXT md5 keys ("hex") or 64-bit INTEGER keys ("int64"); see schema.ID_MODES.
+    """
+    cursor = conn.cursor()
+    for entity_table in ENTITY_TABLES:
+        cursor.execute(f"DROP TABLE IF EXISTS {entity_table};")
+    cursor.executescript(entity_tables_sql(id_mode))
+
+    # Map near-duplicate facilities/locations ("ABC Kids Center" vs "A.B.C. Kids Ctr")
+    # to one canonical ID; the normalizer consults the alias table
+    resolve_staging_table(conn, table_name)
+
+    # Dedup locations, owners, licenses and school districts in memory, then
+    # write each entity table with one executemany in a single transaction
+    written = normalize_staging_table(conn, table_name, id_mode=id_mode)
+
+    # Dropping the tables removed the search triggers; rebuild the FTS index
+    build_search_index(conn)
+
+    # Open new versions for changed facilities/licenses and close those no longer in the extract
+    record_staging_snapshot(conn, table_name, id_mode=id_mode)
+    conn.commit()
+
+    # Apply only the capacity changes to the dashboard rollup
+    refresh_rollup(conn)
+    return written
@@ -0,0 +1,141 @@
+import argparse
+import re
+import sqlite3
+from functools import lru_cache
+
+# Weekly opening hours as a fixed-width bitmap: 7 days x 96 fifteen-minute
+# slots = 672 bits = 84 bytes. Bit `day * 96 + slot` is set when the facility
+# is open for the whole slot; bits are little-endian within each byte.
+DAYS = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+HOURS_COLUMNS = [f"Hours of Operation ({day})" for day in DAYS]
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+WEEK_SLOTS = len(DAYS) * SLOTS_PER_DAY
+BITMAP_BYTES = WEEK_SLOTS // 8
+
+_TIME_RE = re.compile(r"^(\d{1,2})(?::?(\d{2}))?\s*([ap])?\.?\s*m?\.?$")
+_RANGE_SPLIT_RE = re.compile(r"\s*(?:-|–|—|\bto\b)\s*")
+_LIST_SPLIT_RE = re.compile(r"\s*(?:,|;|&|/|\band\b)\s*")
+
+
+def parse_time(text):
+    """Parse '6:30 AM', '6:30am', '0630', '18:00', '6 PM', 'noon' or 'midnight' into minutes after midnight."""
+    text = text.strip().lower().replace(" ", "")
+    if text == "noon":
+        return 12 * 60
+    if text == "midnight":
+        return 0
+    match = _TIME_RE.match(text)
+    if not match:
+        raise ValueError(f"Unrecognised time: {text!r}")
+    hours, minutes, meridiem = match.groups()
+    hours, minutes = int(hours), int(minutes or 0)
+    if hours > 24 or minutes > 59:
+        raise ValueError(f"Unrecognised time: {text!r}")
+    if meridiem == "a" and hours == 12:
+        hours = 0
+    elif meridiem == "p" and hours < 12:
+        hours += 12
+    return hours * 60 + minutes
+
+
+def parse_day_hours(text):
+    """
+    Parse one day's free-text hours into (start, end) minute ranges.
+
+    Empty, 'Closed' and unparseable entries give no ranges; '24 hours' covers
+    the whole day. An end at or before the start runs past midnight.
+    """
+    if text is None:
+        return []
+    text = str(text).strip().lower()
+    if not text or text in ("closed", "n/a", "na", "none"):
+        return []
+    if "24" in text and ("hour" in text or "hr" in text):
+        return [(0, 24 * 60)]
+
+    ranges = []
+    for part in _LIST_SPLIT_RE.split(text):
+        bounds = _RANGE_SPLIT_RE.split(part)
+        if len(bounds) != 2:
+            continue
+        try:
+            start, end = parse_time(bounds[0]), parse_time(bounds[1])
+        except ValueError:
+            continue
+        if end <= start:
+            end += 24 * 60  # Overnight: spills into the next day
+        ranges.append((start, end))
+    return ranges
+
+
+def window_slots(day_index, start, end):
+    """Week slot indexes fully inside [start, end) minutes of a day; wraps past midnight and Saturday."""
+    first = -(-start // SLOT_MINUTES)  # Round up: a partial slot is not open
+    last = end // SLOT_MINUTES         # Round down
+    base = day_index * SLOTS_PER_DAY
+    return [(base + slot) % WEEK_SLOTS for slot in range(first, last)]
+
+
+def slots_to_bitmap(slots):
+    """Pack week slot indexes into the BITMAP_BYTES-byte bitmap."""
+    bitmap = bytearray(BITMAP_BYTES)
+    for slot in slots:
+        bitmap[slot >> 3] |= 1 << (slot & 7)
+    return bytes(bitmap)
+
+
+@lru_cache(maxsize=4096)
+def hours_bitmap(day_texts):
+    """Encode the seven 'Hours of Operation' cells (Sunday first) as a weekly bitmap."""
+    slots = []
+    for day_index, text in enumerate(day_texts):
+        for start, end in parse_day_hours(text):
+            slots.extend(window_slots(day_index, start, end))
+    return slots_to_bitmap(slots)
+
+
+class HoursIndex:
+    """All facility bitmaps loaded into one NumPy matrix for vectorized open-at-time queries."""
+
+    def __init__(self, conn):
+        import numpy as np  # Only the query path needs NumPy
+
+        self.np = np
+        cursor = conn.cursor()
+        cursor.execute("SELECT facility_id, hours FROM facility_hours;")
+        rows = cursor.fetchall()
+        self.facility_ids = np.array([row[0] for row in rows], dtype=object)
+        self.bitmaps = np.frombuffer(b"".join(row[1] for row in rows), dtype=np.uint8).reshape(-1, BITMAP_BYTES)
+
+    def window_mask(self, day, start, end):
+        """Bitmap (as a uint8 row) for a window on a day, e.g. ('Saturday', '06:30', '18:00')."""
+        day_index = DAYS.index(day.capitalize())
+        start_minutes, end_minutes = parse_time(start), parse_time(end)
+        if end_minutes <= start_minutes:
+            end_minutes += 24 * 60
+        mask = slots_to_bitmap(window_slots(day_index, start_minutes, end_minutes))
+        return self.np.frombuffer(mask, dtype=self.np.uint8)
+
+    def open_during(self, day, start, end):
+        """Facility IDs open for the whole window: one bitwise AND across every row."""
+        mask = self.window_mask(day, start, end)
+        is_open = ((self.bitmaps & mask) == mask).all(axis=1)
+        return self.facility_ids[is_open].tolist()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="List facilities open for a whole time window.")
+    parser.add_argument("day", choices=DAYS, type=str.capitalize)
+    parser.add_argument("start", help="e.g. 06:30 or 6:30am")
+    parser.add_argument("end", help="e.g. 18:00 or 6pm")
+    parser.add_argument("--db", default="childcare.db")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    index = HoursIndex(sqlite3.connect(args.db))
+    facility_ids = index.open_during(args.day, args.start, args.end)
+    for facility_id in facility_ids[:args.limit]:
+        print(facility_id)
+    print(f"🕒 {len(facility_ids):,} of {len(index.facility_ids):,} facilities open "
+          f"{args.day} {args.start}-{args.end}")
@@ -0,0 +1,173 @@
+import argparse
+import os
+import sqlite3
+import time
+
+from column_plan import int64_to_hex
+from dates import parse_date
+from schema import ENTITY_TABLES
+
+DEFAULT_ROW_GROUP_SIZE = 64 * 1024
+
+# Column -> Arrow type name. "dictionary" marks low-cardinality strings that are
+# dictionary-encoded, "id" marks entity IDs (written as hex in either ID mode);
+# columns not listed are plain strings.
+COLUMN_TYPES = {
+    "facilities": {
+        "facility_id": "id",
+        "location_id": "id",
+        "owner_id": "id",
+        "license_id": "id",
+        "school_district_id": "id",
+        "facility_type": "dictionary",
+        "operational_schedule": "dictionary",
+        "accepts_subsidies": "bool",
+        "capacity": "int",
+        "enrollment": "int",
+        "staff": "int",
+    },
+    "locations": {
+        "location_id": "id",
+        "city": "dictionary",
+        "state": "dictionary",
+        "zip_code": "dictionary",  # Kept as text so leading zeros survive
+    },
+    "owners": {"owner_id": "id"},
+    "licenses": {
+        "license_id": "id",
+        "license_type": "dictionary",
+        "license_issue_date": "date",
+        "license_expiry_date": "date",
+        "date_originally_licensed": "date",
+    },
+    "school_districts": {"district_id": "id"},
+    "facility_hours": {"facility_id": "id", "hours": "binary"},
+}
+
+# Rows are written in this order so each row group covers a narrow range of
+# the columns most often filtered on, and its min/max statistics can skip it.
+SORT_KEYS = {
+    "facilities": ["facility_type", "school_district_id"],
+    "locations": ["state", "city", "zip_code"],
+    "owners": ["license_number"],
+    "licenses": ["license_expiry_date"],
+    "school_districts": ["district_name"],
+    "facility_hours": ["facility_id"],
+}
+
+
+def parse_bool(value):
+    """Map Yes/No style flags to booleans; None when empty or unrecognised."""
+    if value is None:
+        return None
+    value = str(value).strip().lower()
+    if value in ("yes", "y", "true", "1"):
+        return True
+    if value in ("no", "n", "false", "0"):
+        return False
+    return None
+
+
+def arrow_schema(pa, columns, types):
+    """Build the Arrow schema for a table's columns."""
+    arrow_types = {
+        "string": pa.string(),
+        "id": pa.string(),
+        "dictionary": pa.dictionary(pa.int32(), pa.string()),
+        "date": pa.date32(),
+        "bool": pa.bool_(),
+        "int": pa.int32(),
+        "binary": pa.binary(),
+    }
+    return pa.schema([(column, arrow_types[types.get(column, "string")]) for column in columns])
+
+
+def record_batch(pa, schema, types, rows):
+    """Convert fetched SQLite rows into a typed Arrow RecordBatch."""
+    arrays = []
+    for position, field in enumerate(schema):
+        kind = types.get(field.name, "string")
+        values = [row[position] for row in rows]
+        if kind == "date":
+            values = [parse_date(value) for value in values]
+        elif kind == "bool":
+            values = [parse_bool(value) for value in values]
+        elif kind == "int":
+            values = [value if isinstance(value, int) else None for value in values]
+        elif kind == "id":
+            values = [int64_to_hex(value) if isinstance(value, int) else value for value in values]
+        elif kind == "binary":
+            values = [None if value is None else bytes(value) for value in values]
+        else:
+            values = [None if value is None else str(value) for value in values]
+        array = pa.array(values, type=field.type.value_type if kind == "dictionary" else field.type)
+        arrays.append(array.dictionary_encode() if kind == "dictionary" else array)
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def export_table(conn, table, out_dir, row_group_size=DEFAULT_ROW_GROUP_SIZE, compression="zstd"):
+    """Stream one entity table into `<out_dir>/<table>.parquet`; returns the row count."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("❌ Parquet export needs pyarrow: pip install pyarrow")
+
+    cursor = conn.cursor()
+    cursor.execute(f"PRAGMA table_info({table});")
+    columns = [col[1] for col in cursor.fetchall()]
+    types = COLUMN_TYPES.get(table, {})
+    schema = arrow_schema(pa, columns, types)
+
+    order = ", ".join(column for column in SORT_KEYS.get(table, []) if column in columns)
+    cursor.execute(f"SELECT {', '.join(columns)} FROM {table}" + (f" ORDER BY {order}" if order else "") + ";")
+
+    final_path = os.path.join(out_dir, f"{table}.parquet")
+    tmp_path = final_path + ".tmp"
+    rows_written = 0
+    try:
+        with pq.ParquetWriter(tmp_path, schema, compression=compression, write_statistics=True) as writer:
+            while True:
+                rows = cursor.fetchmany(row_group_size)
+                if not rows:
+                    break
+                # One fetch per row group: min/max statistics are kept per group
+                writer.write_batch(record_batch(pa, schema, types, rows), row_group_size=row_group_size)
+                rows_written += len(rows)
+        os.replace(tmp_path, final_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return rows_written
+
+
+def run_parquet_export(db_path, out_dir, tables=ENTITY_TABLES, row_group_size=DEFAULT_ROW_GROUP_SIZE,
+                       compression="zstd"):
+    """Export the normalized entity tables to Parquet; returns {table: rows}."""
+    os.makedirs(out_dir, exist_ok=True)
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    results = {}
+    try:
+        for table in tables:
+            started = time.perf_counter()
+            results[table] = export_table(conn, table, out_dir, row_group_size, compression)
+            print(f"✅ Exported {table}: {results[table]:,} rows -> "
+                  f"{os.path.join(out_dir, table)}.parquet ({time.perf_counter() - started:.2f}s)")
+    finally:
+        conn.close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the normalized childcare entities as Parquet.")
+    parser.add_argument("--db", default="childcare.db")
+    parser.add_argument("--out", default="exports/parquet/")
+    parser.add_argument("--tables", nargs="+", default=ENTITY_TABLES, choices=ENTITY_TABLES)
+    parser.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE,
+                        help="Rows per row group; smaller groups let filters skip more data")
+    parser.add_argument("--compression", default="zstd", choices=["zstd", "snappy", "gzip", "none"])
+    args = parser.parse_args()
+
+    run_parquet_export(args.db, args.out, args.tables, args.row_group_size, args.compression)
@@ -0,0 +1,289 @@
+import argparse
+import ast
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = ".pipeline_cache"
+
+
+# ----- Stage bodies. Each builds its outputs inside `tmp`; the runner moves them into place.
+
+def import_stage(inputs, tmp):
+    """CSV extract -> staging.db holding the typed childcare_facilities table."""
+    from stream_ingest import stream_csv_to_sqlite
+
+    conn = sqlite3.connect(os.path.join(tmp, "staging.db"))
+    stream_csv_to_sqlite(inputs["csv"], conn)
+    conn.close()
+
+
+def normalize_stage(inputs, tmp, id_mode="hex"):
+    """staging.db -> childcare.db: staging table plus resolved, normalized, search-indexed entity tables."""
+    from normalize import rebuild_entity_tables
+
+    db_path = os.path.join(tmp, "childcare.db")
+    shutil.copyfile(inputs["staging.db"], db_path)
+    conn = sqlite3.connect(db_path)
+    rebuild_entity_tables(conn, "childcare_facilities", id_mode=id_mode)
+    conn.close()
+
+
+def triples_stage(inputs, tmp):
+    """staging.db -> childcare_graph.db via 1_create_facility_entities.py (which reads the staging table there)."""
+    shutil.copyfile(inputs["staging.db"], os.path.join(tmp, "childcare_graph.db"))
+    subprocess.run([sys.executable, os.path.join(SCRIPT_DIR, "1_create_facility_entities.py")],
+                   cwd=tmp, check=True)
+
+
+def export_stage(inputs, tmp):
+    """childcare.db -> exports/ CSVs for Neo4j."""
+    from neo4j_export import run_export
+
+    out_dir = os.path.join(tmp, "exports")
+    os.makedirs(out_dir)
+    run_export(inputs["childcare.db"], out_dir)
+
+
+# Stage -> (body, modules it runs, external inputs, upstream stages, outputs).
+# `inputs` name CLI-provided files; upstream outputs are passed by file name.
+# `params` name pipeline settings passed to the body as keyword arguments.
+STAGES = {
+    "import": {
+        "run": import_stage,
+        "modules": ["stream_ingest.py"],
+        "inputs": ["csv"],
+        "deps": [],
+        "outputs": ["staging.db"],
+    },
+    "normalize": {
+        "run": normalize_stage,
+        "modules": ["normalize.py"],
+        "inputs": [],
+        "params": ["id_mode"],
+        "deps": ["import"],
+        "outputs": ["childcare.db"],
+    },
+    "triples": {
+        "run": triples_stage,
+        "modules": ["1_create_facility_entities.py"],
+        "inputs": [],
+        "deps": ["import"],
+        "outputs": ["childcare_graph.db"],
+    },
+    "export": {
+        "run": export_stage,
+        "modules": ["neo4j_export.py"],
+        "inputs": [],
+        "deps": ["normalize"],
+        "outputs": ["exports"],
+    },
+}
+
+
+def local_modules(module_file, seen=None):
+    """`module_file` plus every module in this directory it imports, transitively."""
+    seen = set() if seen is None else seen
+    if module_file in seen:
+        return seen
+    seen.add(module_file)
+    with open(os.path.join(SCRIPT_DIR, module_file)) as file:
+        tree = ast.parse(file.read(), module_file)
+    for node in ast.walk(tree):
+        names = [alias.name for alias in node.names] if isinstance(node, ast.Import) else \
+            [node.module] if isinstance(node, ast.ImportFrom) and node.module and not node.level else []
+        for name in names:
+            candidate = name.split(".")[0] + ".py"
+            if os.path.exists(os.path.join(SCRIPT_DIR, candidate)):
+                local_modules(candidate, seen)
+    return seen
+
+
+class Pipeline:
+    """Runs the stages in dependency order, skipping or restoring any whose fingerprint is cached."""
+
+    def __init__(self, workdir, inputs, cache_dir=None, params=None):
+        self.workdir = os.path.abspath(workdir)
+        self.inputs = {name: os.path.abspath(path) for name, path in inputs.items()}
+        self.params = dict(params or {})
+        self.cache_dir = os.path.abspath(cache_dir or os.path.join(self.workdir, CACHE_DIR))
+        self.manifest_path = os.path.join(self.cache_dir, "manifest.json")
+        self.manifest = {"file_hashes": {}, "blobs": {}, "workspace": {}}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as file:
+                self.manifest.update(json.load(file))
+        self.fingerprints = {}
+
+    def save_manifest(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(self.manifest, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def file_hash(self, path):
+        """sha256 of a file's contents, memoized on (size, mtime) so unchanged inputs are not re-read."""
+        stat = os.stat(path)
+        cached = self.manifest["file_hashes"].get(path)
+        if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            return cached["sha256"]
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+        self.manifest["file_hashes"][path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                                              "sha256": digest.hexdigest()}
+        return digest.hexdigest()
+
+    def fingerprint(self, name):
+        """Hash of the stage's code, its modules, its input file contents, its params and its upstream fingerprints."""
+        if name in self.fingerprints:
+            return self.fingerprints[name]
+        stage = STAGES[name]
+        digest = hashlib.sha256(name.encode())
+        digest.update(inspect.getsource(stage["run"]).encode())
+        for module in sorted(set().union(*(local_modules(module) for module in stage["modules"]))):
+            digest.update(f"\0module:{module}:{self.file_hash(os.path.join(SCRIPT_DIR, module))}".encode())
+        for input_name in stage["inputs"]:
+            digest.update(f"\0input:{input_name}:{self.file_hash(self.inputs[input_name])}".encode())
+        for param in stage.get("params", []):
+            digest.update(f"\0param:{param}:{self.params.get(param)!r}".encode())
+        for dep in stage["deps"]:
+            digest.update(f"\0dep:{dep}:{self.fingerprint(dep)}".encode())
+        self.fingerprints[name] = digest.hexdigest()
+        return self.fingerprints[name]
+
+    def output_state(self, name):
+        """{output: [size, mtime_ns]} of the stage's outputs in the work directory, or None if any is missing."""
+        state = {}
+        for output in STAGES[name]["outputs"]:
+            path = os.path.join(self.workdir, output)
+            if not os.path.exists(path):
+                return None
+            stat = os.stat(path)
+            state[output] = [stat.st_size, stat.st_mtime_ns]
+        return state
+
+    def place(self, source_dir, name):
+        """Copy a stage's outputs from `source_dir` into the work directory, replacing old ones."""
+        for output in STAGES[name]["outputs"]:
+            source, target = os.path.join(source_dir, output), os.path.join(self.workdir, output)
+            staged = target + ".pipeline-tmp"
+            if os.path.isdir(source):
+                shutil.copytree(source, staged)
+            else:
+                shutil.copyfile(source, staged)
+            if os.path.isdir(target):
+                shutil.rmtree(target)
+            os.replace(staged, target)
+
+    def run_stage(self, name, force=False):
+        stage, fingerprint = STAGES[name], self.fingerprint(name)
+        workspace = self.manifest["workspace"].get(name)
+        blob_dir = os.path.join(self.cache_dir, "blobs", fingerprint)
+
+        if not force and workspace and workspace["fingerprint"] == fingerprint \
+                and workspace["outputs"] == self.output_state(name):
+            print(f"✅ {name}: up to date ({fingerprint[:12]})")
+            return "skipped"
+
+        if not force and fingerprint in self.manifest["blobs"] and os.path.isdir(blob_dir):
+            started = time.perf_counter()
+            self.place(blob_dir, name)
+            print(f"♻️ {name}: restored from cache ({fingerprint[:12]}) in {time.perf_counter() - started:.2f}s")
+            status = "restored"
+        else:
+            print(f"▶️ {name}: running ({fingerprint[:12]})")
+            inputs = dict(self.inputs)
+            for dep in stage["deps"]:
+                for output in STAGES[dep]["outputs"]:
+                    inputs[output] = os.path.join(self.workdir, output)
+
+            started = time.perf_counter()
+            with tempfile.TemporaryDirectory(dir=self.workdir, prefix=f".{name}-") as tmp:
+                stage["run"](inputs, tmp, **{param: self.params[param]
+                                             for param in stage.get("params", []) if param in self.params})
+                elapsed = time.perf_counter() - started
+                # Store a copy in the blob store, then place the outputs in the work directory
+                shutil.rmtree(blob_dir, ignore_errors=True)
+                os.makedirs(blob_dir)
+                for output in stage["outputs"]:
+                    source = os.path.join(tmp, output)
+                    if os.path.isdir(source):
+                        shutil.copytree(source, os.path.join(blob_dir, output))
+                    else:
+                        shutil.copyfile(source, os.path.join(blob_dir, output))
+                self.place(tmp, name)
+
+            self.manifest["blobs"][fingerprint] = {
+                "stage": name,
+                "seconds": round(elapsed, 3),
+                "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            }
+            print(f"✅ {name}: built in {elapsed:.2f}s")
+            status = "built"
+
+        self.manifest["workspace"][name] = {"fingerprint": fingerprint, "outputs": self.output_state(name)}
+        self.save_manifest()
+        return status
+
+    def plan(self, targets):
+        """Targets plus everything upstream of them, in dependency order."""
+        order = []
+
+        def visit(name):
+            for dep in STAGES[name]["deps"]:
+                visit(dep)
+            if name not in order:
+                order.append(name)
+
+        for target in targets:
+            visit(target)
+        return order
+
+    def run(self, targets=None, force=()):
+        started = time.perf_counter()
+        results = {name: self.run_stage(name, force=name in force) for name in self.plan(targets or list(STAGES))}
+        print(f"🏁 Pipeline finished in {time.perf_counter() - started:.2f}s")
+        return results
+
+    def prune(self):
+        """Delete cached blobs that no workspace output refers to."""
+        keep = {entry["fingerprint"] for entry in self.manifest["workspace"].values()}
+        for fingerprint in list(self.manifest["blobs"]):
+            if fingerprint not in keep:
+                shutil.rmtree(os.path.join(self.cache_dir, "blobs", fingerprint), ignore_errors=True)
+                del self.manifest["blobs"][fingerprint]
+        self.save_manifest()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the childcare ETL as a cached DAG of stages.")
+    parser.add_argument("targets", nargs="*", metavar="stage",
+                        help=f"Stages to bring up to date ({', '.join(STAGES)}; default: all); "
+                             "upstream stages run as needed")
+    parser.add_argument("--csv", default="childcare_data.csv", help="State extract fed to the import stage")
+    parser.add_argument("--workdir", default=".", help="Where staging.db, childcare.db, ... are written")
+    parser.add_argument("--cache-dir", help=f"Blob store and manifest (default <workdir>/{CACHE_DIR})")
+    parser.add_argument("--id-mode", choices=["hex", "int64"], default="hex",
+                        help="Entity keys as md5 hex TEXT or 64-bit INTEGER (see schema.ID_MODES)")
+    parser.add_argument("--force", nargs="+", default=[], choices=list(STAGES), help="Re-run these stages anyway")
+    parser.add_argument("--prune", action="store_true", help="Drop cached outputs not used by the work directory")
+    args = parser.parse_args()
+    unknown = [target for target in args.targets if target not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s) {', '.join(unknown)}; choose from {', '.join(STAGES)}")
+
+    pipeline = Pipeline(args.workdir, {"csv": args.csv}, args.cache_dir, {"id_mode": args.id_mode})
+    pipeline.run(args.targets, set(args.force))
+    if args.prune:
+        pipeline.prune()
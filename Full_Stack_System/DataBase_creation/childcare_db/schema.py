@@ -1,4 +1,6 @@
 # Schema definitions for different entity types
+from dates import epoch_day
+from opening_hours import HOURS_COLUMNS, hours_bitmap
 
 # Facility Schema (Based on Provided Columns)
 FACILITY_SCHEMA = {
@@ -28,7 +30,10 @@ FACILITY_SCHEMA = {
     "Facility Zip (Alt)": "INTEGER",
     "Alternative Contact Number": "TEXT",
     "Date Originally Licensed": "TEXT",
-    "Facility Status": "TEXT"
+    "Facility Status": "TEXT",
+    "Capacity": "INTEGER",
+    "Enrollment": "INTEGER",
+    "Staff": "INTEGER"
 }
 
 
@@ -65,6 +70,8 @@ SCHOOL_DISTRICT_SCHEMA = {
     "School District Affiliation": "TEXT"
 }
 
+FACILITY_HOURS_SCHEMA = {column: "TEXT" for column in HOURS_COLUMNS}
+
 
 # Dictionary to easily reference schemas
 ENTITY_SCHEMAS = {
@@ -72,5 +79,196 @@ ENTITY_SCHEMAS = {
     "Location": LOCATION_SCHEMA,
     "Owner": OWNER_SCHEMA,
     "License": LICENSE_SCHEMA,
-    "School District": SCHOOL_DISTRICT_SCHEMA
+    "School District": SCHOOL_DISTRICT_SCHEMA,
+    "Facility Hours": FACILITY_HOURS_SCHEMA
+}
+
+
+def parse_count(value):
+    """Non-negative whole count from a source cell ('12', '12.0', 12); None when empty or not a number."""
+    try:
+        count = int(float(value))
+    except (TypeError, ValueError):
+        return None
+    return count if count >= 0 else None
+
+
+# Normalized entity tables built from the facility extract
+ENTITY_TABLES = ["facilities", "locations", "owners", "licenses", "school_districts", "facility_hours"]
+
+_ENTITY_TABLES_TEMPLATE = """
+CREATE TABLE IF NOT EXISTS facilities (
+    facility_id {facility_id_type} PRIMARY KEY,
+    facility_name TEXT NOT NULL,
+    facility_address TEXT NOT NULL,
+    phone_number TEXT,
+    license_number TEXT NOT NULL,
+    facility_type TEXT,
+    operational_schedule TEXT,
+    accepts_subsidies TEXT,
+    capacity INTEGER,  -- Licensed capacity, enrollment and staff; NULL when the extract lacks them
+    enrollment INTEGER,
+    staff INTEGER,
+    location_id {id_type},
+    owner_id {id_type},
+    license_id {id_type},
+    school_district_id {id_type},
+    UNIQUE(facility_name, license_number, facility_address)  -- Prevents duplicates
+);
+
+CREATE TABLE IF NOT EXISTS locations (
+    location_id {id_type} PRIMARY KEY,
+    location_name TEXT NOT NULL,
+    location_address TEXT NOT NULL,
+    city TEXT NOT NULL,
+    state TEXT NOT NULL,
+    zip_code TEXT NOT NULL,
+    UNIQUE(city, state, location_address, location_name)  -- Ensures unique locations
+);
+
+CREATE TABLE IF NOT EXISTS owners (
+    owner_id {id_type} PRIMARY KEY,
+    license_number TEXT NOT NULL,
+    phone_number TEXT,
+    alternative_contact_number TEXT,
+    UNIQUE(license_number)  -- Ensures unique owners by license number
+);
+
+CREATE TABLE IF NOT EXISTS licenses (
+    license_id {id_type} PRIMARY KEY,
+    license_number TEXT NOT NULL,
+    license_type TEXT,
+    license_issue_date INTEGER,  -- Dates are epoch days (see dates.py), so ranges use the index
+    license_expiry_date INTEGER,
+    date_originally_licensed INTEGER,
+    UNIQUE(license_number)  -- Prevents duplicate licenses
+);
+
+-- Renewal outreach: licenses expiring in a date range, optionally of one type
+CREATE INDEX IF NOT EXISTS licenses_expiry_idx ON licenses(license_expiry_date, license_type);
+CREATE INDEX IF NOT EXISTS facilities_license_idx ON facilities(license_id);
+
+CREATE TABLE IF NOT EXISTS school_districts (
+    district_id {id_type} PRIMARY KEY,
+    district_name TEXT NOT NULL,
+    UNIQUE(district_name)  -- Prevents duplicate school districts
+);
+
+CREATE TABLE IF NOT EXISTS facility_hours (
+    facility_id {id_type} PRIMARY KEY,
+    hours BLOB NOT NULL  -- 7 days x 96 fifteen-minute slots, see opening_hours.py
+) WITHOUT ROWID;
+"""
+
+# Entity ID storage: "hex" keeps the 32-char md5 hexdigest as TEXT keys;
+# "int64" keeps the first 64 bits of the same digest as INTEGER keys, which
+# makes the rowid tables key on the rowid itself (smaller tables and indexes,
+# integer joins). Hex is only produced again at export boundaries.
+ID_MODES = {"hex": "TEXT", "int64": "INTEGER"}
+
+
+def entity_tables_sql(id_mode="hex"):
+    """CREATE TABLE script for the entity tables with IDs stored in `id_mode`."""
+    id_type = ID_MODES[id_mode]
+    # INT (unlike INTEGER) PRIMARY KEY is not a rowid alias: facilities keeps a
+    # dense rowid, which the FTS index is keyed on. Random 64-bit rowids would
+    # make every FTS posting list entry several bytes larger.
+    facility_id_type = "INT" if id_mode == "int64" else id_type
+    return _ENTITY_TABLES_TEMPLATE.format(id_type=id_type, facility_id_type=facility_id_type)
+
+
+ENTITY_TABLES_SQL = entity_tables_sql("hex")
+
+
+# How each entity in ENTITY_SCHEMAS is derived from a facility row:
+#   key        - source columns whose values form the entity's natural key (hashed into its ID)
+#   attributes - table column -> source column, or (source column(s), converter); a list of
+#                source columns is passed to the converter as one tuple
+#   references - table column -> entity whose ID it stores
+#   id_space   - optional entity whose IDs this one shares (for 1:1 side tables)
+#   optional   - source columns older extracts may lack; attributes read from them are NULL
+# Entities are written in dependency order, so referenced entities come first.
+ENTITY_MAPPINGS = {
+    "Location": {
+        "table": "locations",
+        "id_column": "location_id",
+        "key": ["City", "State", "Facility Address", "Facility Name"],
+        "attributes": {
+            "city": "City",
+            "state": "State",
+            "zip_code": ("Zip Code", str),
+            "location_address": "Facility Address",
+            "location_name": "Facility Name",
+        },
+    },
+    "Owner": {
+        "table": "owners",
+        "id_column": "owner_id",
+        "key": ["License Number"],
+        "attributes": {
+            "license_number": "License Number",
+            "alternative_contact_number": "Alternative Contact Number",
+        },
+    },
+    "License": {
+        "table": "licenses",
+        "id_column": "license_id",
+        "key": ["License Number"],
+        "attributes": {
+            "license_number": "License Number",
+            "license_type": "License Type",
+            "license_issue_date": ("License Issue Date", epoch_day),
+            "license_expiry_date": ("License Expiry Date", epoch_day),
+            "date_originally_licensed": ("Date Originally Licensed", epoch_day),
+        },
+    },
+    "School District": {
+        "table": "school_districts",
+        "id_column": "district_id",
+        "key": ["School District Affiliation"],
+        "attributes": {
+            "district_name": "School District Affiliation",
+        },
+    },
+    "Facility": {
+        "table": "facilities",
+        "id_column": "facility_id",
+        "key": ["Facility Name", "License Number", "Facility Address"],
+        "attributes": {
+            "facility_name": "Facility Name",
+            "license_number": "License Number",
+            "facility_address": "Facility Address",
+            "phone_number": "Phone Number",
+            "facility_type": "Facility Type",
+            "operational_schedule": "Operational Schedule",
+            "accepts_subsidies": "Accepts Subsidies",
+            "capacity": ("Capacity", parse_count),
+            "enrollment": ("Enrollment", parse_count),
+            "staff": ("Staff", parse_count),
+        },
+        "optional": ["Capacity", "Enrollment", "Staff"],
+        "references": {
+            "location_id": "Location",
+            "owner_id": "Owner",
+            "license_id": "License",
+            "school_district_id": "School District",
+        },
+    },
+    "Facility Hours": {
+        "table": "facility_hours",
+        "id_column": "facility_id",
+        "id_space": "Facility",
+        "key": ["Facility Name", "License Number", "Facility Address"],
+        "attributes": {
+            "hours": (HOURS_COLUMNS, hours_bitmap),
+        },
+    },
+}
+
+# Entity table columns stored as epoch days; exports turn them back into ISO dates
+DATE_COLUMNS = {
+    column
+    for mapping in ENTITY_MAPPINGS.values()
+    for column, source in mapping["attributes"].items()
+    if isinstance(source, tuple) and source[1] is epoch_day
 }
@@ -0,0 +1,106 @@
+import csv
+import time
+from itertools import islice
+
+from schema import FACILITY_SCHEMA  # Column types for the facility extract
+
+DEFAULT_CHUNK_SIZE = 10000
+STAGING_TABLE = "childcare_facilities"
+
+
+def coerce_value(value, sql_type):
+    """Convert a raw CSV cell to the Python value matching its declared SQL type."""
+    if value is None:
+        return None
+    value = value.strip()
+    if value == "":
+        return None
+    if sql_type == "INTEGER":
+        try:
+            return int(value)
+        except ValueError:
+            try:
+                return int(float(value))
+            except ValueError:
+                return value  # Keep malformed values (e.g. ZIP+4) rather than dropping them
+    return value
+
+
+def column_types(header):
+    """Look up the declared SQL type of every CSV column (unknown columns are TEXT)."""
+    return [FACILITY_SCHEMA.get(name, "TEXT") for name in header]
+
+
+def read_header(csv_file):
+    """Return the column names from the first line of the CSV."""
+    with open(csv_file, newline="", encoding="utf-8") as file:
+        return next(csv.reader(file))
+
+
+def iter_typed_chunks(csv_file, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield lists of at most `chunk_size` schema-typed rows, so memory stays bounded."""
+    with open(csv_file, newline="", encoding="utf-8") as file:
+        reader = csv.reader(file)
+        header = next(reader)
+        types = column_types(header)
+        width = len(header)
+
+        while True:
+            chunk = list(islice(reader, chunk_size))
+            if not chunk:
+                break
+
+            rows = []
+            for raw in chunk:
+                # Pad short rows / trim long ones so every row matches the header
+                if len(raw) != width:
+                    raw = (raw + [None] * width)[:width]
+                rows.append(tuple(coerce_value(value, sql_type) for value, sql_type in zip(raw, types)))
+            yield rows
+
+
+def create_staging_table(cursor, header, table_name=STAGING_TABLE):
+    """(Re)create the staging table with the column types declared in FACILITY_SCHEMA."""
+    column_defs = ", ".join(f'"{name}" {sql_type}' for name, sql_type in zip(header, column_types(header)))
+    cursor.execute(f'DROP TABLE IF EXISTS "{table_name}";')
+    cursor.execute(f'CREATE TABLE "{table_name}" ({column_defs});')
+
+
+def stream_csv_to_sqlite(csv_file, conn, table_name=STAGING_TABLE, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Stream a facility extract into SQLite in bounded chunks.
+
+    The table is replaced and every chunk is written with a batched executemany,
+    all inside a single transaction. Returns the number of imported rows.
+    """
+    cursor = conn.cursor()
+    previous_isolation = conn.isolation_level
+    conn.isolation_level = None  # Manage the transaction explicitly
+
+    header = read_header(csv_file)
+    placeholders = ", ".join("?" * len(header))
+    insert_sql = f'INSERT INTO "{table_name}" VALUES ({placeholders})'
+
+    total_rows = 0
+    started = time.perf_counter()
+
+    try:
+        cursor.execute("BEGIN")
+        create_staging_table(cursor, header, table_name)
+
+        for rows in iter_typed_chunks(csv_file, chunk_size):
+            cursor.executemany(insert_sql, rows)
+            total_rows += len(rows)
+
+            elapsed = time.perf_counter() - started
+            rate = total_rows / elapsed if elapsed > 0 else 0.0
+            print(f"📥 {total_rows:,} rows imported ({rate:,.0f} rows/sec)")
+
+        cursor.execute("COMMIT")
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+    finally:
+        conn.isolation_level = previous_isolation
+
+    return total_rows
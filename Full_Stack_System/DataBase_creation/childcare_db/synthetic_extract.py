@@ -0,0 +1,197 @@
+import argparse
+import csv
+import os
+import random
+import time
+from itertools import accumulate
+
+from opening_hours import DAYS
+from schema import FACILITY_SCHEMA
+
+# Named extract sizes used by the benchmarks
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+
+# (city, first zip, zips in city)
+CITIES = [
+    ("Detroit", 48201, 35), ("Grand Rapids", 49503, 12), ("Warren", 48088, 5), ("Sterling Heights", 48310, 4),
+    ("Ann Arbor", 48103, 6), ("Lansing", 48906, 8), ("Flint", 48502, 9), ("Dearborn", 48120, 7),
+    ("Livonia", 48150, 3), ("Troy", 48083, 3), ("Westland", 48185, 2), ("Farmington Hills", 48331, 4),
+    ("Kalamazoo", 49001, 8), ("Wyoming", 49509, 2), ("Southfield", 48033, 4), ("Rochester Hills", 48306, 3),
+    ("Taylor", 48180, 1), ("Pontiac", 48340, 3), ("St. Clair Shores", 48080, 3), ("Royal Oak", 48067, 2),
+    ("Novi", 48374, 4), ("Dearborn Heights", 48125, 3), ("Battle Creek", 49014, 4), ("Saginaw", 48601, 5),
+    ("Kentwood", 49508, 2), ("East Lansing", 48823, 2), ("Roseville", 48066, 1), ("Portage", 49002, 3),
+    ("Midland", 48640, 3), ("Muskegon", 49440, 5), ("Traverse City", 49684, 3), ("Marquette", 49855, 1),
+]
+STREETS = ["Main", "Woodward", "Michigan", "Grand River", "Gratiot", "Jefferson", "Washington", "Maple", "Oak",
+           "Cedar", "Elm", "Lincoln", "Division", "Fort", "Saginaw", "Plymouth", "Telegraph", "Van Dyke",
+           "Mound", "Dequindre", "Lake", "Park", "Church", "Mill", "Center", "Washtenaw", "Cass", "Trumbull"]
+STREET_SUFFIXES = ["Street", "Avenue", "Road", "Drive", "Boulevard", "Lane", "Court", "Highway"]
+NAME_PREFIXES = ["Little Stars", "Bright Beginnings", "Kiddie Kollege", "Sunshine", "Rainbow", "Tiny Tots",
+                 "Happy Hearts", "ABC Kids", "Kids Kingdom", "Learning Tree", "Growing Minds", "First Steps",
+                 "Busy Bees", "Precious Moments", "Teddy Bear", "Creative Kids", "Wonder Years", "Noah's Ark",
+                 "Stepping Stones", "Imagination Station"]
+NAME_SUFFIXES = ["Child Care Center", "Learning Center", "Academy", "Montessori", "Daycare", "Preschool",
+                 "Early Learning", "Child Development Center"]
+SURNAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez",
+            "Martinez", "Wilson", "Anderson", "Taylor", "Thomas", "Moore", "Jackson", "White", "Harris"]
+FIRST_NAMES = ["Mary", "Patricia", "Jennifer", "Linda", "Elizabeth", "Barbara", "Susan", "Jessica", "Sarah",
+               "Karen", "Lisa", "Nancy", "Angela", "Tiffany", "Keisha", "Maria", "Aisha", "Fatima"]
+FACILITY_TYPES = [("Child Care Center", 0.45), ("Family Home", 0.35), ("Group Home", 0.20)]
+LICENSE_TYPES = [("Regular", 0.80), ("Provisional", 0.12), ("Original", 0.08)]
+STATUSES = [("Licensed", 0.93), ("Provisional", 0.04), ("Closed", 0.03)]
+SCHEDULES = [("Full Day", 0.7), ("Part Day", 0.2), ("Before/After School", 0.1)]
+WEEKDAY_HOURS = ["6:30 AM - 6:00 PM", "7:00 AM - 5:30 PM", "06:00-18:30", "24 Hours", "7am-12pm, 1pm-5pm",
+                 "8:00 AM - 3:00 PM", "6:00 AM - 11:00 PM"]
+WEEKEND_HOURS = ["Closed", "Closed", "Closed", "", "8:00 AM - 4:00 PM", "24 Hours"]
+DISTRICT_COUNT = 550
+# Facility type -> (min, max) licensed capacity, children per staff member
+CAPACITIES = {"Child Care Center": ((20, 150), 8), "Group Home": ((7, 12), 6), "Family Home": ((1, 6), 6)}
+
+# Spellings that entity resolution should fold back together
+VARIANTS = [("Center", "Ctr"), ("Street", "St"), ("Avenue", "Ave."), ("Road", "Rd"), ("Drive", "Dr"),
+            ("Child Care", "Childcare"), ("ABC", "A.B.C."), ("Kids", "Kid's")]
+
+
+def _picker(choices):
+    """Precompute (values, cumulative weights) from [(value, weight)] for _pick()."""
+    choices = list(choices)
+    return [value for value, _ in choices], list(accumulate(weight for _, weight in choices))
+
+
+def _pick(rng, picker):
+    values, cum_weights = picker
+    return rng.choices(values, cum_weights=cum_weights)[0]
+
+
+def _date(rng, first_year, last_year):
+    return f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/{rng.randint(first_year, last_year)}"
+
+
+def _variant(rng, value):
+    """Re-spell a name or address the way a second data-entry clerk might."""
+    applicable = [(a, b) for a, b in VARIANTS if a in value]
+    if not applicable:
+        return value.upper() if rng.random() < 0.5 else value + "."
+    original, replacement = rng.choice(applicable)
+    return value.replace(original, replacement)
+
+
+def synthetic_rows(count, seed=42, license_reuse=0.08, duplicate_rate=0.02, near_duplicate_rate=0.01):
+    """
+    Yield `count` facility rows as tuples in FACILITY_SCHEMA column order.
+
+    The stream is deterministic for a seed, and the first N rows are the same
+    whatever `count` is, so every size is a prefix of the larger ones.
+      license_reuse       - share of facilities run under an existing license (multi-site owners)
+      duplicate_rate      - share of rows repeating an earlier row exactly
+      near_duplicate_rate - share of rows re-spelling an earlier facility's name/address
+    """
+    rng = random.Random(seed)
+    # Capacity figures draw from their own stream so the other columns stay the same for a seed
+    capacity_rng = random.Random(f"capacity:{seed}")
+    columns = list(FACILITY_SCHEMA)
+    recent = []  # Bounded pool of earlier rows to duplicate from
+    licenses = []
+    facility_types, license_types = _picker(FACILITY_TYPES), _picker(LICENSE_TYPES)
+    statuses, schedules = _picker(STATUSES), _picker(SCHEDULES)
+    districts = _picker((f"District {rank}", 1.0 / (rank + 1)) for rank in range(DISTRICT_COUNT))  # A few large ones
+    cities = _picker((city, city[2]) for city in CITIES)  # Weighted by number of zips
+
+    for _ in range(count):
+        roll = rng.random()
+        if recent and roll < duplicate_rate:
+            row = dict(rng.choice(recent))
+        elif recent and roll < duplicate_rate + near_duplicate_rate:
+            row = dict(rng.choice(recent))
+            row["Facility Name"] = _variant(rng, row["Facility Name"])
+            row["Facility Address"] = _variant(rng, row["Facility Address"])
+        else:
+            if licenses and rng.random() < license_reuse:
+                license_number = rng.choice(licenses)
+            else:
+                license_number = f"DC{rng.randrange(10 ** 8):08d}"
+                licenses.append(license_number)
+                if len(licenses) > 5000:
+                    licenses.pop(rng.randrange(len(licenses)))
+
+            facility_type = _pick(rng, facility_types)
+            if facility_type == "Child Care Center":
+                name = f"{rng.choice(NAME_PREFIXES)} {rng.choice(NAME_SUFFIXES)}"
+            else:
+                name = f"{rng.choice(SURNAMES)}, {rng.choice(FIRST_NAMES)}"  # Homes are listed under the licensee
+            city, first_zip, zips = _pick(rng, cities)
+            weekday, weekend = rng.choice(WEEKDAY_HOURS), rng.choice(WEEKEND_HOURS)
+
+            row = {
+                "Date Extracted": "02/10/2025",
+                "License Number": license_number,
+                "License Issue Date": _date(rng, 2021, 2024),
+                "License Expiry Date": _date(rng, 2025, 2027),
+                "License Type": _pick(rng, license_types),
+                "Facility Name": name,
+                "Facility Address": f"{rng.randint(1, 29999)} {rng.choice(STREETS)} {rng.choice(STREET_SUFFIXES)}",
+                "City": city,
+                "State": "MI",
+                "Zip Code": first_zip + rng.randrange(zips),
+                "Phone Number": f"({rng.randint(200, 999)}) 555-{rng.randint(0, 9999):04d}",
+                "Facility Type": facility_type,
+                "Operational Schedule": _pick(rng, schedules),
+                "Accepts Subsidies": "Yes" if rng.random() < 0.6 else "No",
+                "School District Affiliation": _pick(rng, districts),
+                "Alternative Address": "",
+                "Facility Zip (Alt)": None,
+                "Alternative Contact Number": f"({rng.randint(200, 999)}) 555-{rng.randint(0, 9999):04d}"
+                                              if rng.random() < 0.3 else "",
+                "Date Originally Licensed": _date(rng, 1990, 2024),
+                "Facility Status": _pick(rng, statuses),
+            }
+            for day in DAYS:
+                row[f"Hours of Operation ({day})"] = weekend if day in ("Saturday", "Sunday") else weekday
+            (low, high), ratio = CAPACITIES[facility_type]
+            capacity = capacity_rng.randint(low, high)
+            enrollment = min(capacity, round(capacity * capacity_rng.uniform(0.5, 1.05)))
+            row["Capacity"], row["Enrollment"] = capacity, enrollment
+            row["Staff"] = max(1, -(-enrollment // ratio)) if row["Facility Status"] != "Closed" else 0
+
+        if len(recent) < 1000:
+            recent.append(row)
+        else:
+            recent[rng.randrange(1000)] = row
+        yield tuple(row.get(column) for column in columns)
+
+
+def parse_size(value):
+    """Accept a row count with an optional k/m suffix ('100k', '1m', '250000')."""
+    value = str(value).lower().replace("_", "").replace(",", "")
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(value[-1:])
+    return int(float(value[:-1]) * multiplier) if multiplier else int(value)
+
+
+def write_extract(path, count, seed=42, **rates):
+    """Write a synthetic extract CSV (header = FACILITY_SCHEMA) and return the row count."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(FACILITY_SCHEMA)
+        writer.writerows(synthetic_rows(count, seed, **rates))
+    os.replace(tmp_path, path)
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic childcare extract CSV.")
+    parser.add_argument("--rows", default="100k", help=f"Row count, e.g. {', '.join(SIZES)}")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="Output CSV (default synthetic_<rows>.csv)")
+    parser.add_argument("--license-reuse", type=float, default=0.08)
+    parser.add_argument("--duplicate-rate", type=float, default=0.02)
+    parser.add_argument("--near-duplicate-rate", type=float, default=0.01)
+    args = parser.parse_args()
+
+    count = parse_size(args.rows)
+    out = args.out or f"synthetic_{args.rows.lower()}.csv"
+    started = time.perf_counter()
+    write_extract(out, count, args.seed, license_reuse=args.license_reuse,
+                  duplicate_rate=args.duplicate_rate, near_duplicate_rate=args.near_duplicate_rate)
+    elapsed = time.perf_counter() - started
+    print(f"🧪 Wrote {count:,} rows to {out} in {elapsed:.2f}s ({count / elapsed:,.0f} rows/sec)")
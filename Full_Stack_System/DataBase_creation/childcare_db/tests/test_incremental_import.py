@@ -0,0 +1,49 @@
+import csv
+import sqlite3
+
+from incremental_import import run_incremental_import
+from synthetic_extract import write_extract
+
+
+def near_duplicate_extract(tmp_path, rows=300, duplicates=(5, 50, 200)):
+    """A synthetic extract in which each of `duplicates` copies the next row under a slightly different name."""
+    path = str(tmp_path / "extract.csv")
+    write_extract(path, rows, duplicate_rate=0, near_duplicate_rate=0)
+    with open(path, newline="", encoding="utf-8") as file:
+        table = list(csv.reader(file))
+    name = table[0].index("Facility Name")
+    for i in duplicates:
+        table[i] = list(table[i + 1])
+        table[i][name] += " Inc"
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        csv.writer(file).writerows(table)
+    return path
+
+
+def test_resolve_delta_after_plain_delta(tmp_path):
+    extract = near_duplicate_extract(tmp_path)
+    conn = sqlite3.connect(str(tmp_path / "childcare.db"))
+
+    run_incremental_import(extract, conn)
+    facilities_before = conn.execute("SELECT COUNT(*) FROM facilities").fetchone()[0]
+
+    # Resolution now maps facilities that already have rows onto other IDs
+    stats = run_incremental_import(extract, conn, resolve=True)
+    merged = conn.execute("SELECT COUNT(*) FROM entity_aliases WHERE entity_type = 'Facility'").fetchone()[0]
+    assert merged >= 3
+    assert stats["tombstoned"] == 0
+
+    facilities = conn.execute("SELECT COUNT(*) FROM facilities").fetchone()[0]
+    assert facilities == facilities_before - merged
+    assert conn.execute("SELECT COUNT(*) FROM facility_hours").fetchone()[0] == facilities
+    assert conn.execute("SELECT COUNT(*) FROM facility_hashes WHERE tombstoned_at IS NULL").fetchone()[0] == facilities
+    assert conn.execute("SELECT COUNT(*) FROM facility_history WHERE valid_to IS NULL").fetchone()[0] == facilities
+    assert conn.execute("""
+        SELECT COUNT(*) FROM facilities f WHERE NOT EXISTS (SELECT 1 FROM locations l WHERE l.location_id = f.location_id)
+    """).fetchone()[0] == 0
+
+    # Nothing is left to re-apply
+    stats = run_incremental_import(extract, conn, resolve=True)
+    assert stats["unchanged"] == facilities
+    assert stats["new"] == stats["changed"] == stats["tombstoned"] == 0
+    conn.close()
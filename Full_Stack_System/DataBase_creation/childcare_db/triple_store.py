@@ -0,0 +1,145 @@
+import argparse
+import sqlite3
+
+# Strings are stored once in `terms`; `triples` holds only integer term IDs.
+# The WITHOUT ROWID primary key is the SPO index, and the two secondary
+# indexes (POS, OSP) also carry every column, so any bound subset of
+# subject/predicate/object is answered by an index seek.
+TRIPLE_STORE_SQL = """
+CREATE TABLE IF NOT EXISTS terms (
+    term_id INTEGER PRIMARY KEY,
+    value TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS triples (
+    subject INTEGER NOT NULL,
+    predicate INTEGER NOT NULL,
+    object INTEGER NOT NULL,
+    PRIMARY KEY (subject, predicate, object)  -- Rejects duplicate triples
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS triples_pos ON triples (predicate, object, subject);
+CREATE INDEX IF NOT EXISTS triples_osp ON triples (object, subject, predicate);
+"""
+
+
+class TripleStore:
+    """Dictionary-encoded, fully indexed (subject, predicate, object) store in SQLite."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self._term_cursor = conn.cursor()  # Used while executemany is iterating on self.cursor
+        self._term_ids = {}  # value -> term_id cache for this session
+        self._migrate_legacy_table()
+        self.cursor.executescript(TRIPLE_STORE_SQL)
+
+    def _migrate_legacy_table(self):
+        """Convert a plain TEXT triples(subject, predicate, object) table into the encoded store."""
+        self.cursor.execute("PRAGMA table_info(triples);")
+        columns = {col[1]: col[2].upper() for col in self.cursor.fetchall()}
+        if not columns or columns.get("subject") != "TEXT":
+            return
+
+        print("🔄 Migrating legacy TEXT triples table into the dictionary-encoded store...")
+        self.cursor.execute("ALTER TABLE triples RENAME TO triples_legacy;")
+        self.cursor.executescript(TRIPLE_STORE_SQL)
+        legacy = self.conn.cursor()
+        legacy.execute("SELECT subject, predicate, object FROM triples_legacy;")
+        while True:
+            rows = legacy.fetchmany(10000)
+            if not rows:
+                break
+            self.add_many(rows)
+        self.cursor.execute("DROP TABLE triples_legacy;")
+        self.conn.commit()
+
+    def term_id(self, value, create=True):
+        """Return the integer ID for a string, interning it if `create` is set (else None when unknown)."""
+        value = str(value)
+        term_id = self._term_ids.get(value)
+        if term_id is not None:
+            return term_id
+
+        self._term_cursor.execute("SELECT term_id FROM terms WHERE value = ?", (value,))
+        found = self._term_cursor.fetchone()
+        if found is not None:
+            term_id = found[0]
+        elif create:
+            self._term_cursor.execute("INSERT INTO terms (value) VALUES (?)", (value,))
+            term_id = self._term_cursor.lastrowid
+        else:
+            return None
+
+        self._term_ids[value] = term_id
+        return term_id
+
+    def add(self, subject, predicate, obj):
+        """Insert one triple; returns True if it was new."""
+        return self.add_many([(subject, predicate, obj)]) == 1
+
+    def add_many(self, triples):
+        """Insert an iterable of (subject, predicate, object) strings; returns how many were new."""
+        term_id = self.term_id
+        before = self.conn.total_changes
+        self.cursor.executemany(
+            "INSERT OR IGNORE INTO triples (subject, predicate, object) VALUES (?, ?, ?)",
+            ((term_id(s), term_id(p), term_id(o)) for s, p, o in triples)
+        )
+        return self.conn.total_changes - before
+
+    def _where(self, subject, predicate, obj):
+        """Build the WHERE clause for the bound positions; returns None if a bound term is unknown."""
+        clauses, params = [], []
+        for column, value in (("subject", subject), ("predicate", predicate), ("object", obj)):
+            if value is None:
+                continue
+            bound_id = self.term_id(value, create=False)
+            if bound_id is None:
+                return None
+            clauses.append(f"t.{column} = ?")
+            params.append(bound_id)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def match(self, subject=None, predicate=None, obj=None):
+        """Yield (subject, predicate, object) strings matching every bound (non-None) position."""
+        where = self._where(subject, predicate, obj)
+        if where is None:
+            return
+        clause, params = where
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            SELECT ts.value, tp.value, tob.value
+            FROM triples t
+            JOIN terms ts ON ts.term_id = t.subject
+            JOIN terms tp ON tp.term_id = t.predicate
+            JOIN terms tob ON tob.term_id = t.object
+            {clause}
+        """, params)
+        yield from cursor
+
+    def count(self, subject=None, predicate=None, obj=None):
+        """Count triples matching every bound position."""
+        where = self._where(subject, predicate, obj)
+        if where is None:
+            return 0
+        clause, params = where
+        self.cursor.execute(f"SELECT COUNT(*) FROM triples t{clause}", params)
+        return self.cursor.fetchone()[0]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Look up triples by any bound subset of subject/predicate/object.")
+    parser.add_argument("--db", default="childcare_graph.db")
+    parser.add_argument("-s", "--subject")
+    parser.add_argument("-p", "--predicate")
+    parser.add_argument("-o", "--object")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    store = TripleStore(sqlite3.connect(args.db))
+    for n, triple in enumerate(store.match(args.subject, args.predicate, args.object)):
+        if n >= args.limit:
+            break
+        print(triple)
+    print(f"🔢 {store.count(args.subject, args.predicate, args.object)} matching triples")
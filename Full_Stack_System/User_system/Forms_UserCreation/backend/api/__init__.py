@@ -0,0 +1,78 @@
+import os
+from flask import Flask
+from flask_cors import CORS
+
+from .filter_workers import bp as filter_workers_bp
+from .generate_childcare_jobs import bp as generate_childcare_jobs_bp
+from .get_users import bp as get_users_bp
+from .manage_availability_needs import bp as manage_availability_needs_bp
+from .manage_jobs import bp as manage_jobs_bp
+from .manage_relationships import bp as manage_relationships_bp
+from .manage_skills import bp as manage_skills_bp
+from .search_workers import bp as search_workers_bp
+from .submit_user import bp as submit_user_bp
+from .migrations import migrate_all
+
+# Forms_UserCreation/, so database paths no longer depend on the working directory
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+# Every endpoint that used to run as its own app (and port), in port order
+BLUEPRINTS = [
+    submit_user_bp,                 # 5000
+    get_users_bp,                   # 5001
+    manage_relationships_bp,        # 5002
+    manage_skills_bp,               # 5003
+    manage_jobs_bp,                 # 5004
+    search_workers_bp,              # 5005
+    manage_availability_needs_bp,   # 5006
+    filter_workers_bp,              # 5007
+    generate_childcare_jobs_bp,     # 5008
+]
+
+
+def default_config():
+    """Database locations and connection settings; each can be overridden with an environment variable of the same name."""
+    defaults = {
+        "USERS_DB_PATH": os.path.join(BASE_DIR, "database/users/users.db"),
+        "JOBS_DB_PATH": os.path.join(BASE_DIR, "database/jobs/jobs.db"),
+        # Facilities and their capacity come from the childcare ETL's database
+        "CHILDCARE_DB_PATH": os.path.join(BASE_DIR, "../../DataBase_creation/childcare_db/childcare.db"),
+        # Zip centroid gazetteer, e.g. the Census ZCTA gazetteer file
+        "ZIP_CENTROIDS_PATH": os.path.join(BASE_DIR, "database/geo/zip_centroids.txt"),
+    }
+    config = {key: os.path.abspath(os.environ.get(key, value)) for key, value in defaults.items()}
+    # Connection settings for db.get_db(): how long a writer waits for the lock, prepared statements kept per connection
+    config["DB_BUSY_TIMEOUT_MS"] = int(os.environ.get("DB_BUSY_TIMEOUT_MS", 5000))
+    config["DB_STATEMENT_CACHE"] = int(os.environ.get("DB_STATEMENT_CACHE", 256))
+    # Rows per page of the list endpoints when a request names no limit, and the most it may ask for
+    config["PAGE_SIZE"] = int(os.environ.get("PAGE_SIZE", 100))
+    config["MAX_PAGE_SIZE"] = int(os.environ.get("MAX_PAGE_SIZE", 1000))
+    # Rows fetched and written per chunk of an NDJSON stream
+    config["STREAM_CHUNK_ROWS"] = int(os.environ.get("STREAM_CHUNK_ROWS", 500))
+    # In-process cache of list endpoint responses: entries kept, and the largest body worth keeping
+    config["RESPONSE_CACHE_ENTRIES"] = int(os.environ.get("RESPONSE_CACHE_ENTRIES", 256))
+    config["RESPONSE_CACHE_MAX_BYTES"] = int(os.environ.get("RESPONSE_CACHE_MAX_BYTES", 1024 * 1024))
+    # Async app (async_app.py): database threads shared by all connections, and how long a request may take
+    config["ASYNC_DB_WORKERS"] = int(os.environ.get("ASYNC_DB_WORKERS", 16))
+    config["REQUEST_TIMEOUT_S"] = float(os.environ.get("REQUEST_TIMEOUT_S", 30))
+    return config
+
+
+def create_app(config=None):
+    """Build the API application with every endpoint blueprint mounted."""
+    app = Flask(__name__, static_folder=None)
+    app.config.update(default_config())
+    if config:
+        app.config.update(config)
+    CORS(app, resources={r"/api/*": {"origins": "*"}})  # 🔥 Allow CORS for all /api/* endpoints
+
+    for blueprint in BLUEPRINTS:
+        app.register_blueprint(blueprint)
+
+    # Schema changes happen here, once per process, never on the request path
+    if app.config.get("MIGRATE_ON_START", True):
+        migrate_all(app.config)
+
+    print(f"📌 Using users database: {app.config['USERS_DB_PATH']}")
+    print(f"📌 Using jobs database: {app.config['JOBS_DB_PATH']}")
+    return app
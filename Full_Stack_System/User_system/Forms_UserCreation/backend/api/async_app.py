@@ -0,0 +1,139 @@
+import asyncio
+import contextlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Mount, Route
+
+from . import create_app, default_config, matching
+from .db import thread_connection
+from .migrations import migrate_all
+
+# The matching endpoints as async routes. The event loop only holds connections; every query
+# runs on a bounded pool of database threads, each with its own pooled SQLite connection.
+
+
+class _Query:
+    """One matching call on a database thread, which the event loop can interrupt."""
+
+    def __init__(self, config):
+        self.config = config
+        self.lock = threading.Lock()
+        self.conn = None
+        self.cancelled = False
+
+    def run(self, function, *args):
+        """(JSON body, status) of `function(conn, *args)`, rendered here to keep the event loop free."""
+        conn = thread_connection(self.config["JOBS_DB_PATH"], False, self.config["DB_BUSY_TIMEOUT_MS"],
+                                 self.config["DB_STATEMENT_CACHE"])
+        with self.lock:
+            if self.cancelled:  # Gave up on while queued
+                return None
+            self.conn = conn
+        try:
+            payload, status = function(conn, *args)
+        finally:
+            with self.lock:
+                self.conn = None  # The thread's next call must not be interrupted on our behalf
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode(), status
+
+    def interrupt(self):
+        """Abort the running statement; a write in progress rolls back in db.transaction()."""
+        with self.lock:
+            self.cancelled = True
+            if self.conn is not None:
+                self.conn.interrupt()
+
+
+async def _client_disconnected(receive):
+    # A GET's only body message comes first; the next one is the disconnect
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def run_matching(request, function, *args):
+    """
+    Respond with `function(conn, *args)` run on the database threads. Past REQUEST_TIMEOUT_S,
+    queueing included, or once the client disconnects, the query is interrupted.
+    """
+    app_state = request.app.state
+    query = _Query(app_state.config)
+    work = asyncio.get_running_loop().run_in_executor(app_state.executor, query.run, function, *args)
+    disconnect = asyncio.ensure_future(_client_disconnected(request.receive))
+    try:
+        done, _ = await asyncio.wait({work, disconnect}, timeout=app_state.config["REQUEST_TIMEOUT_S"],
+                                     return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        disconnect.cancel()
+        if not work.done():  # Timed out, client gone, or this task cancelled
+            query.interrupt()
+            work.cancel()
+
+    if work not in done:
+        if disconnect in done:
+            return JSONResponse({"error": "Client disconnected"}, status_code=503)
+        return JSONResponse({"error": f"Timed out after {app_state.config['REQUEST_TIMEOUT_S']}s"}, status_code=504)
+    try:
+        body, status = work.result()
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+    return Response(body, status_code=status, media_type="application/json")
+
+
+async def search_workers(request):
+    return await run_matching(request, matching.search_workers, request.query_params.get("job_id"))
+
+
+async def filter_workers(request):
+    return await run_matching(request, matching.filter_workers, request.query_params.get("job_id"))
+
+
+async def social_unit_impact(request):
+    return await run_matching(request, matching.social_unit_impact)
+
+
+async def generate_childcare_jobs(request):
+    return await run_matching(request, matching.generate_childcare_jobs)
+
+
+def create_async_app(config=None):
+    """
+    Build the ASGI application: the matching endpoints served async, and, when a2wsgi is
+    installed, every other endpoint through the Flask app in the same process.
+    """
+    settings = default_config()
+    settings.update(config or {})
+    if settings.get("MIGRATE_ON_START", True):
+        migrate_all(settings)
+
+    executor = ThreadPoolExecutor(max_workers=settings["ASYNC_DB_WORKERS"], thread_name_prefix="db")
+
+    routes = [
+        Route("/api/search_workers", search_workers, methods=["GET"]),
+        Route("/api/filter_workers", filter_workers, methods=["GET"]),
+        Route("/api/social_unit_impact", social_unit_impact, methods=["GET"]),
+        Route("/api/generate_childcare_jobs", generate_childcare_jobs, methods=["GET"]),
+    ]
+    try:
+        from a2wsgi import WSGIMiddleware
+    except ImportError:
+        print("⚠️ a2wsgi is not installed (pip install a2wsgi); serving only the matching endpoints")
+    else:
+        routes.append(Mount("/", app=WSGIMiddleware(create_app({**settings, "MIGRATE_ON_START": False}))))
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        yield
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    app = Starlette(routes=routes, lifespan=lifespan, middleware=[
+        Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"]),
+    ])
+    app.state.config = settings
+    app.state.executor = executor
+    return app
@@ -0,0 +1,231 @@
+import csv
+import heapq
+import math
+from collections import defaultdict
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.2  # Length of one degree of latitude
+
+# Accepted header names for the zip, latitude and longitude columns. The Census
+# ZCTA gazetteer (e.g. 2023_Gaz_zcta_national.txt) is tab-separated with
+# GEOID/INTPTLAT/INTPTLONG; a plain zip,lat,lon CSV works too.
+CENTROID_COLUMNS = {
+    "zip": ("GEOID", "ZCTA5", "ZIP", "ZIP_CODE"),
+    "lat": ("INTPTLAT", "LAT", "LATITUDE"),
+    "lon": ("INTPTLONG", "LON", "LNG", "LONGITUDE"),
+}
+
+
+def normalize_zip(zip_code):
+    """5-digit zip string ('48201-1234' -> '48201', 2134 -> '02134'); None when empty."""
+    if zip_code is None:
+        return None
+    zip_code = str(zip_code).strip().split("-")[0]
+    if not zip_code:
+        return None
+    return zip_code.zfill(5) if zip_code.isdigit() else zip_code
+
+
+def load_zip_centroids(path):
+    """Read a zip centroid gazetteer into {zip: (lat, lon)}."""
+    with open(path, newline="", encoding="utf-8") as file:
+        header_line = file.readline()
+        delimiter = "\t" if "\t" in header_line else ","
+        header = [name.strip().upper() for name in next(csv.reader([header_line], delimiter=delimiter))]
+        positions = {}
+        for key, names in CENTROID_COLUMNS.items():
+            matches = [header.index(name) for name in names if name in header]
+            if not matches:
+                raise ValueError(f"{path}: no {key} column (expected one of {names})")
+            positions[key] = matches[0]
+
+        centroids = {}
+        for row in csv.reader(file, delimiter=delimiter):
+            try:
+                centroids[normalize_zip(row[positions["zip"]])] = (float(row[positions["lat"]]),
+                                                                   float(row[positions["lon"]]))
+            except (IndexError, ValueError):
+                continue  # Blank or malformed line
+    return centroids
+
+
+def haversine_km(a, b):
+    """Great-circle distance in km between two (lat, lon) points."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (*a, *b))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(h))
+
+
+class ZipGrid:
+    """
+    Uniform lat/lon grid over zip centroids for radius and k-nearest queries.
+
+    Cells are `cell_km` tall; a query only visits the cells its radius can
+    reach, so its cost depends on local density, not on the number of zips.
+    """
+
+    def __init__(self, centroids, cell_km=10.0):
+        self.centroids = centroids
+        self.cell_deg = cell_km / KM_PER_DEGREE
+        self.cells = defaultdict(list)
+        for zip_code, (lat, lon) in centroids.items():
+            self.cells[self._cell(lat, lon)].append(zip_code)
+
+    def _cell(self, lat, lon):
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lon / self.cell_deg))
+
+    def within(self, point, radius_km):
+        """[(distance_km, zip)] of every centroid within `radius_km` of `point`, nearest first."""
+        lat, lon = point
+        row, col = self._cell(lat, lon)
+        lat_cells = int(math.ceil(radius_km / KM_PER_DEGREE / self.cell_deg))
+        # A degree of longitude shrinks with cos(latitude); widen the scan to match
+        shrink = max(math.cos(math.radians(min(abs(lat) + radius_km / KM_PER_DEGREE, 89.0))), 0.01)
+        lon_cells = int(math.ceil(radius_km / (KM_PER_DEGREE * shrink) / self.cell_deg))
+
+        found = []
+        for r in range(row - lat_cells, row + lat_cells + 1):
+            for c in range(col - lon_cells, col + lon_cells + 1):
+                for zip_code in self.cells.get((r, c), ()):
+                    distance = haversine_km(point, self.centroids[zip_code])
+                    if distance <= radius_km:
+                        found.append((distance, zip_code))
+        found.sort()
+        return found
+
+    def nearest(self, point, k, max_km):
+        """The `k` nearest centroids within `max_km` of `point`, as [(distance_km, zip)]."""
+        return self.within(point, max_km)[:k]
+
+
+def _min_cost_flow(supply, demand, arcs):
+    """
+    Send as many units as possible from `supply` {node: units} to `demand`
+    {node: units} over `arcs` [(from, to, integer cost)], at the least total
+    cost among those. Returns {(from, to): units} for the arcs in use.
+
+    Units left over go to an overflow node costing more than any set of routes,
+    so every unit has somewhere to go. Successive shortest paths then route
+    each supply node's units in turn: Dijkstra on reduced costs (Johnson
+    potentials) stops at the first node with room, usually among the node's
+    own arcs, and moves units already routed only where that lowers the total.
+    """
+    index, edges_out = {}, []
+    head, capacity, cost = [], [], []  # Edge e and its reverse e ^ 1
+
+    def node(key):
+        if key not in index:
+            index[key] = len(edges_out)
+            edges_out.append([])
+        return index[key]
+
+    def add_edge(u, v, units, edge_cost):
+        for a, b, c, w in ((u, v, units, edge_cost), (v, u, 0, -edge_cost)):
+            edges_out[a].append(len(head))
+            head.append(b)
+            capacity.append(c)
+            cost.append(w)
+        return len(head) - 2
+
+    room = {node("overflow"): math.inf}
+    for key, units in demand.items():
+        room[node(("to", key))] = units
+    arc_edges = {(u, v): add_edge(node(("from", u)), node(("to", v)), supply[u], arc_cost) for u, v, arc_cost in arcs}
+    overflow_cost = (max((arc_cost for _, _, arc_cost in arcs), default=0) + 1) * (sum(supply.values()) + 1)
+    for key, units in supply.items():
+        add_edge(node(("from", key)), index["overflow"], units, overflow_cost)
+
+    potential = [0] * len(edges_out)  # Every arc cost is >= 0, so zero potentials start out feasible
+    for key, units in supply.items():
+        start, left = index[("from", key)], units
+        while left:
+            dist, previous, settled, heap = {start: 0}, {}, [], [(0, start)]
+            while True:  # The overflow node is always reachable
+                d, u = heapq.heappop(heap)
+                if d > dist[u]:
+                    continue
+                settled.append(u)
+                if room.get(u):
+                    break
+                for e in edges_out[u]:
+                    if capacity[e] > 0:
+                        v = head[e]
+                        reduced = d + cost[e] + potential[u] - potential[v]
+                        if reduced < dist.get(v, math.inf):
+                            dist[v] = reduced
+                            previous[v] = e
+                            heapq.heappush(heap, (reduced, v))
+            for v in settled:  # Unsettled nodes are at least d away; leaving them keeps reduced costs >= 0
+                potential[v] += dist[v] - d
+
+            path, v = [], u
+            while v != start:
+                path.append(previous[v])
+                v = head[previous[v] ^ 1]
+            units = min(left, room[u], *(capacity[e] for e in path))
+            for e in path:
+                capacity[e] -= units
+                capacity[e ^ 1] += units
+            room[u] -= units
+            left -= units
+
+    return {arc: capacity[e ^ 1] for arc, e in arc_edges.items() if capacity[e ^ 1]}
+
+
+def place_workers(workers, facilities, centroids=None, k=8, max_km=25.0):
+    """
+    Assign workers needing childcare to facilities with open slots: as many
+    workers as possible, at the least total distance for that many.
+
+    `workers` is [(user_id, zip)], `facilities` is [(facility_id, zip, open_slots)].
+    Distances are between zip centroids, so every facility in a zip is equally
+    far and workers in the same zip are interchangeable: each worker zip
+    considers the `k` nearest zips within `max_km` that have open slots (always
+    including its own zip, even without a centroid), and a min-cost flow over
+    those (worker zip, facility zip) arcs decides how many go where. Within a
+    facility zip, facilities fill largest-first.
+
+    Returns ({user_id: (facility_id, distance_km)}, [unplaced user_ids]).
+    """
+    centroids = centroids or {}
+    # Open slots per zip, as a stack of [facility_id, slots] popped largest-first
+    zip_slots = defaultdict(list)
+    for facility_id, zip_code, open_slots in facilities:
+        zip_code = normalize_zip(zip_code)
+        if zip_code and open_slots and open_slots > 0:
+            zip_slots[zip_code].append([facility_id, open_slots])
+    for stack in zip_slots.values():
+        stack.sort(key=lambda entry: entry[1])
+
+    grid = ZipGrid({zip_code: centroids[zip_code] for zip_code in zip_slots if zip_code in centroids},
+                   cell_km=max(max_km / 2, 1.0))
+
+    zip_workers = defaultdict(list)  # Worker zip -> user_ids, in input order
+    for user_id, zip_code in workers:
+        zip_workers[normalize_zip(zip_code)].append(user_id)
+
+    arcs = []  # (worker zip, facility zip, distance_km)
+    for zip_code in zip_workers:
+        nearest = grid.nearest(centroids[zip_code], k, max_km) if zip_code in centroids else []
+        if zip_code in zip_slots and all(found != zip_code for _, found in nearest):
+            nearest = [(0.0, zip_code)] + nearest[:k - 1]
+        arcs.extend((zip_code, found, distance) for distance, found in nearest)
+
+    flows = _min_cost_flow({zip_code: len(users) for zip_code, users in zip_workers.items()},
+                           {zip_code: sum(slots for _, slots in stack) for zip_code, stack in zip_slots.items()},
+                           [(worker_zip, facility_zip, round(distance * 1000))  # Whole metres: exact sums
+                            for worker_zip, facility_zip, distance in arcs])
+
+    placements = {}
+    for worker_zip, facility_zip, distance in sorted(arcs, key=lambda arc: arc[2]):
+        users = zip_workers[worker_zip]
+        stack = zip_slots[facility_zip]
+        for _ in range(flows.get((worker_zip, facility_zip), 0)):
+            facility = stack[-1]
+            placements[users.pop(0)] = (facility[0], round(distance, 2))
+            facility[1] -= 1
+            if facility[1] == 0:
+                stack.pop()
+
+    unplaced = [user_id for user_id, _ in workers if user_id not in placements]
+    return placements, unplaced
@@ -0,0 +1,75 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from flask import current_app
+
+# One connection per (thread, database file), reused across requests. The WSGI
+# server's worker threads are long-lived, so this is the connection pool.
+_local = threading.local()
+
+
+def _open(path, readonly, busy_timeout_ms, statement_cache):
+    if readonly:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=busy_timeout_ms / 1000,
+                               cached_statements=statement_cache, isolation_level=None)
+    else:
+        # Autocommit; multi-statement writes go through transaction()
+        conn = sqlite3.connect(path, timeout=busy_timeout_ms / 1000, cached_statements=statement_cache,
+                               isolation_level=None)
+        # WAL lets readers keep reading while the single writer commits; it is
+        # recorded in the database file, so this only changes it the first time
+        conn.execute("PRAGMA journal_mode = WAL;")
+        conn.execute("PRAGMA synchronous = NORMAL;")  # Durable at checkpoints; safe with WAL
+    conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)};")
+    return conn
+
+
+def thread_connection(path, readonly=False, busy_timeout_ms=5000, statement_cache=256):
+    """This thread's connection to the database file at `path`, opened on first use and kept open afterwards."""
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    key = (path, readonly)
+    conn = connections.get(key)
+    if conn is None:
+        conn = connections[key] = _open(path, readonly, busy_timeout_ms, statement_cache)
+    elif conn.in_transaction:
+        conn.rollback()  # Left open by a request that failed mid-write
+    return conn
+
+
+def get_db(name="jobs", readonly=False):
+    """
+    This thread's connection to the `name` database ("users", "jobs" or "childcare"),
+    at the <NAME>_DB_PATH app config.
+    """
+    config = current_app.config
+    return thread_connection(config[f"{name.upper()}_DB_PATH"], readonly, config["DB_BUSY_TIMEOUT_MS"],
+                             config["DB_STATEMENT_CACHE"])
+
+
+@contextmanager
+def transaction(conn):
+    """
+    Run a block of writes as one transaction; yields a cursor.
+
+    BEGIN IMMEDIATE takes the write lock up front, so a second writer waits out
+    the busy timeout at BEGIN instead of failing part-way through.
+    """
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        yield cursor
+    except BaseException:
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+
+
+def close_connections():
+    """Close this thread's connections (e.g. before forking or in tests)."""
+    for conn in getattr(_local, "connections", {}).values():
+        conn.close()
+    _local.connections = {}
@@ -1,99 +1,114 @@
-import sqlite3
-from flask import Flask, jsonify
-from flask_cors import CORS  # 🔥 Import CORS
-
-app = Flask(__name__)
-CORS(app, resources={r"/api/*": {"origins": "*"}})  # 🔥 Allow CORS for all /api/* endpoints
+import math
+import os
+import time
+from flask import Blueprint, current_app, jsonify, request
+
+from . import matching
+from .childcare_placement import load_zip_centroids, place_workers
+from .db import get_db, transaction
+from .queries import CHILDCARE_WORKER_ZIPS_SQL
+
+bp = Blueprint("generate_childcare_jobs", __name__)
+
+_centroid_cache = {}  # (path, mtime) -> {zip: (lat, lon)}
+
+
+def zip_centroids():
+    """The zip centroid gazetteer, reloaded only when the file changes; {} if it is missing."""
+    path = current_app.config["ZIP_CENTROIDS_PATH"]
+    if not os.path.exists(path):
+        print(f"⚠️ No zip centroids at {path}; matching workers to facilities in their own zip only")
+        return {}
+    key = (path, os.path.getmtime(path))
+    if key not in _centroid_cache:
+        _centroid_cache.clear()
+        _centroid_cache[key] = load_zip_centroids(path)
+    return _centroid_cache[key]
+
+
+def facilities_with_open_slots():
+    """[(facility_id, zip, open_slots)] plus {facility_id: name} for facilities with spare capacity."""
+    cursor = get_db("childcare", readonly=True).cursor()
+    # int64-mode databases store integer IDs; hand out the 16-char hex form the exports use
+    cursor.execute("""
+        SELECT CASE typeof(f.facility_id) WHEN 'integer' THEN printf('%016x', f.facility_id) ELSE f.facility_id END,
+               f.facility_name, l.zip_code, f.capacity - COALESCE(f.enrollment, 0)
+        FROM facilities f
+        JOIN locations l ON l.location_id = f.location_id
+        WHERE f.capacity > COALESCE(f.enrollment, 0)
+    """)
+    rows = cursor.fetchall()
+    return [(facility_id, zip_code, open_slots) for facility_id, _, zip_code, open_slots in rows], \
+        {facility_id: name for facility_id, name, _, _ in rows}
+
+@bp.route("/api/generate_childcare_jobs", methods=["GET"])
+def generate_childcare_jobs():
+    """Creates childcare jobs and assigns workers to them (matching.generate_childcare_jobs)."""
+    try:
+        print(f"🔍 Checking database at: {current_app.config['JOBS_DB_PATH']}")
+        payload, status = matching.generate_childcare_jobs(get_db("jobs"))
+        return jsonify(payload), status
 
-DB_PATH = "Forms_UserCreation/database/jobs/jobs.db"
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return jsonify({"error": str(e)}), 500
 
-@app.route("/api/generate_childcare_jobs", methods=["GET"])
-def generate_childcare_jobs():
+@bp.route("/api/place_childcare", methods=["GET", "POST"])
+def place_childcare():
     """
-    Identifies jobs that create childcare needs, assigns childcare jobs to workers who are
-    not employable for those jobs, and prioritizes maximizing the overall labor force.
+    Matches workers with a Childcare need to the nearest facilities with open slots
+    (Capacity - Enrollment). GET previews the placements; POST also saves them to
+    childcare_placements, replacing the previous run.
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        print(f"🔍 Checking database at: {DB_PATH}")
-
-        # Step 1: Identify workers who need childcare
-        cursor.execute("""
-            SELECT DISTINCT users.id, users.name, users.job_id
-            FROM users
-            JOIN worker_needs ON users.id = worker_needs.user_id
-            WHERE worker_needs.need = 'Childcare'
-        """)
-        workers_with_childcare_needs = cursor.fetchall()
-
-        print(f"🔍 Workers needing childcare: {workers_with_childcare_needs}")
-
-        # Step 2: Identify all available workers
-        cursor.execute("""
-            SELECT DISTINCT users.id, users.name
-            FROM users
-            WHERE users.id NOT IN (SELECT DISTINCT user_id FROM worker_availability)
-        """)
-        available_workers = cursor.fetchall()
+        k = int(request.args.get("k", 8))  # Nearest zips considered per worker
+        max_km = float(request.args.get("max_km", 25))
+    except ValueError:
+        return jsonify({"error": "k must be an integer and max_km a number"}), 400
+    if k < 1 or not 0 < max_km < math.inf:  # Also turns away max_km=nan
+        return jsonify({"error": "k must be at least 1 and max_km a positive, finite distance"}), 400
 
-        print(f"✅ Available workers for childcare jobs: {available_workers}")
+    try:
+        started = time.perf_counter()
 
-        if not workers_with_childcare_needs:
-            print("⚠️ No workers require childcare!")
+        conn = get_db("jobs")
+        cursor = conn.cursor()
+        cursor.execute(CHILDCARE_WORKER_ZIPS_SQL)
+        workers = cursor.fetchall()
+        if not workers:
             return jsonify({"message": "No workers need childcare."})
 
-        # Step 3: Create childcare jobs
-        childcare_jobs_created = []
-        childcare_worker_assignments = []
-        CHILDCARE_RATIO = 5  # One childcare worker supports 5 needing childcare
-
-        # Calculate how many childcare jobs we need
-        childcare_jobs_needed = -(-len(workers_with_childcare_needs) // CHILDCARE_RATIO)
-
-        print(f"📌 Creating {childcare_jobs_needed} childcare jobs...")
-
-        for _ in range(childcare_jobs_needed):
-            cursor.execute("INSERT INTO jobs (title, description) VALUES (?, ?)", 
-                           ("Childcare Provider", "Provides childcare support."))
-            childcare_job_id = cursor.lastrowid
-            childcare_jobs_created.append(childcare_job_id)
-
-        print(f"✅ Created childcare jobs: {childcare_jobs_created}")
-
-        # Step 4: Assign available workers to childcare jobs
-        print(f"📌 Trying to assign {len(available_workers)} available workers to {len(childcare_jobs_created)} childcare jobs.")
-
-        for childcare_job_id in childcare_jobs_created:
-            if available_workers:
-                assigned_worker = available_workers.pop(0)
-                
-                # Update the database to set the worker's job_id
-                cursor.execute("""
-                    UPDATE users
-                    SET job_id = ?
-                    WHERE id = ?
-                """, (childcare_job_id, assigned_worker[0]))
-
-                childcare_worker_assignments.append({
-                    "childcare_job_id": childcare_job_id,
-                    "worker_id": assigned_worker[0],
-                    "worker_name": assigned_worker[1]
-                })
-                print(f"✅ Assigned {assigned_worker[1]} (ID: {assigned_worker[0]}) to Childcare Job {childcare_job_id}")
-
-        conn.commit()
-        conn.close()
-
+        facilities, facility_names = facilities_with_open_slots()
+        placements, unplaced = place_workers([(user_id, zip_code) for user_id, _, zip_code in workers],
+                                             facilities, zip_centroids(), k=k, max_km=max_km)
+        zips = {facility_id: zip_code for facility_id, zip_code, _ in facilities}
+        names = {user_id: name for user_id, name, _ in workers}
+        results = [{
+            "worker_id": user_id,
+            "worker_name": names[user_id],
+            "facility_id": facility_id,
+            "facility_name": facility_names[facility_id],
+            "zip_code": zips[facility_id],
+            "distance_km": distance,
+        } for user_id, (facility_id, distance) in placements.items()]
+
+        if request.method == "POST":
+            with transaction(conn) as cursor:
+                cursor.execute("DELETE FROM childcare_placements")
+                cursor.executemany("""
+                    INSERT INTO childcare_placements (user_id, facility_id, facility_name, zip_code, distance_km)
+                    VALUES (?, ?, ?, ?, ?)
+                """, [(r["worker_id"], r["facility_id"], r["facility_name"], r["zip_code"], r["distance_km"])
+                      for r in results])
+
+        elapsed = time.perf_counter() - started
+        print(f"✅ Placed {len(results)} of {len(workers)} workers in {elapsed:.2f}s")
         return jsonify({
-            "jobs_created": len(childcare_jobs_created),
-            "childcare_worker_assignments": childcare_worker_assignments
+            "placed": len(results),
+            "unplaced": [{"worker_id": user_id, "worker_name": names[user_id]} for user_id in unplaced],
+            "placements": results,
         })
 
     except Exception as e:
         print(f"❌ Error: {e}")
         return jsonify({"error": str(e)}), 500
-
-if __name__ == "__main__":
-    app.run(debug=True, port=5008)
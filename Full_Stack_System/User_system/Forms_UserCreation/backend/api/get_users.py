@@ -1,45 +1,31 @@
-import sqlite3
-from flask import Flask, jsonify
-from flask_cors import CORS
-import os
+from flask import Blueprint, jsonify, request
 
-app = Flask(__name__)
-CORS(app)
+from .db import get_db
+from .http_cache import cached_listing
+from .pagination import PageError, list_rows, stream_rows, wants_ndjson
 
-# FIX: Ensure absolute path to database
-BASE_DIR = os.path.abspath(os.path.dirname(__file__))  # Get script directory
-DB_PATH = os.path.join(BASE_DIR, "../../database/users/users.db")
-print(f"📌 Using database path: {DB_PATH}")
+bp = Blueprint("get_users", __name__)
 
-@app.route("/api/get_users", methods=["GET"])
+@bp.route("/api/get_users", methods=["GET"])
+@cached_listing("users")
 def get_users():
     try:
         print("🔍 Fetching users from database...")
 
-        if not os.path.exists(DB_PATH):
-            print("❌ ERROR: Database file not found!")
-            return jsonify({"error": "Database file not found"}), 500
+        conn = get_db("users")
+        if wants_ndjson():
+            return stream_rows(conn, "users", request.args)
 
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, name, email, user_type, created_at FROM users")
-        users = cursor.fetchall()
-        conn.close()
+        user_list, page = list_rows(conn, "users", request.args)
 
-        if not users:
+        if not user_list:
             print("⚠️ No users found in database.")
 
-        user_list = [
-            {"id": user[0], "name": user[1], "email": user[2], "user_type": user[3], "created_at": user[4]}
-            for user in users
-        ]
-
-        print(f"✅ Retrieved {len(user_list)} users.")
-        return jsonify({"users": user_list}), 200
+        print(f"✅ Retrieved {len(user_list)} of {page['total']} users.")
+        return jsonify({"users": user_list, **page}), 200
 
+    except PageError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"❌ Error fetching users: {str(e)}")
         return jsonify({"error": str(e)}), 500
-
-if __name__ == "__main__":
-    app.run(debug=True, port=5001)
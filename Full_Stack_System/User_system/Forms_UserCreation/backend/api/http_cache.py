@@ -0,0 +1,78 @@
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from functools import wraps
+from flask import Response, current_app, request
+
+from .db import get_db
+from .queries import LISTINGS, TABLE_VERSION_SQL
+
+# Serialized list responses shared by every worker thread:
+# (database path, listing, query string, Accept) -> (ETag, body, mimetype), least recently used first
+_responses = OrderedDict()
+_lock = threading.Lock()
+
+
+def table_version(conn, table):
+    """The table's change version from table_stats, or None on a database not yet migrated."""
+    try:
+        row = conn.execute(TABLE_VERSION_SQL, (table,)).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def _remember(key, entry):
+    with _lock:
+        _responses[key] = entry
+        _responses.move_to_end(key)
+        while len(_responses) > current_app.config["RESPONSE_CACHE_ENTRIES"]:
+            _responses.popitem(last=False)
+
+
+def cached_listing(name):
+    """
+    Conditional GET for the view serving listing `name`.
+
+    The ETag is the listing's table version plus the request's query string and Accept header. A
+    matching If-None-Match gets a 304, and an unchanged version gets the cached JSON body, both
+    after a single table_stats lookup. Streams get an ETag but are never cached.
+    """
+    db, table, _, _ = LISTINGS[name]
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Read before the rows: a write landing in between leaves an older tag on newer data,
+            # which the next request re-fetches, never a newer tag on older data
+            version = table_version(get_db(db), table)
+            if version is None:
+                return view(*args, **kwargs)
+
+            accept = request.headers.get("Accept", "")
+            variant = hashlib.sha1(request.query_string + b"|" + accept.encode()).hexdigest()[:12]
+            etag = f"{name}-{version}-{variant}"
+            headers = {"ETag": f'"{etag}"', "Cache-Control": "no-cache"}  # Revalidate on every poll
+            if request.if_none_match.contains_weak(etag):
+                return Response(status=304, headers=headers)
+
+            key = (current_app.config[f"{db.upper()}_DB_PATH"], name, request.query_string, accept)
+            with _lock:
+                entry = _responses.get(key)
+                if entry is not None:
+                    _responses.move_to_end(key)
+            if entry is not None and entry[0] == etag:
+                return Response(entry[1], mimetype=entry[2], headers=headers)
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            response.headers.update(headers)
+            if not response.is_streamed:
+                body = response.get_data()
+                if len(body) <= current_app.config["RESPONSE_CACHE_MAX_BYTES"]:
+                    _remember(key, (etag, body, response.mimetype))
+            return response
+        return wrapper
+    return decorator
@@ -1,94 +1,74 @@
-import sqlite3
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-import os
+from flask import Blueprint, request, jsonify
 
-app = Flask(__name__)
-CORS(app)
+from .db import get_db, transaction
+from .http_cache import cached_listing
+from .pagination import PageError, list_rows, stream_rows, wants_ndjson
 
-# Set up database path
-BASE_DIR = os.path.abspath(os.path.dirname(__file__))
-DB_PATH = os.path.join(BASE_DIR, "../../database/jobs/jobs.db")
+bp = Blueprint("manage_jobs", __name__)
 
-@app.route("/api/create_job", methods=["POST"])
+@bp.route("/api/create_job", methods=["POST"])
 def create_job():
     try:
         data = request.json
         job_title, job_description = data["job_title"], data["job_description"]
 
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS jobs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                description TEXT NOT NULL
-            );
-        """)
-
-        cursor.execute("INSERT INTO jobs (title, description) VALUES (?, ?)", (job_title, job_description))
-        conn.commit()
-        conn.close()
+        with transaction(get_db("jobs")) as cursor:
+            cursor.execute("INSERT INTO jobs (title, description) VALUES (?, ?)", (job_title, job_description))
 
         return jsonify({"message": "Job created successfully."}), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@app.route("/api/get_jobs", methods=["GET"])
+@bp.route("/api/get_jobs", methods=["GET"])
+@cached_listing("jobs")
 def get_jobs():
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, title, description FROM jobs")
-        jobs = cursor.fetchall()
-        conn.close()
+        conn = get_db("jobs")
+        if wants_ndjson():
+            return stream_rows(conn, "jobs", request.args)
 
-        job_list = [{"id": job[0], "title": job[1], "description": job[2]} for job in jobs]
-        return jsonify({"jobs": job_list}), 200
+        job_list, page = list_rows(conn, "jobs", request.args)
+        return jsonify({"jobs": job_list, **page}), 200
 
+    except PageError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@app.route("/api/create_requirement", methods=["POST"])
+@bp.route("/api/create_requirement", methods=["POST"])
 def create_requirement():
     try:
         data = request.json
-        job_id, requirement = data["job_id"], data["requirement"]
-
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS job_requirements (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                job_id INTEGER NOT NULL,
-                requirement TEXT NOT NULL
-            );
-        """)
-
-        cursor.execute("INSERT INTO job_requirements (job_id, requirement) VALUES (?, ?)", (job_id, requirement))
-        conn.commit()
-        conn.close()
+        job_id, requirement = data["job_id"], data.get("requirement")
+        # search_workers/filter_workers match on skill_id; a requirement that is a skill ID counts as one
+        skill_id = data.get("skill_id")
+        if skill_id is None and str(requirement).strip().isdigit():
+            skill_id = int(requirement)
+        if requirement is None and skill_id is None:
+            return jsonify({"error": "Missing requirement or skill_id"}), 400
+
+        with transaction(get_db("jobs")) as cursor:
+            cursor.execute("INSERT INTO job_requirements (job_id, skill_id, requirement) VALUES (?, ?, ?)",
+                           (job_id, skill_id, requirement))
 
         return jsonify({"message": "Requirement added to job."}), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@app.route("/api/get_requirements", methods=["GET"])
+@bp.route("/api/get_requirements", methods=["GET"])
+@cached_listing("requirements")
 def get_requirements():
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("SELECT job_id, requirement FROM job_requirements")
-        requirements = cursor.fetchall()
-        conn.close()
+        conn = get_db("jobs")
+        if wants_ndjson():
+            return stream_rows(conn, "requirements", request.args)
 
-        requirement_list = [{"job_id": req[0], "requirement": req[1]} for req in requirements]
-        return jsonify({"requirements": requirement_list}), 200
+        requirement_list, page = list_rows(conn, "requirements", request.args)
+        return jsonify({"requirements": requirement_list, **page}), 200
 
+    except PageError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-
-if __name__ == "__main__":
-    app.run(debug=True, port=5004)
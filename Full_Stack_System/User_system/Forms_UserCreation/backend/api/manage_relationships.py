@@ -1,61 +1,38 @@
-import sqlite3
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-import os
+from flask import Blueprint, request, jsonify
 
-app = Flask(__name__)
-CORS(app)
+from .db import get_db, transaction
+from .http_cache import cached_listing
+from .pagination import PageError, list_rows, stream_rows, wants_ndjson
 
-# Set up database path
-BASE_DIR = os.path.abspath(os.path.dirname(__file__))
-DB_PATH = os.path.join(BASE_DIR, "../../database/users/users.db")
+bp = Blueprint("manage_relationships", __name__)
 
-@app.route("/api/create_relationship", methods=["POST"])
+@bp.route("/api/create_relationship", methods=["POST"])
 def create_relationship():
     try:
         data = request.json
         user_a, user_b, relationship_type = data["user_a_id"], data["user_b_id"], data["relationship_type"]
 
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS relationships (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_a TEXT NOT NULL,
-                user_b TEXT NOT NULL,
-                relationship_type TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-        """)
-
-        cursor.execute("INSERT INTO relationships (user_a, user_b, relationship_type) VALUES (?, ?, ?)", 
-                       (user_a, user_b, relationship_type))
-        conn.commit()
-        conn.close()
+        with transaction(get_db("users")) as cursor:
+            cursor.execute("INSERT INTO relationships (user_a, user_b, relationship_type) VALUES (?, ?, ?)", 
+                           (user_a, user_b, relationship_type))
 
         return jsonify({"message": "Relationship created successfully."}), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@app.route("/api/get_relationships", methods=["GET"])
+@bp.route("/api/get_relationships", methods=["GET"])
+@cached_listing("relationships")
 def get_relationships():
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("SELECT user_a, relationship_type, user_b FROM relationships")
-        relationships = cursor.fetchall()
-        conn.close()
+        conn = get_db("users")
+        if wants_ndjson():
+            return stream_rows(conn, "relationships", request.args)
 
-        relationship_list = [
-            {"user_a": rel[0], "type": rel[1], "user_b": rel[2]}
-            for rel in relationships
-        ]
-
-        return jsonify({"relationships": relationship_list}), 200
+        relationship_list, page = list_rows(conn, "relationships", request.args)
+        return jsonify({"relationships": relationship_list, **page}), 200
 
+    except PageError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-
-if __name__ == "__main__":
-    app.run(debug=True, port=5002)
@@ -1,105 +1,76 @@
-import sqlite3
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-import os
+from flask import Blueprint, request, jsonify
 
-app = Flask(__name__)
-CORS(app)
+from .db import get_db, transaction
+from .http_cache import cached_listing
+from .pagination import PageError, list_rows, stream_rows, wants_ndjson
 
-# Set up database path
-BASE_DIR = os.path.abspath(os.path.dirname(__file__))
-DB_PATH = os.path.join(BASE_DIR, "../../database/users/users.db")
+bp = Blueprint("manage_skills", __name__)
 
-@app.route("/api/create_skill", methods=["POST"])
+@bp.route("/api/create_skill", methods=["POST"])
 def create_skill():
     try:
         data = request.json
         skill_name = data["skill_name"]
 
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS skills (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL
-            );
-        """)
-
-        cursor.execute("INSERT INTO skills (name) VALUES (?)", (skill_name,))
-        conn.commit()
-        conn.close()
+        with transaction(get_db("users")) as cursor:
+            cursor.execute("INSERT INTO skills (name) VALUES (?)", (skill_name,))
 
         return jsonify({"message": "Skill created successfully."}), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@app.route("/api/get_skills", methods=["GET"])
+@bp.route("/api/get_skills", methods=["GET"])
+@cached_listing("skills")
 def get_skills():
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, name FROM skills")
-        skills = cursor.fetchall()
-        conn.close()
+        conn = get_db("users")
+        if wants_ndjson():
+            return stream_rows(conn, "skills", request.args)
 
-        skill_list = [{"id": skill[0], "name": skill[1]} for skill in skills]
-        return jsonify({"skills": skill_list}), 200
+        skill_list, page = list_rows(conn, "skills", request.args)
+        return jsonify({"skills": skill_list, **page}), 200
 
+    except PageError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@app.route("/api/associate_skill", methods=["POST"])
+@bp.route("/api/associate_skill", methods=["POST"])
 def associate_skill():
     try:
         data = request.json
         user_id, skill_id = data["user_id"], data["skill_id"]
 
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS user_skills (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                skill_id INTEGER NOT NULL
-            );
-        """)
-
-        cursor.execute("INSERT INTO user_skills (user_id, skill_id) VALUES (?, ?)", (user_id, skill_id))
-        conn.commit()
-        conn.close()
+        with transaction(get_db("users")) as cursor:
+            cursor.execute("INSERT INTO user_skills (user_id, skill_id) VALUES (?, ?)", (user_id, skill_id))
 
         return jsonify({"message": "Skill associated with user."}), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@app.route("/api/get_user_skills", methods=["GET"])
+@bp.route("/api/get_user_skills", methods=["GET"])
+@cached_listing("user_skills")
 def get_user_skills():
     try:
         print("🔍 Fetching raw user_skills data...")  # Debugging log
 
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
+        # No joins, raw table data
+        conn = get_db("users")
+        if wants_ndjson():
+            return stream_rows(conn, "user_skills", request.args)
 
-        cursor.execute("SELECT * FROM user_skills;")  # No joins, raw table data
-        user_skills = cursor.fetchall()
-        conn.close()
+        user_skill_list, page = list_rows(conn, "user_skills", request.args)
 
-        if not user_skills:
+        if not user_skill_list:
             print("⚠️ No entries found in user_skills table.")
 
-        user_skill_list = [
-            {"id": entry[0], "user_id": entry[1], "skill_id": entry[2]}
-            for entry in user_skills
-        ]
-
-        print(f"✅ Retrieved {len(user_skill_list)} user skills.")  # Debugging output
-        return jsonify({"user_skills": user_skill_list}), 200
+        print(f"✅ Retrieved {len(user_skill_list)} of {page['total']} user skills.")  # Debugging output
+        return jsonify({"user_skills": user_skill_list, **page}), 200
 
+    except PageError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"❌ Error fetching user skills: {str(e)}")
         return jsonify({"error": str(e)}), 500
-
-if __name__ == "__main__":
-    app.run(debug=True, port=5003)
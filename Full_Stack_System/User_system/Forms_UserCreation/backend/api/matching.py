@@ -0,0 +1,205 @@
+# Worker-matching logic behind the matching endpoints. Each function takes a sqlite3
+# connection to jobs.db and returns (response payload, HTTP status); none of them
+# touch Flask, so the WSGI blueprints and the async app (async_app.py) share them.
+
+from .db import transaction
+from .queries import (AVAILABLE_WORKER_IDS_SQL, AVAILABLE_WORKERS_WITH_NEEDS_SQL, CHILDCARE_WORKERS_SQL,
+                      JOB_REQUIRED_SKILLS_SQL, UNAVAILABLE_WORKERS_SQL, WORKER_IDS_WITH_NEEDS_SQL,
+                      workers_with_skills_sql)
+
+TRACKED_NEEDS = ["Childcare", "Transportation"]  # Flexible hours & remote work need no labor
+
+# How many workers one unit of support labor frees
+LABOR_EFFICIENCY = {
+    "Childcare": 6,
+    "Transportation": 4
+}
+
+CHILDCARE_RATIO = 5  # One childcare worker supports 5 needing childcare
+
+
+def search_workers(conn, job_id):
+    """Workers having any of the skills job `job_id` requires."""
+    if not job_id:
+        return {"error": "Missing job_id parameter"}, 400
+
+    cursor = conn.cursor()
+
+    # Find the required skills for the job
+    cursor.execute(JOB_REQUIRED_SKILLS_SQL, (job_id,))
+    required_skills = cursor.fetchall()
+
+    if not required_skills:
+        return {"message": "No skills required for this job"}, 200
+
+    skill_ids = [skill[0] for skill in required_skills]
+
+    # Find users who have those skills
+    cursor.execute(workers_with_skills_sql(len(skill_ids)), skill_ids)
+    workers = cursor.fetchall()
+
+    return {"workers": [{"id": worker[0], "name": worker[1]} for worker in workers]}, 200
+
+
+def filter_workers(conn, job_id):
+    """Workers with the skills for job `job_id`, split by availability and needs."""
+    if not job_id:
+        return {"error": "Missing job_id parameter"}, 400
+
+    cursor = conn.cursor()
+
+    # Step 1: Get required skills for the job
+    cursor.execute(JOB_REQUIRED_SKILLS_SQL, (job_id,))
+    required_skills = [row[0] for row in cursor.fetchall()]
+    if not required_skills:
+        return {"message": "No skills required for this job"}, 200
+
+    # Step 2: Find workers with required skills
+    cursor.execute(workers_with_skills_sql(len(required_skills)), required_skills)
+    skilled_workers = {row[0]: row[1] for row in cursor.fetchall()}  # {user_id: name}
+
+    # Step 3: Find workers' availability
+    cursor.execute(AVAILABLE_WORKER_IDS_SQL)
+    available_workers = {row[0] for row in cursor.fetchall()}  # Set of available worker IDs
+
+    # Step 4: Find workers with special needs
+    cursor.execute(WORKER_IDS_WITH_NEEDS_SQL)
+    workers_with_needs = {row[0] for row in cursor.fetchall()}  # Set of worker IDs with needs
+
+    # Step 5: Categorize Workers
+    available_no_reqs = []
+    available_with_reqs = []
+    capable_not_available = []
+
+    for worker_id, name in skilled_workers.items():
+        if worker_id in available_workers:
+            if worker_id in workers_with_needs:
+                available_with_reqs.append({"id": worker_id, "name": name})
+            else:
+                available_no_reqs.append({"id": worker_id, "name": name})
+        else:
+            capable_not_available.append({"id": worker_id, "name": name})
+
+    return {
+        "available_no_reqs": available_no_reqs,
+        "available_with_reqs": available_with_reqs,
+        "capable_not_available": capable_not_available
+    }, 200
+
+
+def social_unit_impact(conn):
+    """
+    Simulates adding social support (e.g., childcare, transportation)
+    and calculates:
+    - How many labor units are needed to unlock all workers
+    - The total number of workers unlocked
+    - The ratio of workers unlocked per unit of labor
+    """
+    cursor = conn.cursor()
+
+    # Step 1: Get workers in "Available with Requirements" category
+    cursor.execute(AVAILABLE_WORKERS_WITH_NEEDS_SQL)
+    workers_with_needs = cursor.fetchall()  # [(id, name, need), ...]
+
+    # Step 2: Group workers by type of need
+    need_counts = {need: 0 for need in TRACKED_NEEDS}
+    workers_per_need = {need: [] for need in TRACKED_NEEDS}
+
+    for worker_id, name, need in workers_with_needs:
+        if need in TRACKED_NEEDS:
+            need_counts[need] += 1
+            workers_per_need[need].append({"id": worker_id, "name": name})
+
+    # Step 3: Calculate how many labor units are needed and total workers unlocked
+    labor_units_needed = 0
+    total_workers_unlocked = 0
+    impact_analysis = {}
+
+    for need, count in need_counts.items():
+        if count > 0:
+            units_required = -(-count // LABOR_EFFICIENCY[need])  # Ceiling division
+            workers_freed = min(count, units_required * LABOR_EFFICIENCY[need])  # Cap to actual count
+            labor_units_needed += units_required
+            total_workers_unlocked += workers_freed
+
+            impact_analysis[need] = {
+                "total_workers": count,
+                "labor_units_required": units_required,
+                "workers_freed": workers_per_need[need][:workers_freed]  # Show which workers are freed
+            }
+
+    # Step 4: Compute ratio of workers unlocked per labor unit
+    unlock_ratio = round(total_workers_unlocked / labor_units_needed, 2) if labor_units_needed > 0 else 0
+
+    return {
+        "social_unit_impact": impact_analysis,
+        "total_labor_units_needed": labor_units_needed,
+        "total_workers_unlocked": total_workers_unlocked,
+        "unlock_ratio": unlock_ratio
+    }, 200
+
+
+def generate_childcare_jobs(conn):
+    """
+    Identifies jobs that create childcare needs, assigns childcare jobs to workers who are
+    not employable for those jobs, and prioritizes maximizing the overall labor force.
+    """
+    # One write transaction: the job IDs handed out below are not reused by a concurrent run
+    with transaction(conn) as cursor:
+        # Step 1: Identify workers who need childcare
+        cursor.execute(CHILDCARE_WORKERS_SQL)
+        workers_with_childcare_needs = cursor.fetchall()
+
+        print(f"🔍 Workers needing childcare: {workers_with_childcare_needs}")
+
+        # Step 2: Identify all available workers
+        cursor.execute(UNAVAILABLE_WORKERS_SQL)
+        available_workers = cursor.fetchall()
+
+        print(f"✅ Available workers for childcare jobs: {available_workers}")
+
+        if not workers_with_childcare_needs:
+            print("⚠️ No workers require childcare!")
+            return {"message": "No workers need childcare."}, 200
+
+        # Step 3: Create childcare jobs
+        childcare_jobs_created = []
+        childcare_worker_assignments = []
+
+        # Calculate how many childcare jobs we need
+        childcare_jobs_needed = -(-len(workers_with_childcare_needs) // CHILDCARE_RATIO)
+
+        print(f"📌 Creating {childcare_jobs_needed} childcare jobs...")
+
+        for _ in range(childcare_jobs_needed):
+            cursor.execute("INSERT INTO jobs (title, description) VALUES (?, ?)",
+                           ("Childcare Provider", "Provides childcare support."))
+            childcare_jobs_created.append(cursor.lastrowid)
+
+        print(f"✅ Created childcare jobs: {childcare_jobs_created}")
+
+        # Step 4: Assign available workers to childcare jobs
+        print(f"📌 Trying to assign {len(available_workers)} available workers to {len(childcare_jobs_created)} childcare jobs.")
+
+        for childcare_job_id in childcare_jobs_created:
+            if available_workers:
+                assigned_worker = available_workers.pop(0)
+
+                # Update the database to set the worker's job_id
+                cursor.execute("""
+                    UPDATE users
+                    SET job_id = ?
+                    WHERE id = ?
+                """, (childcare_job_id, assigned_worker[0]))
+
+                childcare_worker_assignments.append({
+                    "childcare_job_id": childcare_job_id,
+                    "worker_id": assigned_worker[0],
+                    "worker_name": assigned_worker[1]
+                })
+                print(f"✅ Assigned {assigned_worker[1]} (ID: {assigned_worker[0]}) to Childcare Job {childcare_job_id}")
+
+    return {
+        "jobs_created": len(childcare_jobs_created),
+        "childcare_worker_assignments": childcare_worker_assignments
+    }, 200
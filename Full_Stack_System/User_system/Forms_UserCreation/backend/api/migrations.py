@@ -0,0 +1,298 @@
+import sqlite3
+
+# Ordered schema migrations per database, applied once each and recorded in
+# schema_migrations. Append new ones; never edit one that has shipped. A step
+# is SQL or a function taking a cursor, for changes SQLite's ALTER cannot do.
+
+SCHEMA_MIGRATIONS_SQL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+
+def table_columns(cursor, table):
+    cursor.execute(f"PRAGMA table_info({table});")
+    return [row[1] for row in cursor.fetchall()]
+
+
+def add_missing_columns(cursor, table, columns):
+    """ALTER TABLE ADD COLUMN for each of {name: definition} the table lacks."""
+    existing = set(table_columns(cursor, table))
+    for name, definition in columns.items():
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition};")
+
+
+def reconcile_job_requirements(cursor):
+    # reset_db.py created (job_id, skill_id) while create_requirement created and
+    # wrote (id, job_id, requirement); keep both: skill_id for matching, requirement as free text
+    add_missing_columns(cursor, "job_requirements", {"skill_id": "INTEGER", "requirement": "TEXT"})
+
+
+def reconcile_worker_availability(cursor):
+    # reset_db.py keyed availability by user (user_id, available) while
+    # set_availability writes weekly slots (user_id, day_of_week, start_time, end_time)
+    columns = table_columns(cursor, "worker_availability")
+    if "day_of_week" in columns:
+        add_missing_columns(cursor, "worker_availability", {"available": "INTEGER DEFAULT 1"})
+        return
+    # user_id is the primary key, so one user cannot have several slots: rebuild
+    cursor.execute("ALTER TABLE worker_availability RENAME TO worker_availability_old;")
+    cursor.execute("""
+        CREATE TABLE worker_availability (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            available INTEGER DEFAULT 1,
+            day_of_week TEXT,  -- NULL: available, no schedule given
+            start_time TEXT,
+            end_time TEXT
+        );
+    """)
+    cursor.execute("""
+        INSERT INTO worker_availability (user_id, available)
+        SELECT user_id, available FROM worker_availability_old;
+    """)
+    cursor.execute("DROP TABLE worker_availability_old;")
+
+
+def rebuild_job_requirements(cursor):
+    # A create_requirement-era table kept `requirement TEXT NOT NULL`, which turns away
+    # skill_id-only rows, and reset_db.py's has no id of its own: rebuild both as one shape,
+    # keeping each row's rowid (the old id, where there was one) as its id
+    cursor.execute("ALTER TABLE job_requirements RENAME TO job_requirements_old;")
+    cursor.execute("""
+        CREATE TABLE job_requirements (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id INTEGER,
+            skill_id INTEGER,
+            requirement TEXT,  -- Free text; NULL when the requirement is only a skill
+            FOREIGN KEY (job_id) REFERENCES jobs(id)
+        );
+    """)
+    # Requirements that are skill IDs count as skills, as create_requirement does for new ones
+    cursor.execute("""
+        INSERT INTO job_requirements (id, job_id, skill_id, requirement)
+        SELECT rowid, job_id,
+               COALESCE(skill_id, CASE WHEN trim(requirement) <> '' AND trim(requirement) NOT GLOB '*[^0-9]*'
+                                       THEN CAST(trim(requirement) AS INTEGER) END),
+               requirement
+        FROM job_requirements_old;
+    """)
+    cursor.execute("DROP TABLE job_requirements_old;")  # Takes its index and triggers along
+    cursor.execute("CREATE INDEX IF NOT EXISTS job_requirements_job_idx ON job_requirements(job_id, skill_id);")
+    cursor.execute("""
+        UPDATE table_stats SET row_count = (SELECT COUNT(*) FROM job_requirements)
+        WHERE table_name = 'job_requirements';
+    """)
+    change_version_triggers(["job_requirements"])(cursor)
+
+
+def add_user_zip_code(cursor):
+    add_missing_columns(cursor, "users", {"zip_code": "TEXT"})
+
+
+def row_count_triggers(tables):
+    """
+    Step that counts the rows of `tables` into table_stats and keeps the counts
+    current with insert/delete triggers, so list endpoints never run COUNT(*).
+    """
+    def step(cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS table_stats (
+                table_name TEXT PRIMARY KEY,
+                row_count INTEGER NOT NULL
+            ) WITHOUT ROWID;
+        """)
+        for table in tables:
+            cursor.execute(f"INSERT OR REPLACE INTO table_stats (table_name, row_count) SELECT ?, COUNT(*) FROM {table};",
+                           (table,))
+            # INSERT OR IGNORE fires no trigger for the rows it skips; REPLACE would need recursive_triggers
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_count_insert AFTER INSERT ON {table} BEGIN
+                    UPDATE table_stats SET row_count = row_count + 1 WHERE table_name = '{table}';
+                END;
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_count_delete AFTER DELETE ON {table} BEGIN
+                    UPDATE table_stats SET row_count = row_count - 1 WHERE table_name = '{table}';
+                END;
+            """)
+    return step
+
+
+def change_version_triggers(tables):
+    """
+    Step giving each of `tables` a version in table_stats that every insert, update and delete
+    bumps, for the list endpoints' ETags. Replaces the row_count_triggers() triggers.
+    """
+    def step(cursor):
+        add_missing_columns(cursor, "table_stats", {"version": "INTEGER NOT NULL DEFAULT 0"})
+        for table in tables:
+            # Start somewhere random, so a database rebuilt by reset_db.py never reissues an old ETag
+            cursor.execute("UPDATE table_stats SET version = abs(random() % 1000000000000) WHERE table_name = ?;",
+                           (table,))
+            cursor.execute(f"DROP TRIGGER IF EXISTS {table}_count_insert;")
+            cursor.execute(f"DROP TRIGGER IF EXISTS {table}_count_delete;")
+            for event, change in (("INSERT", "+ 1"), ("DELETE", "- 1"), ("UPDATE", "")):
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {table}_stats_{event.lower()} AFTER {event} ON {table} BEGIN
+                        UPDATE table_stats SET row_count = row_count {change}, version = version + 1
+                        WHERE table_name = '{table}';
+                    END;
+                """)
+    return step
+
+
+JOBS_MIGRATIONS = [
+    (1, "baseline", """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            job_id INTEGER,
+            FOREIGN KEY (job_id) REFERENCES jobs(id)
+        );
+
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS user_skills (
+            user_id INTEGER,
+            skill_id INTEGER,
+            PRIMARY KEY (user_id, skill_id)
+        );
+
+        CREATE TABLE IF NOT EXISTS job_requirements (
+            job_id INTEGER,
+            skill_id INTEGER,
+            PRIMARY KEY (job_id, skill_id),
+            FOREIGN KEY (job_id) REFERENCES jobs(id)
+        );
+
+        CREATE TABLE IF NOT EXISTS worker_needs (
+            user_id INTEGER,
+            need TEXT NOT NULL,
+            PRIMARY KEY (user_id, need)
+        );
+
+        CREATE TABLE IF NOT EXISTS worker_availability (
+            user_id INTEGER,
+            available INTEGER DEFAULT 1,
+            PRIMARY KEY (user_id)
+        );
+    """),
+    (2, "job_requirements_requirement_text", reconcile_job_requirements),
+    (3, "worker_availability_weekly_slots", reconcile_worker_availability),
+    (4, "users_zip_code", add_user_zip_code),
+    (5, "childcare_placements", """
+        CREATE TABLE IF NOT EXISTS childcare_placements (
+            user_id INTEGER PRIMARY KEY,
+            facility_id TEXT NOT NULL,
+            facility_name TEXT,
+            zip_code TEXT,
+            distance_km REAL,
+            placed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """),
+    # One index per lookup in queries.ENDPOINT_QUERIES; check_query_plans.py fails if one stops being used
+    (6, "hot_query_indexes", """
+        CREATE INDEX IF NOT EXISTS user_skills_skill_idx ON user_skills(skill_id, user_id);
+        CREATE INDEX IF NOT EXISTS worker_needs_need_idx ON worker_needs(need, user_id);
+        CREATE INDEX IF NOT EXISTS worker_availability_user_idx ON worker_availability(user_id);
+        CREATE INDEX IF NOT EXISTS job_requirements_job_idx ON job_requirements(job_id, skill_id);
+    """),
+    (7, "table_stats", row_count_triggers(["jobs", "job_requirements"])),
+    (8, "table_stats_version", change_version_triggers(["jobs", "job_requirements"])),
+    (9, "job_requirements_rebuild", rebuild_job_requirements),
+]
+
+USERS_MIGRATIONS = [
+    (1, "baseline", """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            user_type TEXT NOT NULL,
+            password TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE TABLE IF NOT EXISTS relationships (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_a TEXT NOT NULL,
+            user_b TEXT NOT NULL,
+            relationship_type TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE TABLE IF NOT EXISTS skills (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS user_skills (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            skill_id INTEGER NOT NULL
+        );
+    """),
+    (2, "table_stats", row_count_triggers(["users", "relationships", "skills", "user_skills"])),
+    (3, "table_stats_version", change_version_triggers(["users", "relationships", "skills", "user_skills"])),
+]
+
+MIGRATIONS = {"jobs": JOBS_MIGRATIONS, "users": USERS_MIGRATIONS}
+
+
+def _run_step(cursor, step):
+    if callable(step):
+        step(cursor)
+        return
+    # executescript() would commit the open transaction; run statement by statement
+    statement = ""
+    for line in step.splitlines(True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            cursor.execute(statement)
+            statement = ""
+
+
+def migrate(db_path, migrations):
+    """
+    Apply the migrations `db_path` has not recorded yet, each in its own transaction.
+
+    Safe to call from several processes at once: the version check happens
+    under the write lock. Returns the versions applied.
+    """
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    cursor = conn.cursor()
+    cursor.execute(SCHEMA_MIGRATIONS_SQL)
+    applied = []
+    try:
+        for version, name, step in sorted(migrations, key=lambda migration: migration[0]):
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.execute("SELECT 1 FROM schema_migrations WHERE version = ?", (version,))
+                if cursor.fetchone() is None:
+                    _run_step(cursor, step)
+                    cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (?, ?)", (version, name))
+                    applied.append(version)
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+    finally:
+        conn.close()
+
+    for version in applied:
+        print(f"🔧 {db_path}: applied migration {version}")
+    return applied
+
+
+def migrate_all(config):
+    """Migrate every database the API writes to, from the <NAME>_DB_PATH app config."""
+    return {name: migrate(config[f"{name.upper()}_DB_PATH"], migrations) for name, migrations in MIGRATIONS.items()}
@@ -0,0 +1,129 @@
+import base64
+import json
+import sqlite3
+from flask import Response, current_app, request, stream_with_context
+
+from .queries import LISTINGS, TABLE_COUNT_SQL, listing_sql
+
+# Below any rowid SQLite can hand out, so a first page starts from the beginning
+FIRST_KEY = -(2 ** 63)
+
+
+class PageError(ValueError):
+    """A page request the list endpoints cannot serve; answered with 400."""
+
+
+def encode_cursor(name, key):
+    """Opaque cursor for the rows of listing `name` after `key`."""
+    payload = json.dumps({"listing": name, "after": key}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(name, cursor):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        listing, key = payload["listing"], payload["after"]
+    except (ValueError, TypeError, KeyError):
+        raise PageError("Invalid cursor")
+    if listing != name or not isinstance(key, int):
+        raise PageError(f"Cursor is not a {name} cursor")
+    return key
+
+
+def _int_arg(args, arg, minimum=None):
+    try:
+        value = int(args[arg])
+    except ValueError:
+        raise PageError(f"{arg} must be an integer")
+    if minimum is not None and value < minimum:
+        raise PageError(f"{arg} must be at least {minimum}")
+    return value
+
+
+def requested_fields(name, args):
+    """The `fields=a,b` projection, checked against the listing's fields; all of them by default."""
+    columns = LISTINGS[name][3]
+    fields = [field.strip() for field in args.get("fields", "").split(",") if field.strip()]
+    unknown = [field for field in fields if field not in columns]
+    if unknown:
+        raise PageError(f"Unknown fields {', '.join(unknown)}; choose from {', '.join(columns)}")
+    return list(dict.fromkeys(fields)) or list(columns)
+
+
+def table_count(conn, table):
+    try:
+        row = conn.execute(TABLE_COUNT_SQL, (table,)).fetchone()
+    except sqlite3.OperationalError:  # No table_stats: MIGRATE_ON_START=False on an unmigrated database
+        row = None
+    if row is None:  # Only before the table_stats migration has run
+        row = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()
+    return row[0]
+
+
+def _after_key(name, args):
+    if args.get("cursor"):
+        return decode_cursor(name, args["cursor"])
+    if "after_id" in args:
+        return _int_arg(args, "after_id")
+    return FIRST_KEY
+
+
+def list_rows(conn, name, args):
+    """
+    Rows of listing `name` for a request's query `args`, and the response fields to send with them.
+
+    Without `limit`, `after_id` or `cursor` this is the whole table, as before. With any of them it
+    is one keyset page: up to `limit` rows (PAGE_SIZE by default, at most MAX_PAGE_SIZE) with keys
+    above `after_id`, or after where `cursor` left off, plus `next_cursor` (None on the last page).
+    `fields` projects the rows; `total` comes from table_stats either way.
+    """
+    _, table, _, _ = LISTINGS[name]
+    fields = requested_fields(name, args)
+    extras = {"total": table_count(conn, table)}
+
+    if not any(arg in args for arg in ("limit", "after_id", "cursor")):
+        rows = conn.execute(listing_sql(name, fields)).fetchall()
+        return [dict(zip(fields, row)) for row in rows], extras
+
+    after = _after_key(name, args)
+    limit = _int_arg(args, "limit", 1) if "limit" in args else current_app.config["PAGE_SIZE"]
+    limit = min(limit, current_app.config["MAX_PAGE_SIZE"])
+
+    # One row past the page says whether there is another page
+    rows = conn.execute(listing_sql(name, fields, paged=True), (after, limit + 1)).fetchall()
+    extras["next_cursor"] = encode_cursor(name, rows[limit - 1][-1]) if len(rows) > limit else None
+    return [dict(zip(fields, row)) for row in rows[:limit]], extras
+
+
+def wants_ndjson():
+    """Whether the client asked for NDJSON over JSON (a browser's */* still gets JSON)."""
+    return request.accept_mimetypes.best_match(["application/json", "application/x-ndjson"]) == "application/x-ndjson"
+
+
+def stream_rows(conn, name, args):
+    """
+    Listing `name` as an NDJSON response, one row per line, read and sent STREAM_CHUNK_ROWS at a time.
+
+    Takes the same arguments as list_rows(), but `limit` is not capped and defaults to the rest of
+    the table; `after_id` or `cursor` resumes a dump. The total goes in the X-Total-Count header.
+    """
+    fields = requested_fields(name, args)
+    after = _after_key(name, args)
+    limit = _int_arg(args, "limit", 1) if "limit" in args else -1  # LIMIT -1: no limit
+    total = table_count(conn, LISTINGS[name][1])
+    chunk_rows = current_app.config["STREAM_CHUNK_ROWS"]
+
+    cursor = conn.execute(listing_sql(name, fields, paged=True), (after, limit))  # Errors surface before the 200
+
+    def generate():
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_rows)
+                if not rows:
+                    break
+                yield "".join(json.dumps(dict(zip(fields, row)), separators=(",", ":")) + "\n" for row in rows)
+        finally:
+            cursor.close()  # Also when the client disconnects mid-stream; releases the read snapshot
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson",
+                    headers={"X-Total-Count": str(total)})
@@ -0,0 +1,108 @@
+# Read queries served by the API endpoints, kept in one place so
+# database/setup/check_query_plans.py can EXPLAIN every one of them.
+
+JOB_REQUIRED_SKILLS_SQL = "SELECT skill_id FROM job_requirements WHERE job_id = ?"
+
+
+def workers_with_skills_sql(skill_count):
+    """Workers having any of `skill_count` skill IDs, bound as parameters."""
+    return f"""
+        SELECT DISTINCT users.id, users.name FROM users
+        JOIN user_skills ON users.id = user_skills.user_id
+        WHERE user_skills.skill_id IN ({','.join(['?'] * skill_count)})
+    """
+
+
+AVAILABLE_WORKER_IDS_SQL = "SELECT user_id FROM worker_availability"
+
+WORKER_IDS_WITH_NEEDS_SQL = "SELECT DISTINCT user_id FROM worker_needs"
+
+AVAILABLE_WORKERS_WITH_NEEDS_SQL = """
+    SELECT DISTINCT users.id, users.name, worker_needs.need
+    FROM users
+    JOIN worker_needs ON users.id = worker_needs.user_id
+    JOIN user_skills ON users.id = user_skills.user_id
+    WHERE users.id IN (SELECT DISTINCT user_id FROM worker_availability)
+"""
+
+CHILDCARE_WORKERS_SQL = """
+    SELECT DISTINCT users.id, users.name, users.job_id
+    FROM users
+    JOIN worker_needs ON users.id = worker_needs.user_id
+    WHERE worker_needs.need = 'Childcare'
+"""
+
+CHILDCARE_WORKER_ZIPS_SQL = """
+    SELECT DISTINCT users.id, users.name, users.zip_code
+    FROM users
+    JOIN worker_needs ON users.id = worker_needs.user_id
+    WHERE worker_needs.need = 'Childcare'
+"""
+
+UNAVAILABLE_WORKERS_SQL = """
+    SELECT DISTINCT users.id, users.name
+    FROM users
+    WHERE users.id NOT IN (SELECT DISTINCT user_id FROM worker_availability)
+"""
+
+USER_AVAILABILITY_SQL = "SELECT day_of_week, start_time, end_time FROM worker_availability WHERE user_id = ?"
+
+USER_NEEDS_SQL = "SELECT need FROM worker_needs WHERE user_id = ?"
+
+# List endpoints: name -> (database, table, key column, {response field: SQL expression}).
+# Pages are keyset ranges on the key, which is the table's INTEGER PRIMARY KEY (its rowid alias),
+# so every page is a range read on the table itself.
+LISTINGS = {
+    "users": ("users", "users", "id", {
+        "id": "id", "name": "name", "email": "email", "user_type": "user_type", "created_at": "created_at"}),
+    "relationships": ("users", "relationships", "id", {
+        "id": "id", "user_a": "user_a", "type": "relationship_type", "user_b": "user_b"}),
+    "skills": ("users", "skills", "id", {"id": "id", "name": "name"}),
+    "user_skills": ("users", "user_skills", "id", {"id": "id", "user_id": "user_id", "skill_id": "skill_id"}),
+    "jobs": ("jobs", "jobs", "id", {"id": "id", "title": "title", "description": "description"}),
+    "requirements": ("jobs", "job_requirements", "id", {
+        "id": "id", "job_id": "job_id", "requirement": "COALESCE(requirement, CAST(skill_id AS TEXT))",
+        "skill_id": "skill_id"}),
+}
+
+
+def listing_sql(name, fields=None, paged=False):
+    """
+    SELECT for listing `name`: the `fields` (default all) followed by the key.
+    Paged, it takes (after key, row limit) parameters.
+    """
+    _, table, key, columns = LISTINGS[name]
+    expressions = [columns[field] for field in (fields or columns)] + [key]
+    sql = f"SELECT {', '.join(expressions)} FROM {table}"
+    if paged:
+        sql += f" WHERE {key} > ?"
+    return sql + f" ORDER BY {key}" + (" LIMIT ?" if paged else "")
+
+
+# Row counts and change versions kept by the table_stats triggers
+TABLE_COUNT_SQL = "SELECT row_count FROM table_stats WHERE table_name = ?"
+
+TABLE_VERSION_SQL = "SELECT version FROM table_stats WHERE table_name = ?"
+
+# name -> (database, SQL, sample parameters, whether it reads a whole table by design).
+# Lookups must use an index; whole-table reads may scan.
+ENDPOINT_QUERIES = {
+    "job_required_skills": ("jobs", JOB_REQUIRED_SKILLS_SQL, (1,), False),
+    "workers_with_skills": ("jobs", workers_with_skills_sql(3), (1, 2, 3), False),
+    "available_worker_ids": ("jobs", AVAILABLE_WORKER_IDS_SQL, (), True),
+    "worker_ids_with_needs": ("jobs", WORKER_IDS_WITH_NEEDS_SQL, (), True),
+    "available_workers_with_needs": ("jobs", AVAILABLE_WORKERS_WITH_NEEDS_SQL, (), True),
+    "childcare_workers": ("jobs", CHILDCARE_WORKERS_SQL, (), False),
+    "childcare_worker_zips": ("jobs", CHILDCARE_WORKER_ZIPS_SQL, (), False),
+    "unavailable_workers": ("jobs", UNAVAILABLE_WORKERS_SQL, (), True),
+    "user_availability": ("jobs", USER_AVAILABILITY_SQL, (1,), False),
+    "user_needs": ("jobs", USER_NEEDS_SQL, (1,), False),
+    "jobs_table_count": ("jobs", TABLE_COUNT_SQL, ("jobs",), False),
+    "users_table_count": ("users", TABLE_COUNT_SQL, ("users",), False),
+    "jobs_table_version": ("jobs", TABLE_VERSION_SQL, ("jobs",), False),
+    "users_table_version": ("users", TABLE_VERSION_SQL, ("users",), False),
+}
+# Each list endpoint whole (no paging arguments) and one keyset page of it
+ENDPOINT_QUERIES.update({name: (LISTINGS[name][0], listing_sql(name), (), True) for name in LISTINGS})
+ENDPOINT_QUERIES.update({f"{name}_page": (LISTINGS[name][0], listing_sql(name, paged=True), (0, 100), False)
+                         for name in LISTINGS})
@@ -0,0 +1,23 @@
+import argparse
+import os
+
+from api.async_app import create_async_app
+
+# ASGI entry point: the matching endpoints async, the rest through the Flask app. Multi-process:
+#   uvicorn --app-dir Forms_UserCreation/backend --workers 4 --host 0.0.0.0 --port 5000 asgi:app
+app = create_async_app()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the Forms_UserCreation API from one asyncio process.")
+    parser.add_argument("--host", default=os.environ.get("API_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("API_PORT", 5000)))
+    parser.add_argument("--backlog", type=int, default=4096, help="Pending connections the socket queues")
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        print("❌ uvicorn is not installed (pip install uvicorn); use wsgi.py instead")
+        exit(1)
+    print(f"🚀 Serving async API on http://{args.host}:{args.port}")
+    uvicorn.run(app, host=args.host, port=args.port, backlog=args.backlog)
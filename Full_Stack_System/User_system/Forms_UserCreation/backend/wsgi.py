@@ -0,0 +1,25 @@
+import argparse
+import os
+
+from api import create_app
+
+# WSGI entry point: every API endpoint in one application. Multi-process:
+#   gunicorn --chdir Forms_UserCreation/backend -w 4 --threads 8 -b 0.0.0.0:5000 wsgi:app
+app = create_app()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve every Forms_UserCreation API endpoint from one process.")
+    parser.add_argument("--host", default=os.environ.get("API_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("API_PORT", 5000)))
+    parser.add_argument("--threads", type=int, default=int(os.environ.get("API_THREADS", 8)),
+                        help="Requests served concurrently")
+    args = parser.parse_args()
+
+    try:
+        from waitress import serve
+    except ImportError:
+        print("⚠️ waitress is not installed (pip install waitress); using Flask's development server")
+        app.run(host=args.host, port=args.port, threaded=True)
+    else:
+        print(f"🚀 Serving API on http://{args.host}:{args.port} with {args.threads} threads")
+        serve(app, host=args.host, port=args.port, threads=args.threads)
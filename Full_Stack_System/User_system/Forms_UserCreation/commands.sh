@@ -1,18 +1,16 @@
-python3 Forms_UserCreation/backend/api/get_users.py
-python3 Forms_UserCreation/backend/api/submit_user.py
-python3 Forms_UserCreation/backend/api/manage_relationships.py
-python3 Forms_UserCreation/backend/api/manage_skills.py
-python3 Forms_UserCreation/backend/api/manage_jobs.py
-
 python3 Forms_UserCreation/database/setup/reset_db.py
 python3 Forms_UserCreation/database/setup/populate_db.py
-python3 Forms_UserCreation/backend/api/search_workers.py
-
 python3 Forms_UserCreation/database/setup/update_db.py
-python3 Forms_UserCreation/backend/api/manage_availability_needs.py
-python3 Forms_UserCreation/backend/api/filter_workers.py
-python3 Forms_UserCreation/backend/api/generate_childcare_jobs.py
+python3 Forms_UserCreation/database/setup/check_query_plans.py --quiet
+# The same plan checks on freshly migrated databases, as a test suite (pip install pytest)
+python3 -m pytest -q Forms_UserCreation/tests
+
+# Every API endpoint in one process on port 5000 (--threads, or gunicorn for several workers)
+python3 Forms_UserCreation/backend/wsgi.py --port 5000 --threads 8
+# gunicorn --chdir Forms_UserCreation/backend -w 4 --threads 8 -b 127.0.0.1:5000 wsgi:app
+# Or asyncio: matching endpoints async, thousands of open connections per process (needs starlette, uvicorn, a2wsgi)
+# python3 Forms_UserCreation/backend/asgi.py --port 5000
 
 python3 backend/server.py
 
-/home/mike/Documents/Programming/Graph_Hackathon_job_folder/Forms_UserCreation/backend/server.py
\ No newline at end of file
+/home/mike/Documents/Programming/Graph_Hackathon_job_folder/Forms_UserCreation/backend/server.py
@@ -0,0 +1,67 @@
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+
+# The queries and schema live in the API
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../backend/api"))
+from migrations import MIGRATIONS, migrate
+from queries import ENDPOINT_QUERIES
+
+# A plan step reading a whole table: "SCAN users" (a covering-index scan is reported as
+# "SCAN users USING COVERING INDEX ...", which is also a full read)
+FULL_SCAN = re.compile(r"^SCAN (\w+)")
+
+
+def query_plan(conn, sql, params):
+    """EXPLAIN QUERY PLAN steps as indented text lines."""
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    depth = {0: -1}
+    lines = []
+    for node_id, parent_id, _, detail in rows:
+        depth[node_id] = depth.get(parent_id, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return lines
+
+
+def check_plans(db_paths, verbose=True):
+    """Print every endpoint query's plan; return the names of lookups that scan a table."""
+    connections = {name: sqlite3.connect(path) for name, path in db_paths.items()}
+    regressions = []
+    for name, (db, sql, params, full_read) in ENDPOINT_QUERIES.items():
+        plan = query_plan(connections[db], sql, params)
+        scans = [step.strip() for step in plan if FULL_SCAN.match(step.strip())]
+        failed = scans and not full_read
+        if failed:
+            regressions.append(name)
+        if verbose or failed:
+            print(f"{'❌' if failed else '✅'} {name} ({db}){' [whole-table read]' if full_read else ''}")
+            for step in plan:
+                print(f"     {step}")
+    for conn in connections.values():
+        conn.close()
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail if an endpoint lookup query stops using an index.")
+    parser.add_argument("--jobs-db", help="Check this jobs.db instead of a freshly migrated one")
+    parser.add_argument("--users-db", help="Check this users.db instead of a freshly migrated one")
+    parser.add_argument("--quiet", action="store_true", help="Only print failing plans")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_paths = {"jobs": args.jobs_db, "users": args.users_db}
+        for name, path in db_paths.items():
+            if path is None:
+                # The schema every migrated database ends up with
+                db_paths[name] = os.path.join(tmp, f"{name}.db")
+                migrate(db_paths[name], MIGRATIONS[name])
+        regressions = check_plans(db_paths, verbose=not args.quiet)
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} lookup queries scan a whole table: {', '.join(regressions)}")
+        exit(1)
+    print(f"\n🎉 All {len(ENDPOINT_QUERIES)} endpoint query plans OK")
@@ -19,18 +19,19 @@ print("🔄 Populating database with sample data...")
 
 # Insert sample users (workers with jobs)
 workers = [
-    ("Alice", 1), ("Bob", 2), ("Charlie", 3), ("David", 4), ("Eve", 5),
-    ("Frank", 1), ("Grace", 2), ("Hannah", 3), ("Isaac", 4), ("Jack", 5)
+    ("Alice", 1, "48201"), ("Bob", 2, "48202"), ("Charlie", 3, "49503"), ("David", 4, "48103"),
+    ("Eve", 5, "48906"), ("Frank", 1, "48502"), ("Grace", 2, "48120"), ("Hannah", 3, "48201"),
+    ("Isaac", 4, "49001"), ("Jack", 5, "48823")
 ]
-cursor.executemany("INSERT INTO users (name, job_id) VALUES (?, ?)", workers)
+cursor.executemany("INSERT INTO users (name, job_id, zip_code) VALUES (?, ?, ?)", workers)
 print(f"✅ Inserted {len(workers)} workers with jobs.")
 
 # Insert unassigned workers (who can take childcare jobs)
 unassigned_workers = [
-    ("Kelly",), ("Sam",), ("Rick",), ("Martha",), ("Nina",),
-    ("Leo",), ("Sophie",), ("Chris",), ("Tom",), ("Emma",)
+    ("Kelly", "48203"), ("Sam", "49504"), ("Rick", "48104"), ("Martha", "48910"), ("Nina", "48503"),
+    ("Leo", "48124"), ("Sophie", "48204"), ("Chris", "49006"), ("Tom", "48824"), ("Emma", "48205")
 ]
-cursor.executemany("INSERT INTO users (name) VALUES (?)", unassigned_workers)
+cursor.executemany("INSERT INTO users (name, zip_code) VALUES (?, ?)", unassigned_workers)
 print(f"✅ Inserted {len(unassigned_workers)} additional unassigned workers.")
 
 # Insert sample jobs
@@ -1,5 +1,10 @@
 import sqlite3
 import os
+import sys
+
+# The schema lives in the API's migrations
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../backend/api"))
+from migrations import JOBS_MIGRATIONS, migrate
 
 # Define the correct relative path
 DB_RELATIVE_PATH = "Forms_UserCreation/database/jobs/jobs.db"
@@ -25,7 +30,7 @@ print("🔄 Resetting database...")
 # Drop old tables
 tables_to_drop = [
     "users", "skills", "jobs", "job_requirements",
-    "user_skills", "worker_needs", "worker_availability"
+    "user_skills", "worker_needs", "worker_availability", "childcare_placements", "table_stats", "schema_migrations"
 ]
 
 for table in tables_to_drop:
@@ -35,48 +40,11 @@ for table in tables_to_drop:
     except sqlite3.Error as e:
         print(f"❌ Failed to drop table {table}: {e}")
 
-# Create tables
+# Create tables by applying every schema migration, as the API does at startup
 print("📌 Creating new tables...")
+conn.commit()
 try:
-    cursor.executescript("""
-    CREATE TABLE users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT NOT NULL,
-        job_id INTEGER,
-        FOREIGN KEY (job_id) REFERENCES jobs(id)
-    );
-
-    CREATE TABLE jobs (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        title TEXT NOT NULL,
-        description TEXT NOT NULL
-    );
-
-    CREATE TABLE user_skills (
-        user_id INTEGER,
-        skill_id INTEGER,
-        PRIMARY KEY (user_id, skill_id)
-    );
-
-    CREATE TABLE job_requirements (
-        job_id INTEGER,
-        skill_id INTEGER,
-        PRIMARY KEY (job_id, skill_id),
-        FOREIGN KEY (job_id) REFERENCES jobs(id)
-    );
-
-    CREATE TABLE worker_needs (
-        user_id INTEGER,
-        need TEXT NOT NULL,
-        PRIMARY KEY (user_id, need)
-    );
-
-    CREATE TABLE worker_availability (
-        user_id INTEGER,
-        available INTEGER DEFAULT 1,
-        PRIMARY KEY (user_id)
-    );
-    """)
+    migrate(DB_RELATIVE_PATH, JOBS_MIGRATIONS)
     print("✅ Tables created successfully.")
 except sqlite3.Error as e:
     print(f"❌ Error creating tables: {e}")
@@ -87,7 +55,8 @@ except sqlite3.Error as e:
 cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
 tables = [table[0] for table in cursor.fetchall()]
 expected_tables = {
-    "users", "jobs", "user_skills", "job_requirements", "worker_needs", "worker_availability"
+    "users", "jobs", "user_skills", "job_requirements", "worker_needs", "worker_availability",
+    "childcare_placements", "table_stats", "schema_migrations"
 }
 
 print("\n🔍 Verifying table creation...")
@@ -1,30 +1,12 @@
-import sqlite3
 import os
+import sys
 
-DB_PATH = "database/jobs/jobs.db"
-
-# Connect to the database
-conn = sqlite3.connect(DB_PATH)
-cursor = conn.cursor()
+# The schema lives in the API's migrations; this applies any the database is missing
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../backend/api"))
+from migrations import JOBS_MIGRATIONS, migrate
 
-# Add new tables for worker availability and needs
-cursor.executescript("""
-CREATE TABLE IF NOT EXISTS worker_availability (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    user_id INTEGER NOT NULL,
-    day_of_week TEXT NOT NULL,
-    start_time TEXT NOT NULL,
-    end_time TEXT NOT NULL
-);
-
-CREATE TABLE IF NOT EXISTS worker_needs (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    user_id INTEGER NOT NULL,
-    need TEXT NOT NULL
-);
-""")
+DB_PATH = "database/jobs/jobs.db"
 
-conn.commit()
-conn.close()
+applied = migrate(DB_PATH, JOBS_MIGRATIONS)
 
-print("✅ Database updated with worker availability and needs tables.")
\ No newline at end of file
+print(f"✅ Database updated: {len(applied)} migrations applied.")
@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../database/setup"))
+from check_query_plans import check_plans
+from migrations import MIGRATIONS, migrate
+from queries import ENDPOINT_QUERIES, LISTINGS
+
+
+@pytest.fixture(scope="module")
+def migrated_dbs(tmp_path_factory):
+    """{database name: path} of freshly migrated databases, the schema every deployment ends up with."""
+    tmp = tmp_path_factory.mktemp("dbs")
+    db_paths = {name: str(tmp / f"{name}.db") for name in MIGRATIONS}
+    for name, path in db_paths.items():
+        migrate(path, MIGRATIONS[name])
+    return db_paths
+
+
+def test_lookup_queries_use_indexes(migrated_dbs):
+    assert check_plans(migrated_dbs, verbose=False) == []
+
+
+@pytest.mark.parametrize("name", sorted(LISTINGS))
+def test_listing_pages_are_checked(name):
+    # A list endpoint's keyset page must be a range read, never a whole-table scan
+    db, _, _, full_read = ENDPOINT_QUERIES[f"{name}_page"]
+    assert db == LISTINGS[name][0]
+    assert not full_read